@@ -0,0 +1,54 @@
+"""
+Benchmark of MatchBlock.extract_dates on a mixed-format corpus, with and
+without the regular expression fast path for common date formats.
+
+Run with: python benchmarks/bench_dates.py
+"""
+
+import os
+import sys
+import timeit
+import warnings
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import MatchBlock
+
+from datasets import dates as corpus
+
+
+def run(strings, repeat=3):
+    """Return best time of extracting dates from all strings."""
+
+    def extract():
+        for string in strings:
+            MatchBlock.extract_dates(string)
+
+    return min(timeit.repeat(extract, number=1, repeat=repeat))
+
+
+def main(size=2000):
+    strings = corpus(size)
+    formats = MatchBlock.date_formats
+    MatchBlock.dates_cache.enabled = False
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        try:
+            MatchBlock.date_formats = ()
+            datefinder_time = run(strings)
+            MatchBlock.date_formats = formats
+            fast_time = run(strings)
+        finally:
+            MatchBlock.date_formats = formats
+            MatchBlock.dates_cache.enabled = True
+
+    print('strings:          {}'.format(size))
+    print('datefinder only:  {:.3f} s'.format(datefinder_time))
+    print('with fast path:   {:.3f} s'.format(fast_time))
+    print('speedup:          {:.1f}x'.format(datefinder_time / fast_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark of the memory held by parsed MatchBlock objects, measured with
+tracemalloc on a corpus of mixed cells (numbers, strings with numbers and
+dictionary words, dates and coordinates), next to a baseline of the same
+attributes stored the way MatchBlock used to store them: in a per-instance
+__dict__, with dates in a list of their own.
+
+Run with: python benchmarks/bench_memory.py
+"""
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+import warnings
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import MatchBlock
+
+CELLS = (lambda r: r.randrange(100000),
+         lambda r: round(r.uniform(0, 1000), 2),
+         lambda r: 'Flight {}'.format(r.randrange(1000)),
+         lambda r: 'N Sector {} Block'.format(r.randrange(100)),
+         lambda r: '{:02d}-Dec-20{:02d}'.format(r.randrange(1, 29),
+                                                r.randrange(20)),
+         lambda r: '{:.4f}, {:.4f}'.format(r.uniform(-80, 80),
+                                           r.uniform(-170, 170)),
+         lambda r: 'Kolmogorov Station')
+
+
+class DictBlock:
+    """
+    Attributes of a parsed MatchBlock stored like MatchBlock did before
+    using __slots__: in a __dict__, dates copied to a new list.
+    """
+
+    def __init__(self, block):
+        (self._number, dates, self._coordinates, self._string,
+         self._str_number, self._str_custom) = block._attributes
+        self._date = list(dates)
+
+
+def baseline(cell):
+    return DictBlock(MatchBlock(cell))
+
+
+def instance_size(instance):
+    """Return size of the object and its __dict__, if any."""
+
+    size = sys.getsizeof(instance)
+    if hasattr(instance, '__dict__'):
+        size += sys.getsizeof(instance.__dict__)
+    return size
+
+
+def corpus(size, seed=0):
+    """Return size cells of mixed types."""
+
+    r = random.Random(seed)
+    return [r.choice(CELLS)(r) for _ in range(size)]
+
+
+def measure(cells, parse=MatchBlock):
+    """Return bytes allocated per object returned by parse kept alive."""
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    blocks = [parse(cell) for cell in cells]
+
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    size -= sys.getsizeof(blocks)
+    return size / len(blocks)
+
+
+def main(size=20000):
+    cells = corpus(size)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        # Fill the dates cache and load the dictionary before measuring.
+        [MatchBlock(cell) for cell in cells]
+        before = measure(cells, baseline)
+        after = measure(cells)
+
+    instances = (baseline('Flight 1'), MatchBlock('Flight 1'))
+
+    print('blocks:             {}'.format(size))
+    print('                    {:>10} {:>10}'.format('before', 'after'))
+    print('instance size:      {:>10} {:>10}'.format(
+        *(instance_size(x) for x in instances)))
+    print('has __dict__:       {:>10} {:>10}'.format(
+        *(str(hasattr(x, '__dict__')) for x in instances)))
+    print('memory per block:   {:>10.0f} {:>10.0f}'.format(before, after))
+
+
+if __name__ == '__main__':
+    main()
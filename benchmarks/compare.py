@@ -0,0 +1,63 @@
+"""
+Compare two JSON result files of benchmarks/suite.py.
+
+Print the time of every benchmark found in both files and the ratio of the
+new time to the old one. Exit with status 1 if any benchmark got slower
+than the threshold ratio, so the script can be used to check for
+regressions after an upgrade.
+
+Run with: python benchmarks/compare.py old.json new.json --threshold 1.2
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(file):
+    with open(file, 'r') as f:
+        return json.load(f)['results']
+
+
+def compare(old, new):
+    """
+    Return list of (name, old time, new time, ratio) for benchmarks found in
+    both dicts of results, sorted by name.
+    """
+
+    return [(name, old[name], new[name],
+             new[name] / old[name] if old[name] else float('inf'))
+            for name in sorted(set(old) & set(new))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('old', help='results of the reference run')
+    parser.add_argument('new', help='results of the run to check')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='ratio above which a benchmark is a regression')
+    args = parser.parse_args(argv)
+
+    old, new = load(args.old), load(args.new)
+    rows = compare(old, new)
+
+    regressions = 0
+    print('{:<45} {:>12} {:>12} {:>7}'.format('benchmark', 'old us', 'new us',
+                                               'ratio'))
+    for name, old_time, new_time, ratio in rows:
+        flag = ''
+        if ratio > args.threshold:
+            flag = '  slower'
+            regressions += 1
+        print('{:<45} {:>12.3f} {:>12.3f} {:>7.2f}{}'.format(
+            name, old_time * 1e6, new_time * 1e6, ratio, flag))
+
+    for name in sorted(set(old) ^ set(new)):
+        print('{:<45} only in {}'.format(
+            name, args.old if name in old else args.new))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
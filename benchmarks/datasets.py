@@ -0,0 +1,115 @@
+"""
+Deterministic synthetic datasets for the benchmarks: names with numbers,
+direction words from the dictionary provided with the package, dates in
+mixed formats and coordinates. The same seed always gives the same data.
+"""
+
+import datetime
+import os
+import random
+import sys
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import Dictionary
+
+DATE_FORMATS = ('{:%Y-%m-%d}', '{:%m/%d/%Y}', '{d.day} {:%B %Y}',
+                '{:%d-%b-%Y}', '{:%b} {d.day}, {:%Y}', 'Istanbul {:%d %B %Y}',
+                '{:%d.%m.%Y}')
+
+NAMES = ('Flight', 'Block', 'Sector', 'Station', 'Platform', 'Field', 'Well',
+         'Kolmogorov', 'Amsterdam', 'Madrid', 'Valencia', 'Novy Urengoy')
+
+ROMAN = ('I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X')
+
+
+def _directions():
+    words = []
+    for key, values in sorted(Dictionary.default().mapping.items()):
+        words.append(key)
+        words.extend(sorted(values))
+    return words
+
+
+def dates(size, seed=0):
+    """Return size strings with dates in mixed formats."""
+
+    r = random.Random(seed)
+    start = datetime.date(1990, 1, 1)
+
+    strings = []
+    for _ in range(size):
+        date = start + datetime.timedelta(days=r.randrange(12000))
+        strings.append(r.choice(DATE_FORMATS).format(date, date, d=date))
+
+    return strings
+
+
+def names(size, seed=0):
+    """
+    Return size names with numbers (some of them with leading zeros or in
+    roman numerals) and direction words in various languages.
+    """
+
+    r = random.Random(seed)
+    directions = _directions()
+
+    strings = []
+    for _ in range(size):
+        parts = [r.choice(NAMES)]
+        if r.random() < 0.5:
+            parts.insert(r.randrange(2), r.choice(directions))
+        number = r.randrange(1, 200)
+        parts.append(r.choice((str(number), '{:04d}'.format(number),
+                               ROMAN[number % len(ROMAN)])))
+        strings.append(' '.join(parts))
+
+    return strings
+
+
+def coordinates(size, seed=0):
+    """Return size pairs of coordinates (latitude, longitude)."""
+
+    r = random.Random(seed)
+    return [(round(r.uniform(-80, 80), 5), round(r.uniform(-170, 170), 5))
+            for _ in range(size)]
+
+
+def numbers(size, seed=0):
+    """Return size numbers, both integers and floats."""
+
+    r = random.Random(seed)
+    return [r.randrange(100000) if r.random() < 0.5
+            else round(r.uniform(0, 1000), 2) for _ in range(size)]
+
+
+def rows(size, seed=0):
+    """
+    Return size rows of a table: name, number, date and coordinates
+    formatted as a string.
+    """
+
+    columns = zip(names(size, seed), numbers(size, seed + 1),
+                  dates(size, seed + 2), coordinates(size, seed + 3))
+
+    return [[name, number, date, '{:.5f}, {:.5f}'.format(*coords)]
+            for name, number, date, coords in columns]
+
+
+def queries(table, size, seed=0):
+    """
+    Return size rows of the table, some of them with slightly different
+    numbers, to be searched for in the table.
+    """
+
+    r = random.Random(seed)
+
+    result = []
+    for _ in range(size):
+        row = list(r.choice(table))
+        if r.random() < 0.5:
+            row[1] += r.choice((1, 5, 100))
+        result.append(row)
+
+    return result
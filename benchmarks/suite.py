@@ -0,0 +1,298 @@
+"""
+Benchmark suite of matchtools: parsing MatchBlock objects stage by stage,
+the compare_* class methods, string scorers and match_find_all over tables
+of increasing size, on the synthetic datasets of benchmarks/datasets.py.
+
+Results are printed and, with --output, written as JSON to be compared
+with another run by benchmarks/compare.py.
+
+Run with: python benchmarks/suite.py --output results.json
+          python benchmarks/suite.py --sizes 1000 10000 --output quick.json
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+import warnings
+
+from fuzzywuzzy import fuzz
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+import matchtools
+from matchtools import (ColumnStore, MatchBlock, MatchIndex, MatchPlan,
+                        PreparedRows, band_join, date_join, match_find_all,
+                        get_scorer, _geo, _scorers)
+
+import datasets
+
+SIZES = (1000, 10000, 100000)
+
+
+def measure(func, number, repeat=3):
+    """Return best time of func called number times, per call."""
+
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def timed(func):
+    """Return time of a single call of func and its result."""
+
+    start = timeit.default_timer()
+    result = func()
+    return timeit.default_timer() - start, result
+
+
+def _loop(func, arguments):
+    def run():
+        for args in arguments:
+            func(*args)
+    return run
+
+
+def bench_parsing(size):
+    """Time every extraction stage of MatchBlock.__init__ and the whole."""
+
+    strings = ['{} {} {}'.format(name, date, '{:.5f}, {:.5f}'.format(*coords))
+               for name, date, coords in zip(datasets.names(size),
+                                             datasets.dates(size, 1),
+                                             datasets.coordinates(size, 2))]
+    names = datasets.names(size)
+
+    # Input of every stage is what the previous stages leave.
+    after_coordinates = [MatchBlock.extract_coordinates(x)[0] for x in strings]
+    after_dates = [MatchBlock.extract_dates(x)[0] for x in after_coordinates]
+    after_roman = [MatchBlock.roman_to_integers(x) for x in after_dates]
+
+    def str_number(string):
+        MatchBlock.strip_zeros(MatchBlock.extract_str_number(string)[1])
+
+    stages = (
+        ('extract_coordinates', MatchBlock.extract_coordinates, strings),
+        ('extract_dates', MatchBlock.extract_dates, after_coordinates),
+        ('roman_to_integers', MatchBlock.roman_to_integers, after_dates),
+        ('extract_str_number', str_number, after_roman),
+        ('extract_str_custom', MatchBlock.extract_str_custom, names),
+        ('MatchBlock', MatchBlock, strings),
+    )
+
+    results = {}
+    cache = MatchBlock.dates_cache.enabled
+    MatchBlock.dates_cache.enabled = False
+    try:
+        for name, func, inputs in stages:
+            per_call = measure(_loop(func, [(x,) for x in inputs]), 1) / size
+            results['parse.' + name] = per_call
+    finally:
+        MatchBlock.dates_cache.enabled = cache
+
+    return results
+
+
+def bench_compare(size):
+    """Time the compare_* class methods on pairs of values."""
+
+    numbers = datasets.numbers(size)
+    dates = [MatchBlock.extract_dates(x)[1] for x in datasets.dates(size)]
+    coordinates = datasets.coordinates(size)
+    names = datasets.names(size)
+
+    def pairs(values):
+        return list(zip(values, values[1:] + values[:1]))
+
+    MatchBlock.number_tolerance = 10
+    MatchBlock.date_tolerance = 5
+    MatchBlock.coordinates_tolerance = 10
+    MatchBlock.string_tolerance = 10
+
+    cases = [
+        ('compare_numbers', MatchBlock.compare_numbers, pairs(numbers)),
+        ('compare_dates', MatchBlock.compare_dates,
+         pairs([x for x in dates if x])),
+        ('compare_coordinates', MatchBlock.compare_coordinates,
+         pairs(coordinates)),
+        ('compare_strings', MatchBlock.compare_strings, pairs(names)),
+        ('is_abbreviation', MatchBlock.is_abbreviation, pairs(names)),
+    ]
+
+    results = {}
+    for name, func, arguments in cases:
+        per_call = measure(_loop(func, arguments), 1) / len(arguments)
+        results['compare.' + name] = per_call
+
+    # Per pair of the cross product of the two lists of names.
+    others = datasets.names(size, 1)
+    results['compare.compare_strings_matrix'] = measure(
+        lambda: MatchBlock.compare_strings_matrix(names, others), 1,
+        repeat=1) / size ** 2
+    # A tolerance of 15 lets strings of different lengths sharing a word
+    # match, many more pairs are scored: fewer names are compared.
+    few = min(size, 500)
+    results['compare.compare_strings_matrix.15'] = measure(
+        lambda: MatchBlock.compare_strings_matrix(names[:few], others[:few],
+                                                  tolerance=15),
+        1, repeat=1) / few ** 2
+    results['compare.band_join'] = measure(
+        lambda: band_join(numbers, numbers[::-1], 10), 1) / size ** 2
+    found = [x for x in dates if x]
+    results['compare.date_join'] = measure(
+        lambda: date_join(found, found[::-1], 5), 1) / len(found) ** 2
+
+    if _geo.np is not None:
+        coords1, coords2 = zip(*pairs(coordinates))
+        per_call = measure(
+            lambda: MatchBlock.compare_coordinates_many(coords1, coords2),
+            1) / size
+        results['compare.compare_coordinates_many'] = per_call
+
+    return results
+
+
+def bench_scorers(size):
+    """
+    Time every method of every installed scorer backend and the fuzzywuzzy
+    functions they follow on pairs of names.
+    """
+
+    names = datasets.names(size)
+    pairs = list(zip(names, names[1:] + names[:1]))
+
+    backends = [('fuzzywuzzy', {
+        'ratio': fuzz.ratio, 'partial_ratio': fuzz.partial_ratio,
+        'token_sort_ratio': fuzz.token_sort_ratio,
+        'token_set_ratio': fuzz.token_set_ratio, 'uwratio': fuzz.UWRatio})]
+
+    installed = ['python']
+    if _scorers.Levenshtein is not None:
+        installed.append('levenshtein')
+    for name in installed:
+        scorer = get_scorer(name)
+        backends.append((name, {x: getattr(scorer, x)
+                                for x in backends[0][1]}))
+
+    results = {}
+    for backend, methods in backends:
+        for method, func in methods.items():
+            per_call = measure(_loop(func, pairs), 1) / len(pairs)
+            results['scorer.{}.{}'.format(backend, method)] = per_call
+
+    return results
+
+
+def bench_matching(sizes, queries=20):
+    """
+    Time match_find_all searching a list, PreparedRows and MatchIndex of
+    every size for the same query rows, building the latter two and
+    loading a saved PreparedRows, and the same for a ColumnStore. Joins of
+    the query rows and the PreparedRows are planned with MatchPlan.
+    """
+
+    MatchBlock.number_tolerance = 5
+    MatchBlock.date_tolerance = 1
+    MatchBlock.coordinates_tolerance = 1
+    MatchBlock.string_tolerance = 0
+    MatchBlock.str_number_tolerance = 0
+    MatchBlock.str_custom_tolerance = 0
+
+    results = {}
+    for size in sizes:
+        table = datasets.rows(size)
+        rows = datasets.queries(table, queries)
+        suffix = '.{}'.format(size)
+
+        MatchBlock.dates_cache.clear()
+        results['build.PreparedRows' + suffix], prepared = timed(
+            lambda: PreparedRows(table))
+
+        buffer = io.BytesIO()
+        prepared.save(buffer)
+        buffer.seek(0)
+        results['load.PreparedRows' + suffix], _ = timed(
+            lambda: PreparedRows.load(buffer))
+        # Blocks of the loaded rows are built on first use.
+        buffer.seek(0)
+        results['load_all.PreparedRows' + suffix], _ = timed(
+            lambda: list(PreparedRows.load(buffer)))
+
+        # The index is built on the first query.
+        index = MatchIndex(prepared)
+        results['build.MatchIndex' + suffix], _ = timed(
+            lambda: index.find_all(rows[0]))
+
+        directory = tempfile.TemporaryDirectory()
+        results['build.ColumnStore' + suffix], store = timed(
+            lambda: ColumnStore.create(prepared, directory.name))
+
+        # Linear searches of large tables are timed for fewer queries.
+        linear = max(1, queries * 1000 // size)
+        searches = (('list', table, 1), ('PreparedRows', prepared, linear),
+                    ('MatchIndex', index, queries),
+                    ('ColumnStore', store, queries))
+        for name, corpus, count in searches:
+            results['match_find_all.' + name + suffix] = measure(
+                _loop(match_find_all, [(x, corpus) for x in rows[:count]]),
+                1, repeat=1) / count
+
+        directory.cleanup()
+
+        results['plan.MatchPlan' + suffix], plan = timed(
+            lambda: MatchPlan.create(rows, prepared))
+        results['join.MatchPlan' + suffix] = measure(
+            lambda: plan.join(rows, prepared), 1, repeat=1) / queries
+
+    return results
+
+
+def run(sizes=SIZES, parse_size=2000):
+    """Run all benchmarks, return dict of results in seconds per call."""
+
+    results = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results.update(bench_parsing(parse_size))
+        results.update(bench_compare(parse_size))
+        results.update(bench_scorers(parse_size))
+        results.update(bench_matching(sizes))
+
+    return {
+        'meta': {
+            'matchtools': matchtools.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': datetime.datetime.now().replace(microsecond=0).isoformat(),
+            'sizes': list(sizes),
+            'parse_size': parse_size,
+            'unit': 'seconds per call',
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='numbers of rows for match_find_all')
+    parser.add_argument('--parse-size', type=int, default=2000,
+                        help='number of values for parsing and compare_*')
+    parser.add_argument('--output', help='file to write JSON results to')
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.parse_size)
+
+    for name, value in sorted(report['results'].items()):
+        print('{:<45} {:>12.3f} us'.format(name, value * 1e6))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
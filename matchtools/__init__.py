@@ -1,7 +1,23 @@
+from ._acronyms import *
+from ._columnar import *
+from ._config import *
+from ._dictionary import *
+from ._joins import *
 from ._matchblock import *
+from ._matchindex import *
+from ._parallel import *
+from ._planner import *
+from ._prepared import *
+from ._scorers import *
+from ._spatial import *
+from ._stats import *
 from ._utils import *
 
-__all__ = _matchblock.__all__ + _utils.__all__
+__all__ = (_acronyms.__all__ + _columnar.__all__ + _config.__all__ +
+           _dictionary.__all__ + _joins.__all__ + _matchblock.__all__ +
+           _matchindex.__all__ + _parallel.__all__ + _planner.__all__ +
+           _prepared.__all__ + _scorers.__all__ + _spatial.__all__ +
+           _stats.__all__ + _utils.__all__)
 
 __version__ = '0.1.2'
 __author__ = 'Anton Kupenko & Dawid Kaczmarski'
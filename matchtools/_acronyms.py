@@ -0,0 +1,117 @@
+from functools import lru_cache
+
+__all__ = ['AcronymIndex']
+
+# Words left out of acronyms.
+SKIP_WORDS = frozenset(('a', 'an', 'and', 'of', 'the'))
+
+
+@lru_cache(maxsize=65536)
+def abbreviation_keys(string):
+    """
+    Return the string stripped and lowercased, and its acronym: initials of
+    its words other than SKIP_WORDS, None for strings of less than 2 words.
+
+    One of two strings is an abbreviation of the other (see
+    MatchBlock.is_abbreviation) when the first key of the shorter one is
+    the acronym of the other one.
+
+    :param string: str
+    :rtype: tuple
+    """
+
+    text = string.strip().lower()
+    words = text.split()
+
+    if len(words) < 2:
+        return text, None
+
+    return text, ''.join(x[0] for x in words if x not in SKIP_WORDS)
+
+
+def keys_match(keys1, keys2):
+    """
+    Check if the abbreviation keys of two strings show that one of them is
+    an abbreviation of the other.
+
+    :param keys1: tuple
+    :param keys2: tuple
+    :rtype: bool
+    """
+
+    if len(keys1[0]) <= len(keys2[0]):
+        return keys1[0] == keys2[1]
+    return keys2[0] == keys1[1]
+
+
+class AcronymIndex:
+    """
+    Index of strings by their abbreviation keys, to find the strings one
+    of which is an abbreviation of the other (see MatchBlock.is_abbreviation)
+    with two hash lookups.
+
+    :param strings: iterable of str
+
+    :Example:
+
+    >>> index = AcronymIndex(['Federal Bureau of Investigation', 'FBI',
+    ...                       'Bureau'])
+    >>> index.find('fbi')
+    [0]
+    >>> index.find('Federal Bureau of Investigation')
+    [1]
+    """
+
+    def __init__(self, strings=()):
+        self._texts = {}
+        self._acronyms = {}
+        self._size = 0
+
+        for string in strings:
+            self.add(string)
+
+    def add(self, string):
+        """
+        Add the string to the index.
+
+        Return its position in the index.
+
+        :param string: str
+        :rtype: int
+        """
+
+        position = self._size
+        text, acronym = abbreviation_keys(string)
+
+        self._texts.setdefault(text, []).append(position)
+        if acronym is not None:
+            self._acronyms.setdefault(acronym, []).append(position)
+
+        self._size += 1
+        return position
+
+    def find(self, string):
+        """
+        Return sorted positions of the strings in the index which are
+        abbreviations of the string or of which the string is an
+        abbreviation.
+
+        :param string: str
+        :rtype: list
+        """
+
+        text, acronym = abbreviation_keys(string)
+
+        # An acronym is always shorter than the string it comes from.
+        positions = list(self._acronyms.get(text, ()))
+        if acronym is not None:
+            positions.extend(self._texts.get(acronym, ()))
+
+        return sorted(positions)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return '<{} object at {}: {} strings>'.format(
+            type(self).__name__, hex(id(self)), self._size)
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe least recently used cache with hit and miss counters.
+
+    Once maxsize entries are stored, adding a new one evicts the least
+    recently used entry. A maxsize of None makes the cache unbounded.
+    A disabled cache neither stores nor returns anything.
+
+    Values are stored as they are: store immutable values only (e.g. tuples),
+    so that callers cannot corrupt the cached results.
+
+    :param maxsize: int or None
+    :param enabled: bool
+
+    :Example:
+
+    >>> cache = LRUCache(maxsize=1)
+    >>> cache.put('a', 1)
+    >>> cache.get('a'), cache.get('b')
+    (1, None)
+    >>> cache.hits, cache.misses
+    (1, 1)
+    """
+
+    def __init__(self, maxsize=4096, enabled=True):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = None
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        if value is not None and value < 0:
+            raise ValueError("maxsize can't be negative")
+
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.enabled and key in self._data
+
+    def _evict(self):
+        if self._maxsize is None:
+            return
+
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        """
+        Return value stored for the key and mark it as recently used, or
+        default if there is none.
+        """
+
+        if not self.enabled:
+            return default
+
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store the value for the key, evicting old entries if necessary."""
+
+        if not self.enabled or self._maxsize == 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """
+        Return counters and size of the cache.
+
+        :rtype: dict
+        """
+
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self._data),
+                'maxsize': self._maxsize, 'enabled': self.enabled}
@@ -0,0 +1,501 @@
+import datetime
+import json
+import os
+import pickle
+
+from . import _storage
+from ._matchblock import MatchBlock
+from ._prepared import PreparedRow, PreparedRows, _blocks_match
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ['ColumnStore']
+
+# Version of the layout of the directories, increased whenever it changes.
+FORMAT_VERSION = 1
+
+_META = 'meta.json'
+
+# Kinds of numbers. Integers out of the range of int64 are read from the
+# row when needed.
+_NO_NUMBER, _INTEGER, _FLOAT, _BIG_INTEGER = range(4)
+
+_INT64 = (-2 ** 63, 2 ** 63 - 1)
+
+# Attributes stored in tables of strings, at positions 3 to 5 of attributes.
+_STRINGS = ('string', 'str_number', 'str_custom')
+
+_DAY = 86400 * 10 ** 6
+
+# Allowances for rounding errors of the filters, which only leave out rows
+# that can't match: relative error of float64 numbers and error of
+# distances computed with numpy (see compare_coordinates_many), in km.
+_RELATIVE = 1e-9
+_KILOMETERS = 1e-5
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('numpy is required for ColumnStore, install it '
+                          'with: pip install numpy')
+
+
+def _presence(attributes):
+    """Return bit mask of the attributes which aren't null."""
+
+    null = MatchBlock._null
+    return sum(1 << k for k, x in enumerate(attributes) if x not in null)
+
+
+def _micros(date):
+    """
+    Return microseconds from 0001-01-01 to the datetime, in UTC if it is
+    timezone aware, and its UTC offset in microseconds or None.
+    """
+
+    local = ((date.toordinal() * 86400 + date.hour * 3600 +
+              date.minute * 60 + date.second) * 10 ** 6 + date.microsecond)
+
+    offset = date.utcoffset()
+    if offset is None:
+        return local, None
+
+    offset = (offset.days * 86400 + offset.seconds) * 10 ** 6 + \
+        offset.microseconds
+    return local - offset, offset
+
+
+def _datetime(micros, offset):
+    """Inverse of _micros, the offset being None for naive datetimes."""
+
+    if offset is not None:
+        micros += offset
+
+    days, micros = divmod(micros, _DAY)
+    date = datetime.datetime.fromordinal(days) + \
+        datetime.timedelta(microseconds=micros)
+
+    if offset is None:
+        return date
+
+    tzinfo = datetime.timezone(datetime.timedelta(microseconds=offset))
+    return date.replace(tzinfo=tzinfo)
+
+
+class _StringTable:
+    """Strings numbered in the order they are added, '' being 0."""
+
+    def __init__(self):
+        self.ids = {'': 0}
+        self.strings = ['']
+
+    def add(self, string):
+        id_ = self.ids.get(string)
+        if id_ is None:
+            id_ = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return id_
+
+    def arrays(self):
+        """Return UTF-8 bytes of all the strings and their offsets."""
+
+        return _blob(x.encode('utf-8') for x in self.strings)
+
+
+def _blob(chunks):
+    """Return uint8 array of the chunks of bytes and int64 offsets."""
+
+    chunks = list(chunks)
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    np.cumsum([len(x) for x in chunks], out=offsets[1:])
+
+    data = np.frombuffer(b''.join(chunks), dtype=np.uint8)
+    return data, offsets
+
+
+class _Writer:
+    """Columns of the attributes of blocks, row after row."""
+
+    def __init__(self):
+        self.rows = []
+        self.lengths = []
+        self.present = []
+        self.kinds, self.numbers, self.integers = [], [], []
+        self.date_counts, self.date_starts = [], []
+        self.date_micros, self.date_offsets, self.date_aware = [], [], []
+        self.coordinates = []
+        self.tables = [_StringTable() for _ in _STRINGS]
+        self.ids = [[] for _ in _STRINGS]
+
+    def add(self, element):
+        self.rows.append(pickle.dumps(element.row,
+                                      protocol=pickle.HIGHEST_PROTOCOL))
+        self.lengths.append(len(element.blocks))
+
+        for block in element.blocks:
+            attributes = block._attributes
+            self.present.append(_presence(attributes))
+            self._add_number(attributes[0])
+            self._add_dates(attributes[1])
+            self.coordinates.append(attributes[2] or (np.nan, np.nan))
+            for k, string in enumerate(attributes[3:]):
+                self.ids[k].append(self.tables[k].add(string))
+
+    def _add_number(self, number):
+        if number is None:
+            kind, value = _NO_NUMBER, 0
+        elif isinstance(number, float):
+            kind, value = _FLOAT, 0
+        elif _INT64[0] <= number <= _INT64[1]:
+            kind, value = _INTEGER, number
+        else:
+            kind, value = _BIG_INTEGER, 0
+
+        self.kinds.append(kind)
+        self.integers.append(value)
+        try:
+            self.numbers.append(np.nan if number is None else float(number))
+        except OverflowError:
+            self.numbers.append(np.inf if number > 0 else -np.inf)
+
+    def _add_dates(self, dates):
+        self.date_counts.append(len(dates))
+        self.date_starts.append(len(self.date_micros))
+
+        for date in dates:
+            micros, offset = _micros(date)
+            self.date_micros.append(micros)
+            self.date_offsets.append(offset or 0)
+            self.date_aware.append(offset is not None)
+
+    def arrays(self):
+        """Return dict of names and arrays of the columns."""
+
+        lengths = np.array(self.lengths, dtype=np.int32)
+        cells = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=cells[1:])
+
+        arrays = {
+            'lengths': lengths,
+            'cells': cells,
+            'present': np.array(self.present, dtype=np.uint8),
+            'number_kinds': np.array(self.kinds, dtype=np.int8),
+            'numbers': np.array(self.numbers, dtype=np.float64),
+            'integers': np.array(self.integers, dtype=np.int64),
+            'date_counts': np.array(self.date_counts, dtype=np.int32),
+            'date_starts': np.array(self.date_starts, dtype=np.int64),
+            'date_micros': np.array(self.date_micros, dtype=np.int64),
+            'date_offsets': np.array(self.date_offsets, dtype=np.int64),
+            'date_aware': np.array(self.date_aware, dtype=bool),
+            'coordinates': np.array(self.coordinates,
+                                    dtype=np.float64).reshape(-1, 2),
+        }
+        arrays['row_data'], arrays['row_offsets'] = _blob(self.rows)
+
+        for name, table, ids in zip(_STRINGS, self.tables, self.ids):
+            arrays[name + '_ids'] = np.array(ids, dtype=np.int32)
+            arrays[name + '_data'], arrays[name + '_offsets'] = table.arrays()
+
+        return arrays
+
+
+def _attach(path, options):
+    """Open the store in a process it was pickled to."""
+
+    return ColumnStore(path, **options)
+
+
+class ColumnStore:
+    """
+    Corpus of rows stored column by column in a directory of numpy arrays,
+    memory-mapped when the store is opened.
+
+    Every attribute of the parsed MatchBlock objects has its own arrays:
+    numbers, dates as microseconds with their UTC offsets (a list of dates
+    per value, found by offset and count), pairs of coordinates, and ids of
+    string, str_number and str_custom in tables of unique strings. Rows are
+    kept pickled one by one.
+
+    Processes opening the same directory share its pages instead of holding
+    copies of the corpus; a pickled store (e.g. sent to worker processes by
+    match_tables) is opened again from its path. Searches filter the rows
+    with numpy on the arrays, by the pattern of attributes found in every
+    column, numbers, first dates and coordinates, and only build MatchBlock
+    objects of the remaining rows to compare them like match_rows, so
+    results are the same as for PreparedRows.
+
+    A store can be used wherever a PreparedRows corpus can. Use
+    ColumnStore.create to parse rows into a new store. The directory
+    records the options the rows were parsed with, opening it with other
+    flags, dictionary or date formats raises ValueError (see
+    PreparedRows.load). numpy is required.
+
+    :param path: str, directory of the store
+    :param kwargs: options of the corpus, by default the ones the rows were
+        parsed with
+
+    :Example:
+
+    >>> store = ColumnStore.create(rows, 'flights')
+    >>> store = ColumnStore('flights')
+    >>> match_tables(queries, store, workers=4)
+    """
+
+    def __init__(self, path, **kwargs):
+        _require_numpy()
+
+        self.path = path
+
+        with open(os.path.join(path, _META), 'r') as f:
+            meta = json.load(f)
+
+        if meta['format_version'] != FORMAT_VERSION:
+            msg = 'unsupported format version {} of the store, expected {}'
+            raise ValueError(msg.format(meta['format_version'],
+                                        FORMAT_VERSION))
+
+        self.options = _storage.check_signature(meta, kwargs)
+
+        self._arrays = {
+            name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+            for name in meta['arrays']}
+
+    @classmethod
+    def create(cls, rows, path, **kwargs):
+        """
+        Parse the rows and write them to a new store in the directory, then
+        open it. Rows of a PreparedRows corpus are not parsed again, and its
+        options are used.
+
+        Keyword arguments are passed to MatchBlock when parsing the rows.
+
+        :param rows: iterable of lists or tuples, PreparedRows
+        :param path: str, directory, created if necessary
+        :rtype: ColumnStore
+        """
+
+        _require_numpy()
+
+        if isinstance(rows, PreparedRows):
+            kwargs = rows.options
+        else:
+            rows = (PreparedRow.from_row(row, **kwargs) for row in rows)
+
+        writer = _Writer()
+        for element in rows:
+            writer.add(element)
+        arrays = writer.arrays()
+
+        os.makedirs(path, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + '.npy'), array)
+
+        meta = dict(_storage.parse_signature(kwargs),
+                    format_version=FORMAT_VERSION, rows=len(writer.rows),
+                    arrays=sorted(arrays))
+        with open(os.path.join(path, _META), 'w') as f:
+            json.dump(meta, f, sort_keys=True)
+
+        return cls(path, **kwargs)
+
+    def __reduce__(self):
+        return _attach, (self.path, self.options)
+
+    def __len__(self):
+        return len(self._arrays['lengths'])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, item):
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('store index out of range')
+
+        return PreparedRow(self._row(item), self._blocks(item))
+
+    def __repr__(self):
+        return '<{} object at {}: {} rows in {!r}>'.format(
+            type(self).__name__, hex(id(self)), len(self), self.path)
+
+    @property
+    def rows(self):
+        return [self._row(i) for i in range(len(self))]
+
+    def _row(self, i):
+        offsets = self._arrays['row_offsets']
+        data = self._arrays['row_data'][offsets[i]:offsets[i + 1]]
+        return pickle.loads(data.tobytes())
+
+    def _string(self, k, id_):
+        if not id_:
+            return ''
+
+        name = _STRINGS[k]
+        offsets = self._arrays[name + '_offsets']
+        data = self._arrays[name + '_data'][offsets[id_]:offsets[id_ + 1]]
+        return data.tobytes().decode('utf-8')
+
+    def _number(self, cell, row, column):
+        kind = self._arrays['number_kinds'][cell]
+        if kind == _NO_NUMBER:
+            return None
+        if kind == _INTEGER:
+            return int(self._arrays['integers'][cell])
+        if kind == _FLOAT:
+            return float(self._arrays['numbers'][cell])
+
+        return MatchBlock(self._row(row)[column], **self.options).number
+
+    def _dates(self, cell):
+        arrays = self._arrays
+        start = int(arrays['date_starts'][cell])
+        stop = start + int(arrays['date_counts'][cell])
+
+        return tuple(
+            _datetime(int(micros), int(offset) if aware else None)
+            for micros, offset, aware in zip(
+                arrays['date_micros'][start:stop],
+                arrays['date_offsets'][start:stop],
+                arrays['date_aware'][start:stop]))
+
+    def _blocks(self, i):
+        """Return tuple of MatchBlock objects of the row at position i."""
+
+        arrays = self._arrays
+        new = MatchBlock.__new__
+        start = int(arrays['cells'][i])
+
+        blocks = []
+        for column in range(int(arrays['lengths'][i])):
+            cell = start + column
+            coordinates = arrays['coordinates'][cell]
+
+            block = new(MatchBlock)
+            block._number = self._number(cell, i, column)
+            block._date = self._dates(cell)
+            block._coordinates = None if np.isnan(coordinates[0]) else \
+                (float(coordinates[0]), float(coordinates[1]))
+            block._string, block._str_number, block._str_custom = (
+                self._string(k, int(arrays[name + '_ids'][cell]))
+                for k, name in enumerate(_STRINGS))
+            block._pending = None
+            blocks.append(block)
+
+        return tuple(blocks)
+
+    def prepare(self, row):
+        """
+        Parse the row with the options of the store.
+
+        Return the row unchanged if it is already a PreparedRow.
+
+        :param row: list, tuple, PreparedRow
+        :rtype: PreparedRow
+        """
+
+        if isinstance(row, PreparedRow):
+            return row
+
+        return PreparedRow.from_row(row, **self.options)
+
+    def _filter_numbers(self, cells, number, tolerance):
+        try:
+            number = float(number)
+        except OverflowError:
+            return np.ones(len(cells), dtype=bool)
+
+        numbers = self._arrays['numbers'][cells]
+        slack = _RELATIVE * (abs(number) + np.abs(numbers))
+        # Big integers are stored as infinities, compared exactly later.
+        big = self._arrays['number_kinds'][cells] == _BIG_INTEGER
+        return (np.abs(numbers - number) <= tolerance + slack) | big
+
+    def _filter_dates(self, cells, dates, tolerance):
+        arrays = self._arrays
+        keep = arrays['date_counts'][cells] == len(dates)
+
+        micros, offset = _micros(dates[0])
+        starts = arrays['date_starts'][cells[keep]]
+        days = np.abs((micros - arrays['date_micros'][starts]) // _DAY)
+
+        # Naive and aware dates can't be compared, compare_dates raises it.
+        mixed = arrays['date_aware'][starts] != (offset is not None)
+        keep[keep] = (days <= tolerance) | mixed
+        return keep
+
+    def _filter_coordinates(self, cells, coordinates, tolerance):
+        return MatchBlock.compare_coordinates_many(
+            coordinates, self._arrays['coordinates'][cells],
+            tolerance=tolerance + _KILOMETERS)
+
+    def _candidates(self, blocks, config):
+        """
+        Return positions of the rows which can match the blocks, filtered
+        from the cheapest attributes: the rows can only be left out if they
+        don't match.
+        """
+
+        arrays = self._arrays
+        positions = np.flatnonzero(
+            np.asarray(arrays['lengths']) == len(blocks))
+        attributes = [x._attributes for x in blocks]
+
+        filters = ((None, None),
+                   (0, self._filter_numbers), (1, self._filter_dates),
+                   (2, self._filter_coordinates))
+
+        for index, func in filters:
+            for column, values in enumerate(attributes):
+                if not len(positions):
+                    return positions
+
+                cells = arrays['cells'][positions] + column
+                if func is None:
+                    keep = arrays['present'][cells] == _presence(values)
+                elif values[index] in MatchBlock._null:
+                    continue
+                else:
+                    keep = func(cells, values[index], config[index])
+                positions = positions[keep]
+
+        return positions
+
+    def _matches(self, row, config):
+        if config is None:
+            config = MatchBlock.config()
+
+        blocks = self.prepare(row).blocks
+
+        for i in self._candidates(blocks, config).tolist():
+            if _blocks_match(blocks, self._blocks(i), config):
+                yield self._row(i)
+
+    def find(self, row, config=None):
+        """
+        Return first row of the store that matches the input row.
+
+        :param row: list, tuple, PreparedRow
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :rtype: list
+        """
+
+        return next(self._matches(row, config), None)
+
+    def find_all(self, row, config=None):
+        """
+        Return all rows of the store that match the input row, in their
+        order.
+
+        :param row: list, tuple, PreparedRow
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :rtype: list
+        """
+
+        return list(self._matches(row, config))
@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+__all__ = ['MatchConfig']
+
+# Methods of compare_strings, names of the methods of Scorer.
+STRING_METHODS = ('uwratio', 'partial_ratio', 'token_sort_ratio',
+                  'token_set_ratio', 'ratio')
+
+TOLERANCES = ('number_tolerance', 'date_tolerance', 'coordinates_tolerance',
+              'string_tolerance', 'str_number_tolerance',
+              'str_custom_tolerance')
+
+_STRING_TOLERANCES = ('string_tolerance', 'str_number_tolerance',
+                      'str_custom_tolerance')
+
+
+class MatchConfig(namedtuple('MatchConfig', TOLERANCES + ('method',))):
+    """
+    Immutable set of the six tolerances of MatchBlock and the method of
+    compare_strings used to compare strings.
+
+    A MatchConfig passed to MatchBlock.matches, match_rows, match_find,
+    match_find_all, match_tables and the find methods of PreparedRows and
+    MatchIndex is used instead of the tolerances set on MatchBlock, so that
+    threads and worker processes can match with different settings at the
+    same time. MatchBlock.config() returns the tolerances set on MatchBlock.
+
+    :param number_tolerance: number
+    :param date_tolerance: number
+    :param coordinates_tolerance: number, in kilometers
+    :param string_tolerance: number, from 0 to 100
+    :param str_number_tolerance: number, from 0 to 100
+    :param str_custom_tolerance: number, from 0 to 100
+    :param method: str, one of: 'uwratio', 'partial_ratio',
+                                'token_sort_ratio', 'token_set_ratio',
+                                'ratio'
+
+    :Example:
+
+    >>> config = MatchConfig(number_tolerance=5)
+    >>> MatchBlock(100).matches(MatchBlock(104), config)
+    True
+    >>> config.replace(number_tolerance=0).number_tolerance
+    0
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, number_tolerance=0, date_tolerance=0,
+                coordinates_tolerance=0, string_tolerance=0,
+                str_number_tolerance=0, str_custom_tolerance=0,
+                method='uwratio'):
+
+        self = super().__new__(
+            cls, number_tolerance, date_tolerance, coordinates_tolerance,
+            string_tolerance, str_number_tolerance, str_custom_tolerance,
+            method)
+
+        for name in TOLERANCES:
+            if getattr(self, name) < 0:
+                raise ValueError("{} can't be negative".format(name))
+
+        for name in _STRING_TOLERANCES:
+            if getattr(self, name) > 100:
+                raise ValueError('{} must be lower than 100'.format(name))
+
+        if method not in STRING_METHODS:
+            msg = 'wrong method, use available: {}'
+            raise ValueError(msg.format(', '.join(sorted(STRING_METHODS))))
+
+        return self
+
+    def replace(self, **kwargs):
+        """
+        Return new MatchConfig with some of the values replaced.
+
+        :rtype: MatchConfig
+        """
+
+        return type(self)(**dict(self._asdict(), **kwargs))
+
+    @property
+    def tolerances(self):
+        """Tuple of the six tolerances, in the order of TOLERANCES."""
+
+        return tuple(self[:len(TOLERANCES)])
@@ -0,0 +1,86 @@
+import datetime
+import re
+
+_MONTHS = {'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3,
+           'march': 3, 'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6,
+           'jul': 7, 'july': 7, 'aug': 8, 'august': 8, 'sep': 9, 'sept': 9,
+           'september': 9, 'oct': 10, 'october': 10, 'nov': 11,
+           'november': 11, 'dec': 12, 'december': 12}
+
+
+def _year_month_day(match):
+    return int(match.group('y')), int(match.group('m')), int(match.group('d'))
+
+
+def _numeric_day_month(match):
+    # Month first, like datefinder, unless the first number can't be a month.
+    first, second = int(match.group('a')), int(match.group('b'))
+    if first > 12:
+        first, second = second, first
+    return int(match.group('y')), first, second
+
+
+def _named_month(match):
+    month = _MONTHS.get(match.group('m').lower())
+    if month is None:
+        return None
+    return int(match.group('y')), month, int(match.group('d'))
+
+
+# Formats recognized by fast_dates, each a regular expression matching the
+# whole string and a function returning (year, month, day) from the match.
+DATE_FORMATS = {
+    # 2015-05-01
+    'iso': (re.compile(r'(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})'),
+            _year_month_day),
+    # 2015/05/01
+    'ymd_slash': (re.compile(r'(?P<y>\d{4})/(?P<m>\d{1,2})/(?P<d>\d{1,2})'),
+                  _year_month_day),
+    # 05/01/2015, 13/05/2015
+    'numeric_slash': (
+        re.compile(r'(?P<a>\d{1,2})/(?P<b>\d{1,2})/(?P<y>\d{4})'),
+        _numeric_day_month),
+    # 1 May 2015, 10-Dec-2015
+    'day_month_year': (
+        re.compile(r'(?P<d>\d{1,2})(?P<s>[ -])(?P<m>[A-Za-z]{3,9})(?P=s)'
+                   r'(?P<y>\d{4})'),
+        _named_month),
+    # May 1, 2015
+    'month_day_year': (
+        re.compile(r'(?P<m>[A-Za-z]{3,9}) (?P<d>\d{1,2}), (?P<y>\d{4})'),
+        _named_month),
+}
+
+
+def fast_dates(string, formats):
+    """
+    Recognize strings consisting of a single date in one of the formats
+    (names of DATE_FORMATS).
+
+    Return the same as MatchBlock.extract_dates, with a tuple of dates, or
+    None if the string is not recognized and needs to be parsed by
+    datefinder.
+
+    :param string: str
+    :param formats: iterable of str
+    :rtype: tuple or None
+    """
+
+    stripped = string.strip()
+
+    for name in formats:
+        pattern, convert = DATE_FORMATS[name]
+        match = pattern.fullmatch(stripped)
+        if match is None:
+            continue
+
+        parts = convert(match)
+        if parts is None:
+            return None
+
+        try:
+            return '', (datetime.datetime(*parts),)
+        except ValueError:
+            return None
+
+    return None
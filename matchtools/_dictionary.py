@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+__all__ = ['Dictionary']
+
+
+class Dictionary:
+    """
+    Dictionary of standardised forms used by MatchBlock.dict_sub and
+    MatchBlock.extract_str_custom: every key is the standardised form of the
+    values listed under it.
+
+    The map of values to keys used for substitution is built once, when the
+    object is created. Use Dictionary.load to read a dictionary from a JSON
+    file; loaded dictionaries are cached per process by path and modification
+    time of the file, so several of them can be used side by side without
+    reading the files again. MatchBlock checks files for modifications at
+    most once every _recheck_interval seconds, and never the dictionary
+    provided with the package, read once.
+
+    :param mapping: dict, keys and lists of their values
+
+    :Example:
+
+    >>> dictionary = Dictionary({'north': ['n', 'nord']})
+    >>> MatchBlock.dict_sub('Nord London', dictionary)
+    'north London'
+    """
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    # Dictionaries used by MatchBlock, by path, with the time their files
+    # were last checked, and the dictionary provided with the package.
+    _checked = {}
+    _recheck_interval = 1.0
+    _default = None
+
+    _default_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 'dictionary.json')
+
+    def __init__(self, mapping):
+        self._mapping = {k: frozenset(v) for k, v in mapping.items()}
+
+        self._fingerprint = None
+
+        self._reverse = {}
+        for substitute, replacements in self._mapping.items():
+            for word in replacements:
+                self._reverse.setdefault(word, substitute)
+
+    @classmethod
+    def load(cls, file):
+        """
+        Return the dictionary stored in the JSON file.
+
+        The file is read only the first time and whenever it has been
+        modified since.
+
+        :param file: str
+        :rtype: Dictionary
+        """
+
+        path = os.path.abspath(file)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = cls._cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with open(path, 'r') as f:
+            dictionary = cls(json.loads(f.read()))
+
+        with cls._cache_lock:
+            cls._cache[path] = (version, dictionary)
+
+        return dictionary
+
+    @classmethod
+    def default(cls):
+        """
+        Return the dictionary provided with the package, read only once.
+
+        :rtype: Dictionary
+        """
+
+        dictionary = cls._default
+        if dictionary is None:
+            dictionary = cls._default = cls.load(cls._default_file)
+
+        return dictionary
+
+    @classmethod
+    def _recent(cls, file):
+        """
+        Return the dictionary stored in the JSON file like load, checking
+        the file for modifications at most once every _recheck_interval
+        seconds.
+        """
+
+        now = time.monotonic()
+        checked = cls._checked.get(file)
+        if checked is not None and now - checked[0] < cls._recheck_interval:
+            return checked[1]
+
+        dictionary = cls.load(file)
+        cls._checked[file] = (now, dictionary)
+        return dictionary
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget all loaded dictionaries."""
+
+        with cls._cache_lock:
+            cls._cache.clear()
+            cls._checked.clear()
+            cls._default = None
+
+    @property
+    def mapping(self):
+        return self._mapping
+
+    @property
+    def reverse(self):
+        return self._reverse
+
+    @property
+    def fingerprint(self):
+        """
+        Hex digest of the contents of the dictionary, the same for equal
+        dictionaries, used to tell which dictionary data were parsed with.
+        """
+
+        if self._fingerprint is None:
+            data = json.dumps({k: sorted(v) for k, v in self._mapping.items()},
+                              sort_keys=True)
+            self._fingerprint = hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+        return self._fingerprint
+
+    def __contains__(self, key):
+        return key in self._mapping
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __len__(self):
+        return len(self._mapping)
+
+    def __eq__(self, other):
+        if not isinstance(other, Dictionary):
+            return NotImplemented
+        return self._mapping == other._mapping
+
+    def __hash__(self):
+        return hash(frozenset(self._mapping.items()))
+
+    def __repr__(self):
+        return '<{} object at {}: {} keys>'.format(
+            type(self).__name__, hex(id(self)), len(self))
+
+    def substitute(self, word):
+        """
+        Return the key of the dictionary listing the word (in lower case)
+        among its values, or the word itself.
+
+        :param word: str
+        :rtype: str
+        """
+
+        return self._reverse.get(word.lower(), word)
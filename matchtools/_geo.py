@@ -0,0 +1,197 @@
+import warnings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# WGS-84 ellipsoid and mean earth radius used by geopy, in kilometers.
+_MAJOR, _MINOR, _FLATTENING = 6378.137, 6356.7523142, 1 / 298.257223563
+_EARTH_RADIUS = 6371.009
+
+_ITERATIONS = 20
+
+# Length of one kilometer in every unit supported by compare_coordinates.
+_UNITS = {'kilometers': 1., 'km': 1.,
+          'meters': 1000., 'm': 1000.,
+          'miles': 1 / 1.609344, 'mi': 1 / 1.609344,
+          'feet': 5280 / 1.609344, 'ft': 5280 / 1.609344,
+          'nautical': 1 / 1.852, 'nm': 1 / 1.852}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('numpy is required for vectorized coordinates '
+                          'comparison, install it with: pip install numpy')
+
+
+def unit_factor(unit):
+    """
+    Return length of one kilometer in the unit.
+
+    :param unit: str, one of: 'kilometers', 'km', 'meters',
+                              'm', 'miles', 'mi', 'feet',
+                              'ft', 'nautical', 'nm'
+    :rtype: float
+    """
+
+    unit = unit.strip().lower()
+    if unit not in _UNITS:
+        raise ValueError('unsupported unit')
+
+    return _UNITS[unit]
+
+
+def as_coordinates(coords):
+    """
+    Convert a pair of coordinates or a sequence of pairs into two float
+    arrays of latitudes and longitudes in radians.
+
+    :param coords: tuple of two numbers or a sequence of such tuples
+    :rtype: tuple
+    """
+
+    _require_numpy()
+
+    coords = np.asarray(coords, dtype=float)
+    if coords.shape[-1:] != (2,):
+        raise ValueError('coordinates must be pairs of latitude and longitude')
+
+    if np.any(np.abs(coords[..., 0]) > 90):
+        raise ValueError('latitude must be in the [-90; 90] range')
+
+    coords = np.radians(coords)
+    return coords[..., 0], coords[..., 1]
+
+
+def great_circle_distance(lat1, lng1, lat2, lng2):
+    """
+    Great circle distance in kilometers between arrays of points given in
+    radians, same formula as geopy.distance.great_circle.
+
+    :rtype: numpy.ndarray
+    """
+
+    sin_lat1, cos_lat1 = np.sin(lat1), np.cos(lat1)
+    sin_lat2, cos_lat2 = np.sin(lat2), np.cos(lat2)
+
+    delta_lng = lng2 - lng1
+    cos_delta_lng, sin_delta_lng = np.cos(delta_lng), np.sin(delta_lng)
+
+    d = np.arctan2(np.sqrt((cos_lat2 * sin_delta_lng) ** 2 +
+                           (cos_lat1 * sin_lat2 -
+                            sin_lat1 * cos_lat2 * cos_delta_lng) ** 2),
+                   sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_delta_lng)
+
+    return _EARTH_RADIUS * d
+
+
+def vincenty_distance(lat1, lng1, lat2, lng2):
+    """
+    Vincenty distance in kilometers on the WGS-84 ellipsoid between arrays
+    of points given in radians, same iteration as geopy.distance.vincenty.
+
+    Pairs for which the formula fails to converge get the great circle
+    distance, with a warning, like in MatchBlock.compare_coordinates.
+
+    :rtype: numpy.ndarray
+    """
+
+    lat1, lng1, lat2, lng2 = np.broadcast_arrays(lat1, lng1, lat2, lng2)
+    major, minor, f = _MAJOR, _MINOR, _FLATTENING
+
+    delta_lng = lng2 - lng1
+
+    reduced_lat1 = np.arctan((1 - f) * np.tan(lat1))
+    reduced_lat2 = np.arctan((1 - f) * np.tan(lat2))
+
+    sin_reduced1, cos_reduced1 = np.sin(reduced_lat1), np.cos(reduced_lat1)
+    sin_reduced2, cos_reduced2 = np.sin(reduced_lat2), np.cos(reduced_lat2)
+
+    lambda_lng = delta_lng.copy()
+    sin_sigma = np.zeros(delta_lng.shape)
+    cos_sigma = np.ones(delta_lng.shape)
+    sigma = np.zeros(delta_lng.shape)
+    cos_sq_alpha = np.ones(delta_lng.shape)
+    cos2_sigma_m = np.zeros(delta_lng.shape)
+
+    active = np.ones(delta_lng.shape, dtype=bool)
+    coincident = np.zeros(delta_lng.shape, dtype=bool)
+    iterations = np.zeros(delta_lng.shape, dtype=int)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(1, _ITERATIONS + 2):
+            if not active.any():
+                break
+
+            iterations[active] = i
+
+            sin_lambda_lng, cos_lambda_lng = (np.sin(lambda_lng),
+                                              np.cos(lambda_lng))
+
+            new_sin_sigma = np.sqrt(
+                (cos_reduced2 * sin_lambda_lng) ** 2 +
+                (cos_reduced1 * sin_reduced2 -
+                 sin_reduced1 * cos_reduced2 * cos_lambda_lng) ** 2)
+
+            coincident |= active & (new_sin_sigma == 0)
+            active &= ~coincident
+
+            new_cos_sigma = (sin_reduced1 * sin_reduced2 +
+                             cos_reduced1 * cos_reduced2 * cos_lambda_lng)
+
+            new_sigma = np.arctan2(new_sin_sigma, new_cos_sigma)
+
+            sin_alpha = (cos_reduced1 * cos_reduced2 * sin_lambda_lng /
+                         new_sin_sigma)
+            new_cos_sq_alpha = 1 - sin_alpha ** 2
+
+            # Equatorial line
+            new_cos2_sigma_m = np.where(
+                new_cos_sq_alpha != 0,
+                new_cos_sigma - 2 * (sin_reduced1 * sin_reduced2 /
+                                     new_cos_sq_alpha),
+                0.)
+
+            C = f / 16. * new_cos_sq_alpha * (
+                4 + f * (4 - 3 * new_cos_sq_alpha))
+
+            new_lambda_lng = (
+                delta_lng + (1 - C) * f * sin_alpha * (
+                    new_sigma + C * new_sin_sigma * (
+                        new_cos2_sigma_m + C * new_cos_sigma * (
+                            -1 + 2 * new_cos2_sigma_m ** 2))))
+
+            sin_sigma = np.where(active, new_sin_sigma, sin_sigma)
+            cos_sigma = np.where(active, new_cos_sigma, cos_sigma)
+            sigma = np.where(active, new_sigma, sigma)
+            cos_sq_alpha = np.where(active, new_cos_sq_alpha, cos_sq_alpha)
+            cos2_sigma_m = np.where(active, new_cos2_sigma_m, cos2_sigma_m)
+
+            converged = np.abs(new_lambda_lng - lambda_lng) <= 10e-12
+            lambda_lng = np.where(active, new_lambda_lng, lambda_lng)
+            active &= ~converged
+
+    u_sq = cos_sq_alpha * (major ** 2 - minor ** 2) / minor ** 2
+
+    A = 1 + u_sq / 16384. * (
+        4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+
+    B = u_sq / 1024. * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+
+    delta_sigma = (
+        B * sin_sigma * (
+            cos2_sigma_m + B / 4. * (
+                cos_sigma * (-1 + 2 * cos2_sigma_m ** 2) -
+                B / 6. * cos2_sigma_m * (-3 + 4 * sin_sigma ** 2) *
+                (-3 + 4 * cos2_sigma_m ** 2))))
+
+    distance = np.where(coincident, 0., minor * A * (sigma - delta_sigma))
+
+    failed = (iterations > _ITERATIONS) & ~coincident
+    if failed.any():
+        warnings.warn('vincenty formula failed, using great circle formula')
+        distance = np.where(failed, great_circle_distance(
+            lat1, lng1, lat2, lng2), distance)
+
+    return distance
@@ -0,0 +1,470 @@
+import bisect
+import datetime
+import math
+
+from ._columnar import _DAY, ColumnStore, _micros
+from ._matchblock import MatchBlock
+from ._matchindex import _CoordinatesBlocker, _StringBlocker
+from ._prepared import PreparedRow, PreparedRows, _blocks_match
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ['band_join', 'date_join', 'match_join']
+
+# Allowance for rounding errors of the bounds of the windows of values,
+# relative to the values: pairs are checked exactly afterwards.
+_RELATIVE = 1e-9
+
+# Tolerance in days covering all pairs of dates, and the allowance for
+# differences of timezone aware dates sharing a tzinfo, with other UTC
+# offsets, in microseconds.
+_MAX_DAYS = 4 * 10 ** 6
+_MARGIN = 3 * _DAY
+
+
+def _floats(values):
+    """
+    Return positions and values as floats of finite numbers of the values,
+    and positions of integers too large for floats. None and NaN are left
+    out.
+    """
+
+    positions, floats, large = [], [], []
+    for k, value in enumerate(values):
+        if value is None:
+            continue
+
+        try:
+            value = float(value)
+        except OverflowError:
+            large.append(k)
+            continue
+
+        if math.isfinite(value):
+            positions.append(k)
+            floats.append(value)
+
+    return positions, floats, large
+
+
+def _windows(positions1, lower, upper, positions2, keys2):
+    """
+    Return positions1[k] and positions2[l] of all pairs of keys with
+    lower[k] <= keys2[l] <= upper[k], found by sorting keys2, as two numpy
+    arrays, or two lists without numpy.
+    """
+
+    if np is None:
+        order = sorted(zip(keys2, positions2))
+        keys = [x for x, _ in order]
+
+        pairs1, pairs2 = [], []
+        for i, low, high in zip(positions1, lower, upper):
+            start = bisect.bisect_left(keys, low)
+            stop = bisect.bisect_right(keys, high)
+            pairs1.extend([i] * (stop - start))
+            pairs2.extend(j for _, j in order[start:stop])
+        return pairs1, pairs2
+
+    keys2 = np.asarray(keys2)
+    order = np.argsort(keys2, kind='stable')
+    keys, positions2 = keys2[order], np.asarray(positions2)[order]
+
+    start = np.searchsorted(keys, lower, side='left')
+    stop = np.searchsorted(keys, upper, side='right')
+
+    # Pairs of every key of keys1 and its window of keys.
+    counts = stop - start
+    total = int(counts.sum())
+    starts = np.repeat(start - (np.cumsum(counts) - counts), counts)
+
+    return (np.repeat(np.asarray(positions1), counts),
+            positions2[starts + np.arange(total)])
+
+
+def _select(pairs1, pairs2, check):
+    """Return arrays or lists of the pairs of positions passing check."""
+
+    if np is None:
+        pairs = [x for x in zip(pairs1, pairs2) if check(*x)]
+        return [x for x, _ in pairs], [x for _, x in pairs]
+
+    passed = np.fromiter(
+        (check(i, j) for i, j in zip(pairs1.tolist(), pairs2.tolist())),
+        dtype=bool, count=len(pairs1))
+    return pairs1[passed], pairs2[passed]
+
+
+def _differences(values1, values2):
+    """
+    Return array of absolute differences of arrays of numbers. Integers are
+    subtracted as int64 when they can't overflow it, else as Python
+    integers, never in their own dtype, which wraps around.
+    """
+
+    if values1.dtype.kind not in 'biu' or values2.dtype.kind not in 'biu':
+        return np.abs(values1 - values2)
+
+    if not len(values1) or (
+            -2 ** 62 <= min(values1.min(), values2.min()) and
+            max(values1.max(), values2.max()) < 2 ** 62):
+        return np.abs(values1.astype(np.int64) - values2.astype(np.int64))
+
+    return np.abs(values1.astype(object) - values2.astype(object))
+
+
+def _sorted_pairs(pairs1, pairs2, pairs=()):
+    """Return sorted list of the pairs of positions and other pairs."""
+
+    if pairs or np is None:
+        return sorted(set(pairs).union(zip(list(pairs1), list(pairs2))))
+
+    order = np.lexsort((pairs2, pairs1))
+    return list(zip(pairs1[order].tolist(), pairs2[order].tolist()))
+
+
+def band_join(values1, values2, tolerance=0):
+    """
+    Return sorted list of pairs (i, j) of positions of numbers
+    values1[i] and values2[j] within the tolerance, abs(values1[i] -
+    values2[j]) <= tolerance, like MatchBlock.compare_numbers.
+
+    One side is sorted and every number of the other one is looked up in
+    it, so that only numbers closer than the tolerance (up to rounding
+    errors, then checked exactly) are ever compared: the cost is
+    O((n + m) log m + output) instead of n * m comparisons. Missing
+    numbers (None) and NaN are never joined.
+
+    :param values1: numpy array or sequence of numbers
+    :param values2: numpy array or sequence of numbers
+    :param tolerance: number
+    :rtype: list
+
+    :Example:
+
+    >>> band_join([1, 5, 10], [9, 2, None], tolerance=1)
+    [(0, 1), (2, 0)]
+    """
+
+    if tolerance < 0:
+        raise ValueError("tolerance can't be negative")
+
+    arrays = np is not None and isinstance(values1, np.ndarray) and \
+        isinstance(values2, np.ndarray)
+
+    if arrays:
+        def finite(values):
+            floats = values.astype(np.float64)
+            positions = np.flatnonzero(np.isfinite(floats))
+            return positions, floats[positions], []
+    else:
+        finite = _floats
+        values1, values2 = list(values1), list(values2)
+
+    positions1, floats1, large1 = finite(values1)
+    positions2, floats2, large2 = finite(values2)
+
+    # An infinite tolerance can join infinite numbers, and numbers too large
+    # for floats have no windows: these are compared with every number.
+    if math.isinf(tolerance):
+        large1, large2 = range(len(values1)), range(len(values2))
+        positions1 = floats1 = []
+
+    def check(i, j):
+        value1, value2 = values1[i], values2[j]
+        return value1 is not None and value2 is not None and \
+            abs(value1 - value2) <= tolerance
+
+    pairs = set()
+    for i in large1:
+        pairs.update((i, j) for j in range(len(values2)) if check(i, j))
+    for j in large2:
+        pairs.update((i, j) for i in range(len(values1)) if check(i, j))
+
+    if not len(floats1) or not len(floats2):
+        return sorted(pairs)
+
+    if np is None:
+        bounds = [tolerance + _RELATIVE * (abs(x) + tolerance)
+                  for x in floats1]
+        lower = [x - y for x, y in zip(floats1, bounds)]
+        upper = [x + y for x, y in zip(floats1, bounds)]
+    else:
+        floats1 = np.asarray(floats1)
+        bounds = tolerance + _RELATIVE * (np.abs(floats1) + tolerance)
+        lower, upper = floats1 - bounds, floats1 + bounds
+
+    pairs1, pairs2 = _windows(positions1, lower, upper, positions2, floats2)
+
+    if arrays:
+        passed = _differences(values1[pairs1], values2[pairs2]) <= tolerance
+        pairs1, pairs2 = pairs1[passed], pairs2[passed]
+    else:
+        pairs1, pairs2 = _select(pairs1, pairs2, check)
+
+    return _sorted_pairs(pairs1, pairs2, pairs)
+
+
+def _date_groups(values):
+    """
+    Return dict of lists of positions and microseconds (see _micros) of the
+    first dates of the values, grouped by whether the value is a list, its
+    number of dates and whether they are timezone aware.
+    """
+
+    groups = {}
+    for k, value in enumerate(values):
+        if value is None:
+            continue
+
+        if isinstance(value, (list, tuple)):
+            key, dates = (True, len(value)), value
+        else:
+            key, dates = (False, 1), (value,)
+
+        if not all(isinstance(x, datetime.datetime) for x in dates):
+            raise TypeError('dates must be datetime objects or lists of '
+                            'datetime objects')
+
+        micros, offset = _micros(dates[0]) if dates else (0, None)
+        positions, keys = groups.setdefault(key + (offset is not None,),
+                                            ([], []))
+        positions.append(k)
+        keys.append(micros)
+
+    return groups
+
+
+def date_join(values1, values2, tolerance=0):
+    """
+    Return sorted list of pairs (i, j) of positions of dates values1[i] and
+    values2[j] within the tolerance in days, exactly like
+    MatchBlock.compare_dates.
+
+    Values are datetime objects or lists of them, like MatchBlock.date.
+    Values with the same number of dates are joined by their first dates:
+    the dates of one side are sorted and the window of every date of the
+    other one is looked up in them, O((n + m) log m + output). Only pairs
+    of lists of several dates, and of timezone aware dates (whose
+    differences depend on their UTC offsets), are then compared with
+    compare_dates. None is never joined, nor are naive and aware dates,
+    which can't be compared.
+
+    :param values1: sequence of datetime objects or lists of them
+    :param values2: sequence of datetime objects or lists of them
+    :param tolerance: number of days
+    :rtype: list
+
+    :Example:
+
+    >>> dates1 = [datetime.datetime(2015, 5, 1), None]
+    >>> dates2 = [[datetime.datetime(2015, 5, 3)],
+    ...           datetime.datetime(2015, 4, 30, 12)]
+    >>> date_join(dates1, dates2, tolerance=1)
+    [(0, 1)]
+    """
+
+    if tolerance < 0:
+        raise ValueError("tolerance can't be negative")
+
+    values1, values2 = list(values1), list(values2)
+    groups1, groups2 = _date_groups(values1), _date_groups(values2)
+
+    # (date1 - date2).days, rounded down, is within the tolerance for date2
+    # in (date1 - (days + 1) * _DAY, date1 + days * _DAY]. Windows of aware
+    # dates are widened for dates of the same tzinfo with other offsets.
+    days = math.floor(min(tolerance, _MAX_DAYS))
+
+    def check(i, j):
+        return MatchBlock.compare_dates(values1[i], values2[j],
+                                        tolerance=tolerance)
+
+    pairs1, pairs2 = [], []
+    for key, (positions1, keys1) in sorted(groups1.items()):
+        if key not in groups2:
+            continue
+        positions2, keys2 = groups2[key]
+
+        margin = _MARGIN if key[2] else 0
+        if np is not None:
+            keys1 = np.array(keys1, dtype=np.int64)
+        lower = [x - (days + 1) * _DAY + 1 - margin for x in keys1] \
+            if np is None else keys1 - ((days + 1) * _DAY - 1 + margin)
+        upper = [x + days * _DAY + margin for x in keys1] \
+            if np is None else keys1 + (days * _DAY + margin)
+
+        group1, group2 = _windows(positions1, lower, upper, positions2, keys2)
+        if key[1] > 1 or key[2]:
+            group1, group2 = _select(group1, group2, check)
+
+        pairs1.append(group1)
+        pairs2.append(group2)
+
+    if np is None:
+        return sorted(zip([x for group in pairs1 for x in group],
+                          [x for group in pairs2 for x in group]))
+    if not pairs1:
+        return []
+
+    return _sorted_pairs(np.concatenate(pairs1), np.concatenate(pairs2))
+
+
+def _prepare(rows, options):
+    """Return list of PreparedRow objects of the rows."""
+
+    if isinstance(rows, (PreparedRows, ColumnStore)):
+        return list(rows)
+
+    return [x if isinstance(x, PreparedRow) else
+            PreparedRow.from_row(x, **options) for x in rows]
+
+
+def _column_values(prepared, column, attribute):
+    """
+    Return the attribute of the column of every row, None if it is missing
+    or the row is shorter.
+    """
+
+    values = []
+    for element in prepared:
+        value = None
+        if column < len(element.blocks):
+            value = getattr(element.blocks[column], attribute)
+            if value in MatchBlock._null:
+                value = None
+        values.append(value)
+
+    return values
+
+
+def _key_pairs(blocker, values1, values2):
+    """
+    Return sorted pairs of positions of values sharing keys of the blocker
+    (see MatchIndex), values2 keyed and values1 searched for. Without
+    blocker, or without query keys, all pairs of values are returned.
+    """
+
+    postings, present = {}, []
+    for j, value in enumerate(values2):
+        if value is None:
+            continue
+        present.append(j)
+        if blocker is not None:
+            for key in blocker._keys(value):
+                postings.setdefault(key, []).append(j)
+
+    pairs = []
+    for i, value in enumerate(values1):
+        if value is None:
+            continue
+
+        keys = None if blocker is None else blocker._query_keys(value)
+        if keys is None:
+            pairs.extend((i, j) for j in present)
+        else:
+            found = {j for key in keys for j in postings.get(key, ())}
+            pairs.extend((i, j) for j in sorted(found))
+
+    return pairs
+
+
+def _number_pairs(values1, values2, config):
+    return band_join(values1, values2, config.number_tolerance)
+
+
+def _date_pairs(values1, values2, config):
+    return date_join(values1, values2, config.date_tolerance)
+
+
+def _coordinates_pairs(values1, values2, config):
+    blocker = _CoordinatesBlocker(0, config.coordinates_tolerance)
+    return _key_pairs(blocker, values1, values2)
+
+
+def _string_pairs(attribute):
+    def pairs(values1, values2, config):
+        # Other methods can give a ratio of 100 to different strings.
+        blocker = None
+        if config.method == 'uwratio':
+            blocker = _StringBlocker(
+                0, getattr(config, attribute + '_tolerance'), attribute)
+        return _key_pairs(blocker, values1, values2)
+
+    return pairs
+
+
+# Function of the join of every attribute, returning sorted pairs of
+# positions of values which can match.
+_JOINS = {'number': _number_pairs, 'date': _date_pairs,
+          'coordinates': _coordinates_pairs,
+          'string': _string_pairs('string'),
+          'str_number': _string_pairs('str_number'),
+          'str_custom': _string_pairs('str_custom')}
+
+
+def _join_pairs(prepared1, prepared2, column, attribute, config):
+    """
+    Return sorted pairs of positions of lists of PreparedRow objects which
+    can match: those whose attributes of the column can match, and those
+    missing it in both lists.
+    """
+
+    values1 = _column_values(prepared1, column, attribute)
+    values2 = _column_values(prepared2, column, attribute)
+
+    # Rows missing the value only match rows missing it as well.
+    missing1 = [i for i, x in enumerate(values1) if x is None]
+    missing2 = [j for j, x in enumerate(values2) if x is None]
+
+    pairs = _JOINS[attribute](values1, values2, config)
+    pairs += [(i, j) for i in missing1 for j in missing2]
+    pairs.sort()
+
+    return pairs
+
+
+def match_join(rows1, rows2, column, attribute='number', config=None,
+               **kwargs):
+    """
+    Return sorted list of pairs (i, j) of positions of matching rows1[i]
+    and rows2[j], like match_rows.
+
+    Instead of comparing every pair of rows, rows are joined on the
+    attribute of one column: numbers and dates are sorted (see band_join and
+    date_join), coordinates and strings keyed like in MatchIndex. Only rows
+    whose values can match, and rows missing the value in both tables, are
+    compared in full. See MatchPlan to pick the column automatically.
+
+    Keyword arguments are passed to MatchBlock when parsing the rows.
+
+    :param rows1: nested list, nested tuple, PreparedRows or ColumnStore
+    :param rows2: nested list, nested tuple, PreparedRows or ColumnStore
+    :param column: int, position of the column in the rows
+    :param attribute: str, attribute of MatchBlock to join on: 'number',
+        'date', 'coordinates', 'string', 'str_number' or 'str_custom'
+    :param config: MatchConfig, None to use the tolerances set on MatchBlock
+    :rtype: list
+
+    :Example:
+
+    >>> rows1 = [['Flight 1', 100], ['Flight 2', 200]]
+    >>> rows2 = [['Flight 2', 203], ['Flight 1', 101], ['Flight 1', 150]]
+    >>> match_join(rows1, rows2, 1, config=MatchConfig(number_tolerance=5))
+    [(0, 1), (1, 0)]
+    """
+
+    if attribute not in _JOINS:
+        msg = 'wrong attribute, use available: {}'
+        raise ValueError(msg.format(', '.join(sorted(_JOINS))))
+
+    if config is None:
+        config = MatchBlock.config()
+
+    prepared1, prepared2 = _prepare(rows1, kwargs), _prepare(rows2, kwargs)
+    pairs = _join_pairs(prepared1, prepared2, column, attribute, config)
+
+    return [(i, j) for i, j in pairs
+            if _blocks_match(prepared1[i].blocks, prepared2[j].blocks, config)]
@@ -1,17 +1,33 @@
 import datetime
-import json
-import os
 import re
+import time
 import warnings
+from collections import namedtuple
 from functools import wraps
 
 import datefinder
 import roman
-from fuzzywuzzy import fuzz
 from geopy.distance import great_circle
 from geopy.distance import vincenty
 
-__all__ = ['MatchBlock']
+from . import _geo, _similarity
+from ._acronyms import abbreviation_keys, keys_match
+from ._cache import LRUCache
+from ._config import STRING_METHODS, TOLERANCES, MatchConfig
+from ._dates import DATE_FORMATS, fast_dates
+from ._dictionary import Dictionary
+from ._scorers import FuzzScorer
+from ._stats import MatchStats
+
+__all__ = ['MatchBlock', 'Score']
+
+Score = namedtuple('Score', ['total', 'number', 'date', 'coordinates',
+                             'string', 'str_number', 'str_custom'])
+Score.__doc__ = """
+Similarity of two MatchBlock objects, returned by MatchBlock.score: the
+similarity of every attribute (None if missing in both objects) and their
+mean, total, all from 0 to 100.
+"""
 
 
 def tolerance_interval(lower=0, upper=None):
@@ -66,8 +82,14 @@ class MatchBlock:
     Core class that contains all methods for data extraction, processing,
     and comparison.
 
+    Objects use __slots__ and store dates in a tuple, absent attributes
+    referring to shared empty values, so that large numbers of them can be
+    kept in memory.
     """
 
+    __slots__ = ('_number', '_date', '_coordinates', '_string', '_str_number',
+                 '_str_custom', '_pending')
+
     number_tolerance = Tolerance('number_tolerance')
     date_tolerance = Tolerance('date_tolerance')
     coordinates_tolerance = Tolerance('coordinates_tolerance')
@@ -75,7 +97,40 @@ class MatchBlock:
     str_number_tolerance = Tolerance('str_number_tolerance')
     str_custom_tolerance = Tolerance('str_custom_tolerance')
 
-    _null = (None, '', [], float('nan'))
+    _null = (None, '', [], (), float('nan'))
+
+    # Comparison function and tolerance of every attribute of attributes.
+    _comparisons = (('compare_numbers', 'number_tolerance'),
+                    ('compare_dates', 'date_tolerance'),
+                    ('compare_coordinates', 'coordinates_tolerance'),
+                    ('compare_strings', 'string_tolerance'),
+                    ('compare_strings', 'str_number_tolerance'),
+                    ('compare_strings', 'str_custom_tolerance'))
+
+    # Names of comparisons of every attribute in stats.
+    _comparison_names = ('compare_numbers', 'compare_dates',
+                         'compare_coordinates', 'compare_strings[string]',
+                         'compare_strings[str_number]',
+                         'compare_strings[str_custom]')
+
+    # Records extraction stages and comparisons, see MatchStats.
+    stats = MatchStats()
+
+    # String similarity backend of compare_strings and score, see get_scorer.
+    scorer = FuzzScorer()
+
+    # Relative cost of comparing every attribute of attributes: numbers and
+    # dates are cheap, strings need the scorer (the main string being the
+    # longest one), coordinates a geodesic.
+    comparison_costs = (1, 1, 50, 20, 5, 5)
+
+    # Reorder comparisons by observed rejection rates, see comparison_order.
+    adaptive_order = False
+    _adaptive_interval = 1000
+    _comparison_stats = [[0, 0] for _ in range(6)]
+    _comparison_count = 0
+    # Costs the order was computed for and the order.
+    _comparison_order = (None, None)
 
     _re_non_alphanum_all = re.compile("([^a-zA-Z0-9']+)")
     _re_non_alphanum = re.compile("[^a-zA-Z0-9']+")
@@ -85,25 +140,43 @@ class MatchBlock:
     _re_coordinates = re.compile("(-?(90|[0-8]?[0-9]\.[0-9]{0,8})\s*,\s*-?"
                                  "(180|(1[0-7][0-9]|[0-9]{0,2})\.[0-9]{0,8}))")
 
-    _dictionary = {}
-    _dictionary_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                    'dictionary.json')
+    dates_cache = LRUCache(maxsize=65536)
+    date_formats = tuple(DATE_FORMATS)
+
+    # Extraction stage providing every attribute of attributes, and the
+    # order of comparisons of objects with stages that haven't run yet.
+    _attribute_stages = (0, 2, 1, 4, 3, 4)
+    _last_stage = 4
+    _lazy_order = (0, 2, 1, 4, 5, 3)
 
     def __init__(self, entry, *, try_date=True, try_coordinates=True,
-                 try_str_number=True, try_str_custom=True, convert_roman=True):
+                 try_str_number=True, try_str_custom=True, convert_roman=True,
+                 dictionary=None, lazy=False):
         """
         Initialize new object, try to extract known data types from supplied
         entry.
 
+        Extraction runs in stages, each of them working on what remains of
+        the string after the previous ones: coordinates, dates, numbers
+        (after converting roman numerals) and custom values, the rest being
+        the string. In lazy mode, stages run only when an attribute is first
+        needed, up to the stage providing it. == then compares attributes in
+        the order of the stages, so that e.g. objects with different numbers
+        or coordinates never extract dates.
+
         :param entry: str, int, float
+        :param dictionary: Dictionary or str, path of a dictionary file, used
+            to extract the custom part of the string
+        :param lazy: bool
         """
 
         self._number = None
-        self._date = []
+        self._date = ()
         self._coordinates = None
         self._string = ''
         self._str_number = ''
         self._str_custom = ''
+        self._pending = None
 
         if isinstance(entry, (int, float)):
             self._number = entry
@@ -114,65 +187,144 @@ class MatchBlock:
                 try:
                     self._number = float(entry)
                 except ValueError:
-                    if entry and try_coordinates:
-                        entry, self._coordinates = self.extract_coordinates(
-                            entry)
+                    options = (try_coordinates, try_date, convert_roman,
+                               try_str_number, try_str_custom, dictionary)
+                    self._pending = (entry, 0, options)
+
+                    if not lazy:
+                        self._extract(self._last_stage)
+        else:
+            raise TypeError('unsupported type(s)')
 
-                    if entry and try_date:
-                        entry, self._date = self.extract_dates(entry)
+    def _extract(self, stage):
+        """Run extraction stages which haven't run yet, up to stage."""
 
-                    if entry and convert_roman:
-                        entry = self.roman_to_integers(entry)
+        entry, done, options = self._pending
+        (try_coordinates, try_date, convert_roman, try_str_number,
+         try_str_custom, dictionary) = options
 
-                    if entry and try_str_number:
-                        entry, self._str_number = self.extract_str_number(entry)
+        stats = self.stats if self.stats.enabled else None
+        stage_run = self._run_stage
 
-                        if self._str_number:
-                            self._str_number = self.strip_zeros(
-                                self._str_number)
+        while done < stage:
+            done += 1
 
-                    if entry and try_str_custom:
-                        entry, self._str_custom = self.extract_str_custom(entry)
+            if not entry:
+                continue
 
-                    self._string = entry
+            if done == 1 and try_coordinates:
+                entry, self._coordinates = stage_run(
+                    stats, 'extract_coordinates', self.extract_coordinates,
+                    entry)
+
+            elif done == 2 and try_date:
+                if stats is None:
+                    entry, self._date = self._extract_dates(entry)
+                else:
+                    start = time.perf_counter()
+                    (entry, self._date), hit = self._lookup_dates(entry)
+                    stats.record('extract_dates', time.perf_counter() - start,
+                                 hit=hit)
+
+            elif done == 3:
+                if convert_roman:
+                    entry = stage_run(stats, 'roman_to_integers',
+                                      self.roman_to_integers, entry)
+
+                if entry and try_str_number:
+                    entry, self._str_number = stage_run(
+                        stats, 'extract_str_number', self._extract_str_number,
+                        entry)
+
+            elif done == 4 and try_str_custom:
+                entry, self._str_custom = stage_run(
+                    stats, 'extract_str_custom', self.extract_str_custom,
+                    entry, dictionary)
+
+        if done == self._last_stage:
+            self._string = entry
+            self._pending = None
         else:
-            raise TypeError('unsupported type(s)')
+            self._pending = (entry, done, options)
+
+    @staticmethod
+    def _run_stage(stats, name, func, *args):
+        """Call func, recording the call in stats unless it is None."""
+
+        if stats is None:
+            return func(*args)
+
+        start = time.perf_counter()
+        result = func(*args)
+        stats.record(name, time.perf_counter() - start)
+        return result
+
+    @classmethod
+    def _extract_str_number(cls, string):
+        """Extraction stage of str_number, with zeros stripped."""
+
+        string, str_number = cls.extract_str_number(string)
+
+        if str_number:
+            str_number = cls.strip_zeros(str_number)
+
+        return string, str_number
+
+    def _attribute(self, index):
+        """Return attribute at the index of attributes, extracting it."""
+
+        pending = self._pending
+        if pending is not None and \
+                pending[1] < self._attribute_stages[index]:
+            self._extract(self._attribute_stages[index])
+
+        return getattr(self, self.__slots__[index])
 
     @property
     def attributes(self):
+        attributes = self._attributes
+        return attributes[:1] + (list(attributes[1]),) + attributes[2:]
+
+    @property
+    def _attributes(self):
+        """Attributes as stored, with dates in a tuple."""
+
+        if self._pending is not None:
+            self._extract(self._last_stage)
+
         return (self._number, self._date, self._coordinates,
                 self._string, self._str_number, self._str_custom)
 
     @property
     def number(self):
-        return self._number
+        return self._attribute(0)
 
     @property
     def date(self):
-        return self._date
+        return list(self._attribute(1))
 
     @property
     def coordinates(self):
-        return self._coordinates
+        return self._attribute(2)
 
     @property
     def string(self):
-        return self._string
+        return self._attribute(3)
 
     @property
     def str_number(self):
-        return self._str_number
+        return self._attribute(4)
 
     @property
     def str_custom(self):
-        return self._str_custom
+        return self._attribute(5)
 
     def __repr__(self):
         names = ('number', 'date', 'coordinates', 'string',
                  'string (number part)', 'string (custom part)')
 
         values = []
-        for i, (name, attr) in enumerate(zip(names, self.attributes)):
+        for i, (name, attr) in enumerate(zip(names, self._attributes)):
             if attr not in self._null:
                 values.append(
                     name + ': ' + (str(attr) if i != 1
@@ -183,7 +335,7 @@ class MatchBlock:
 
     def __str__(self):
         values = []
-        for i, attr in enumerate(self.attributes):
+        for i, attr in enumerate(self._attributes):
             if attr not in self._null:
                 values.append(str(attr) if i != 1
                               else ' '.join(str(x.date()) for x in attr))
@@ -191,50 +343,265 @@ class MatchBlock:
         return ' '.join(values)
 
     def __eq__(self, other):
+        return self.matches(other)
+
+    def matches(self, other, config=None):
+        """
+        Check if the objects match, like ==, with the tolerances and string
+        method of config instead of those set on MatchBlock.
+
+        :param other: MatchBlock
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :rtype: bool
+
+        :Example:
+
+        >>> config = MatchConfig(number_tolerance=5)
+        >>> MatchBlock(100).matches(MatchBlock(104), config)
+        True
+        """
+
         if not isinstance(other, type(self)):
             raise TypeError('unsupported operand type(s)')
 
-        if self.__len__() != len(other):
-            return False
+        if self._pending is not None or other._pending is not None:
+            return self._lazy_eq(other, config)
 
-        funcs = (self.compare_numbers,
-                 self.compare_dates,
-                 self.compare_coordinates,
-                 self.compare_strings,
-                 self.compare_strings,
-                 self.compare_strings)
+        self_attrs, other_attrs = self._attributes, other._attributes
 
-        tols = ('number_tolerance',
-                'date_tolerance',
-                'coordinates_tolerance',
-                'string_tolerance',
-                'str_number_tolerance',
-                'str_custom_tolerance')
+        # Attributes missing in only one of the objects are checked first,
+        # then the others are compared in the cheapest first order.
+        order = self.comparison_order()
+        pending = []
+        for i in order:
+            self_null = self_attrs[i] in self._null
+            if self_null != (other_attrs[i] in self._null):
+                return False
+            if not self_null:
+                pending.append(i)
 
-        for func, self_attr, other_attr, tol in zip(
-                funcs, self.attributes, other.attributes, tols):
+        for i in pending:
+            if not self._compare(i, self_attrs[i], other_attrs[i], config):
+                return False
 
-            if self_attr in self._null and other_attr in self._null:
-                continue
-            elif self_attr in self._null or other_attr in self._null:
+        return True
+
+    def _lazy_eq(self, other, config):
+        """
+        Low-level function for matches, comparing attributes in the order of
+        extraction stages and extracting them only when needed.
+        """
+
+        for i in self._lazy_order:
+            self_attr, other_attr = self._attribute(i), other._attribute(i)
+
+            self_null = self_attr in self._null
+            if self_null != (other_attr in self._null):
                 return False
+            if self_null:
+                continue
 
-            if not func(
-                    self_attr, other_attr, **{'tolerance': getattr(self, tol)}):
+            if not self._compare(i, self_attr, other_attr, config):
                 return False
+
+        return True
+
+    def _compare(self, index, attr1, attr2, config):
+        """
+        Compare attributes at the index of attributes, found in both objects,
+        recording the comparison for the adaptive order and in stats.
+        """
+
+        func, tol = self._comparisons[index]
+        kwargs = {}
+
+        if config is None:
+            kwargs['tolerance'] = getattr(self, tol)
+        else:
+            kwargs['tolerance'] = config[index]
+            if index >= 3:
+                kwargs['method'] = config.method
+
+        func = getattr(self, func)
+
+        stats = self.stats
+        if stats.enabled:
+            start = time.perf_counter()
+            result = func(attr1, attr2, **kwargs)
+            stats.record(self._comparison_names[index],
+                         time.perf_counter() - start, rejected=not result)
         else:
-            return True
+            result = func(attr1, attr2, **kwargs)
+
+        if self.adaptive_order:
+            type(self)._record_comparison(index, result)
+
+        return result
 
     def __ne__(self, other):
         return not self == other
 
+    @classmethod
+    def config(cls):
+        """
+        Return MatchConfig of the tolerances set on MatchBlock.
+
+        :rtype: MatchConfig
+        """
+
+        return MatchConfig(**{name: getattr(cls, name) for name in TOLERANCES})
+
+    @classmethod
+    def comparison_order(cls):
+        """
+        Return positions (in attributes) of the attributes in the order they
+        are compared by ==, which doesn't change its result.
+
+        The cheapest comparisons (see comparison_costs) are run first. If
+        adaptive_order is True, the order is updated every 1000 comparisons
+        to run first those with the lowest cost per observed rejection.
+
+        :rtype: tuple
+
+        :Example:
+
+        >>> MatchBlock.comparison_order()
+        (0, 1, 4, 5, 3, 2)
+        """
+
+        costs, order = cls._comparison_order
+        if costs != cls.comparison_costs:
+            costs = cls.comparison_costs
+            order = tuple(sorted(range(len(costs)), key=lambda i: costs[i]))
+            cls._comparison_order = (costs, order)
+
+        return order
+
+    @classmethod
+    def _record_comparison(cls, index, result):
+        """Count comparisons and rejections for the adaptive order."""
+
+        stats = cls._comparison_stats
+        stats[index][0] += 1
+        if not result:
+            stats[index][1] += 1
+
+        cls._comparison_count += 1
+        if cls._comparison_count % cls._adaptive_interval:
+            return
+
+        costs = cls.comparison_costs
+
+        # Expected cost of finding a rejection, with add-one smoothing of
+        # the rejection rate.
+        def cost(i):
+            compared, rejected = stats[i]
+            return costs[i] * (compared + 2) / (rejected + 1)
+
+        cls._comparison_order = (
+            costs, tuple(sorted(range(len(costs)), key=cost)))
+
+    @classmethod
+    def reset_comparison_order(cls):
+        """Forget observed rejection rates and go back to the static order."""
+
+        cls._comparison_stats = [[0, 0] for _ in range(6)]
+        cls._comparison_count = 0
+        cls._comparison_order = (None, None)
+
     def __len__(self):
-        return sum(1 for attr in self.attributes if attr not in self._null)
+        return sum(1 for attr in self._attributes if attr not in self._null)
+
+    def score(self, other):
+        """
+        Return similarity of the objects, from 0 to 100, for every attribute
+        and in total (the mean of attributes found in either object).
+
+        Unlike ==, tolerances are not used. Strings are scored with uwratio
+        of MatchBlock.scorer (100 for an abbreviation, like in compare_strings),
+        numbers, dates and coordinates with 100 / (1 + d), where d is the
+        difference of numbers, the difference in days (the largest one for
+        lists of dates) or the distance in kilometers. An attribute found in
+        only one of the objects scores 0.
+
+        :param other: MatchBlock
+        :rtype: Score
+
+        :Example:
+
+        >>> MatchBlock('Flight 1').score(MatchBlock('Flight 01')).total
+        100.0
+
+        >>> score = MatchBlock('London 1').score(MatchBlock('Paris 1'))
+        >>> score.string, score.str_number, score.total
+        (0, 100, 50.0)
+        """
+
+        if not isinstance(other, type(self)):
+            raise TypeError('unsupported operand type(s)')
+
+        scores = []
+        for i, (self_attr, other_attr) in enumerate(
+                zip(self._attributes, other._attributes)):
+            if self_attr in self._null and other_attr in self._null:
+                scores.append(None)
+            elif self_attr in self._null or other_attr in self._null:
+                scores.append(0)
+            else:
+                scores.append(self._score_attribute(i, self_attr, other_attr))
+
+        found = [x for x in scores if x is not None]
+        total = sum(found) / len(found) if found else 100.0
+
+        return Score(total, *scores)
 
     @classmethod
-    def _read_dictionary(cls, file):
-        with open(file, 'r') as f:
-            return {k: set(v) for k, v in json.loads(f.read()).items()}
+    def _score_attribute(cls, index, attr1, attr2):
+        """
+        Return similarity of attributes found in both objects, index being
+        the position of the attribute in MatchBlock.attributes.
+        """
+
+        if index == 0:
+            return 100 / (1 + abs(attr1 - attr2))
+
+        if index == 1:
+            if len(attr1) != len(attr2):
+                return 0
+            return 100 / (1 + max(abs((x - y).days)
+                                  for x, y in zip(attr1, attr2)))
+
+        if index == 2:
+            return 100 / (1 + cls._coordinates_distance(attr1, attr2))
+
+        if not any(char.isdigit() for char in attr1 + attr2):
+            if cls.is_abbreviation(attr1, attr2):
+                return 100
+
+        return cls.scorer.uwratio(attr1, attr2)
+
+    @classmethod
+    def _load_dictionary(cls, dictionary=None):
+        """
+        Return the Dictionary object for a dictionary or path of a dictionary
+        file, the one provided with the package by default.
+        """
+
+        if isinstance(dictionary, Dictionary):
+            return dictionary
+
+        if dictionary is None:
+            return Dictionary.default()
+
+        return Dictionary._recent(dictionary)
+
+    @classmethod
+    def _dict_sub(cls, string, reverse):
+        """Low-level function for dict_sub, using the reverse map."""
+
+        words = cls.split_on_nonalpha(string, return_all=True)
+        return ''.join([reverse.get(word.lower(), word) for word in words])
 
     @classmethod
     def from_roman(cls, string):
@@ -357,6 +724,9 @@ class MatchBlock:
         """
         Check whether one string is an abbreviation of the other.
 
+        Keys of the strings are computed once and cached, see AcronymIndex
+        to look up abbreviations among many strings.
+
         :param string1: str
         :param string2: str
         :rtype: bool
@@ -367,18 +737,8 @@ class MatchBlock:
         True
         """
 
-        skip = ('a', 'an', 'and', 'of', 'the')
-
-        string1 = string1.strip().lower()
-        string2 = string2.strip().lower()
-
-        abbr, name = sorted((string1, string2), key=lambda x: len(x))
-
-        if len(name.split()) < 2:
-            return False
-
-        abbr_try = ''.join(x[0] for x in name.split() if x not in skip)
-        return abbr == abbr_try
+        return keys_match(abbreviation_keys(string1),
+                          abbreviation_keys(string2))
 
     @classmethod
     def dict_sub(cls, string, dictionary_file=None):
@@ -387,13 +747,15 @@ class MatchBlock:
 
         Replace part of the string, separated by non-alphanumeric
         characters, with a key found in a dictionary, if the string part is
-        contained within values of the dictionary's key.
+        contained within values of the dictionary's key. Each part is looked
+        up in a map of values to keys, built once per dictionary.
 
-        The dictionary must be stored in the JSON format.
+        The dictionary is a Dictionary object or path of a file storing it in
+        the JSON format (see Dictionary.load).
         Use the file provided with the package by default.
 
         :param string: str
-        :param dictionary_file: str
+        :param dictionary_file: str, Dictionary
         :rtype: str
 
         :Example:
@@ -402,23 +764,9 @@ class MatchBlock:
         'south Africa'
         """
 
-        if dictionary_file is None:
-            if not cls._dictionary:
-                cls._dictionary = cls._read_dictionary(cls._dictionary_file)
-
-            dictionary = cls._dictionary
-        else:
-            dictionary = cls._read_dictionary(dictionary_file)
+        dictionary = cls._load_dictionary(dictionary_file)
 
-        words = cls.split_on_nonalpha(string, return_all=True)
-
-        for i, word in enumerate(words):
-            for substitute, replacements in dictionary.items():
-                if word.lower() in replacements:
-                    words[i] = substitute
-                    break
-
-        return ''.join(words)
+        return cls._dict_sub(string, dictionary.reverse)
 
     @classmethod
     def extract_dates(cls, string):
@@ -427,6 +775,17 @@ class MatchBlock:
 
         Use datefinder (https://pypi.python.org/pypi/datefinder).
 
+        Strings consisting of a single date in one of the common formats
+        listed in MatchBlock.date_formats ('iso', 'ymd_slash',
+        'numeric_slash', 'day_month_year', 'month_day_year') are recognized
+        with regular expressions, without calling datefinder. The dates are
+        the same as the ones datefinder finds.
+
+        Other results are memoized in MatchBlock.dates_cache, an LRUCache
+        keyed on the input string. Set its maxsize to bound the memory it
+        uses, its enabled attribute to False to disable it, and call clear()
+        to empty it. Every call returns a new list of dates.
+
         :param string: str
         :rtype: tuple
 
@@ -436,6 +795,44 @@ class MatchBlock:
         ('Istanbul', [datetime.datetime(2005, 5, 25, 0, 0)])
         """
 
+        string, dates = cls._extract_dates(string)
+
+        return string, list(dates)
+
+    @classmethod
+    def _extract_dates(cls, string):
+        """
+        Low-level function for extract_dates, return remains of the string and
+        a tuple of dates. The result may come from the cache and is shared.
+        """
+
+        return cls._lookup_dates(string)[0]
+
+    @classmethod
+    def _lookup_dates(cls, string):
+        """
+        Return the result of _extract_dates and whether it was found without
+        datefinder, by the fast path or in the cache.
+        """
+
+        cached = fast_dates(string, cls.date_formats) or \
+            cls.dates_cache.get(string)
+
+        if cached is not None:
+            return cached, True
+
+        cached = cls._find_dates(string)
+        cls.dates_cache.put(string, cached)
+
+        return cached, False
+
+    @classmethod
+    def _find_dates(cls, string):
+        """
+        Low-level function for extract_dates, return remains of the string and
+        a tuple of dates found by datefinder.
+        """
+
         dates_with_strings = list(
             datefinder.find_dates(string, source=True, strict=True))
 
@@ -448,7 +845,7 @@ class MatchBlock:
         for string_element in strings:
             string = string.replace(string_element, '')
 
-        return string.strip(), dates
+        return string.strip(), tuple(dates)
 
     @classmethod
     def extract_coordinates(cls, string):
@@ -531,7 +928,7 @@ class MatchBlock:
         Return string and its separated custom parts.
 
         :param string: str
-        :param dictionary_file: str
+        :param dictionary_file: str, Dictionary
         :rtype: tuple
 
         :Example:
@@ -543,15 +940,9 @@ class MatchBlock:
         ('France', 'south west')
         """
 
-        if dictionary_file is None:
-            if not cls._dictionary:
-                cls._dictionary = cls._read_dictionary(cls._dictionary_file)
-
-            dictionary = cls._dictionary
-        else:
-            dictionary = cls._read_dictionary(dictionary_file)
+        dictionary = cls._load_dictionary(dictionary_file)
 
-        string_sub = cls.dict_sub(string, dictionary_file=dictionary_file)
+        string_sub = cls._dict_sub(string, dictionary.reverse)
 
         words = cls.split_on_nonalpha(string_sub, return_all=False)
         custom = []
@@ -604,8 +995,10 @@ class MatchBlock:
         and the corresponding element of list2 is within the specified
         tolerance.
 
-        :param date1: datetime.datetime object or a list of such objects
-        :param date2: datetime.datetime object or a list of such objects
+        :param date1: datetime.datetime object or a list or tuple of such
+            objects
+        :param date2: datetime.datetime object or a list or tuple of such
+            objects
         :param tolerance: number
         :param pattern: str
         :rtype: bool
@@ -626,7 +1019,8 @@ class MatchBlock:
         if tolerance is None:
             tolerance = cls.date_tolerance
 
-        if isinstance(date1, list) and isinstance(date2, list):
+        if isinstance(date1, (list, tuple)) and \
+                isinstance(date2, (list, tuple)):
             if len(date1) != len(date2):
                 return False
 
@@ -676,6 +1070,16 @@ class MatchBlock:
         if tolerance is None:
             tolerance = cls.coordinates_tolerance
 
+        length = cls._coordinates_distance(coords1, coords2, *args,
+                                           unit=unit, **kwargs)
+
+        return length <= tolerance
+
+    @classmethod
+    def _coordinates_distance(cls, coords1, coords2, *args, unit='km',
+                              **kwargs):
+        """Low-level function for compare_coordinates, return the distance."""
+
         units = {'kilometers', 'km', 'meters', 'm', 'miles', 'mi',
                  'feet', 'ft', 'nautical', 'nm'}
 
@@ -684,16 +1088,97 @@ class MatchBlock:
             raise ValueError('unsupported unit')
 
         try:
-            length = getattr(vincenty(coords1, coords2, *args, **kwargs), unit)
+            return getattr(vincenty(coords1, coords2, *args, **kwargs), unit)
         except ValueError as e:
             if 'Vincenty formula failed to converge!' in e.args:
                 warnings.warn(
                     'vincenty formula failed, using great circle formula')
-                length = getattr(great_circle(coords1, coords2, *args), unit)
+                return getattr(great_circle(coords1, coords2, *args), unit)
             else:
                 raise
 
-        return length <= tolerance
+    @classmethod
+    @tolerance_interval
+    def compare_coordinates_many(cls, coords1, coords2, *, tolerance=None,
+                                 unit='km'):
+        """
+        Vectorized version of compare_coordinates: check if the distance
+        between coords1[i] and coords2[i] is within the specified tolerance
+        for every i. A single pair of coordinates is compared with every pair
+        of the other argument.
+
+        Return numpy array of booleans.
+
+        Use numpy (https://pypi.python.org/pypi/numpy) to evaluate Vincenty
+        formula on the WGS-84 ellipsoid, and Great Circle formula where it
+        fails to converge, like compare_coordinates. The distances differ from
+        those computed by compare_coordinates by less than 1e-6 km (1 mm),
+        so results can only differ for pairs within 1 mm of the tolerance.
+
+        :param coords1: pair of coordinates or a sequence of such pairs
+        :param coords2: pair of coordinates or a sequence of such pairs
+        :param tolerance: number
+        :param unit: str, one of: 'kilometers', 'km', 'meters',
+                                  'm', 'miles', 'mi', 'feet',
+                                  'ft', 'nautical', 'nm'
+        :rtype: numpy.ndarray
+
+        :Example:
+
+        >>> a = [(36.1332600, -5.4505100), (51.50853, -0.12574)]
+        >>> b = [(35.8893300, -5.3197900), (35.8893300, -5.3197900)]
+        >>> MatchBlock.compare_coordinates_many(a, b, tolerance=20, unit='mi')
+        array([ True, False])
+        """
+
+        if tolerance is None:
+            tolerance = cls.coordinates_tolerance
+
+        factor = _geo.unit_factor(unit)
+        lat1, lng1 = _geo.as_coordinates(coords1)
+        lat2, lng2 = _geo.as_coordinates(coords2)
+
+        return _geo.vincenty_distance(lat1, lng1, lat2, lng2) * factor <= \
+            tolerance
+
+    @classmethod
+    @tolerance_interval
+    def compare_coordinates_cross(cls, coords1, coords2, *, tolerance=None,
+                                  unit='km'):
+        """
+        Cross-product version of compare_coordinates_many: check if the
+        distance between coords1[i] and coords2[j] is within the specified
+        tolerance for every i and j.
+
+        Return numpy array of booleans of shape (len(coords1), len(coords2)).
+
+        :param coords1: sequence of pairs of coordinates
+        :param coords2: sequence of pairs of coordinates
+        :param tolerance: number
+        :param unit: str, one of: 'kilometers', 'km', 'meters',
+                                  'm', 'miles', 'mi', 'feet',
+                                  'ft', 'nautical', 'nm'
+        :rtype: numpy.ndarray
+
+        :Example:
+
+        >>> a = [(36.1332600, -5.4505100), (51.50853, -0.12574)]
+        >>> b = [(35.8893300, -5.3197900)]
+        >>> MatchBlock.compare_coordinates_cross(a, b, tolerance=20, unit='mi')
+        array([[ True],
+               [False]])
+        """
+
+        if tolerance is None:
+            tolerance = cls.coordinates_tolerance
+
+        factor = _geo.unit_factor(unit)
+        lat1, lng1 = _geo.as_coordinates(coords1)
+        lat2, lng2 = _geo.as_coordinates(coords2)
+
+        return _geo.vincenty_distance(
+            lat1[:, None], lng1[:, None], lat2[None, :], lng2[None, :]) * \
+            factor <= tolerance
 
     @classmethod
     @tolerance_interval(0, 100)
@@ -705,7 +1190,8 @@ class MatchBlock:
 
         Return True if yes, otherwise return False.
 
-        Use fuzzywuzzy (https://pypi.python.org/pypi/fuzzywuzzy).
+        Use MatchBlock.scorer, a string similarity backend following
+        fuzzywuzzy (https://pypi.python.org/pypi/fuzzywuzzy).
 
         :param string1: str
         :param string2: str
@@ -737,14 +1223,55 @@ class MatchBlock:
             if cls.is_abbreviation(string1, string2):
                 return True
 
-        methods = {'uwratio': fuzz.UWRatio,
-                   'partial_ratio': fuzz.partial_ratio,
-                   'token_sort_ratio': fuzz.token_sort_ratio,
-                   'token_set_ratio': fuzz.token_set_ratio,
-                   'ratio': fuzz.ratio}
+        if method not in STRING_METHODS:
+            msg = 'wrong method, use available: {}'
+            raise ValueError(msg.format(', '.join(sorted(STRING_METHODS))))
+
+        return getattr(cls.scorer, method)(string1, string2) >= 100 - tolerance
+
+    @classmethod
+    @tolerance_interval(0, 100)
+    def compare_strings_matrix(cls, strings1, strings2, *, tolerance=None,
+                               method='uwratio'):
+        """
+        Cross-product version of compare_strings: check if strings1[i] and
+        strings2[j] have a similarity ratio within the specified tolerance
+        for every i and j.
+
+        Return sorted list of pairs (i, j) of the matching strings.
+
+        Repeated strings are compared once. Pairs whose ratio can't reach
+        100 - tolerance, judging by the lengths and characters of the
+        strings, are skipped without computing the ratio (with numpy, for
+        many pairs at a time). The result is the same as that of
+        compare_strings for every pair, as long as MatchBlock.scorer gives
+        scores no higher than those of the exact Scorer, like the default
+        FuzzScorer.
+
+        :param strings1: sequence of str
+        :param strings2: sequence of str
+        :param tolerance: number
+        :param method: str, one of: 'uwratio', 'partial_ratio',
+                                    'token_sort_ratio', 'token_set_ratio',
+                                    'ratio'
+        :rtype: list
+
+        :Example:
+
+        >>> MatchBlock.compare_strings_matrix(
+        ...     ['The Beatles', 'Queen'], ['Beatles', 'Queens', 'Beatles'],
+        ...     tolerance=10)
+        [(0, 0), (0, 2), (1, 1)]
+        """
 
-        if method not in methods:
+        if method not in STRING_METHODS:
             msg = 'wrong method, use available: {}'
-            raise ValueError(msg.format(', '.join(sorted(methods))))
+            raise ValueError(msg.format(', '.join(sorted(STRING_METHODS))))
+
+        if tolerance is None:
+            tolerances = (cls.string_tolerance, cls.str_number_tolerance)
+        else:
+            tolerances = (tolerance, tolerance)
 
-        return methods[method](string1, string2) >= 100 - tolerance
+        return _similarity.similar_pairs(strings1, strings2, method,
+                                         tolerances, cls.scorer)
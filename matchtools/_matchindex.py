@@ -0,0 +1,358 @@
+import math
+
+from fuzzywuzzy.utils import full_process
+
+from ._acronyms import abbreviation_keys
+from ._cache import LRUCache
+from ._columnar import ColumnStore
+from ._matchblock import MatchBlock
+from ._prepared import PreparedRows, _blocks_match
+from ._spatial import grid_cell, grid_cells
+
+__all__ = ['MatchIndex']
+
+
+def _bucket_range(value, radius, width, pad=0):
+    """
+    Return bucket numbers of width `width` covering [value - radius,
+    value + radius], padded by `pad` buckets on both sides.
+    """
+
+    lower = math.floor((value - radius) / width) - pad
+    upper = math.floor((value + radius) / width) + pad
+    return range(lower, upper + 1)
+
+
+class _SignatureBlocker:
+    """Key rows by their length and the null pattern of every column."""
+
+    @staticmethod
+    def _signature(blocks):
+        return tuple(
+            tuple(attr in MatchBlock._null for attr in block._attributes)
+            for block in blocks)
+
+    def keys(self, blocks):
+        return [self._signature(blocks)]
+
+    def query_keys(self, blocks):
+        return {self._signature(blocks)}
+
+
+class _ColumnBlocker:
+    """Base class of blockers that key rows by one attribute of one column."""
+
+    attribute = None
+
+    def __init__(self, column, tolerance):
+        self.column = column
+        self.tolerance = tolerance
+
+    def _value(self, blocks):
+        if len(blocks) <= self.column:
+            return None
+
+        value = getattr(blocks[self.column], self.attribute)
+        return None if value in MatchBlock._null else value
+
+    def keys(self, blocks):
+        value = self._value(blocks)
+        return [] if value is None else self._keys(value)
+
+    def query_keys(self, blocks):
+        value = self._value(blocks)
+        return None if value is None else self._query_keys(value)
+
+    def _keys(self, value):
+        raise NotImplementedError
+
+    def _query_keys(self, value):
+        raise NotImplementedError
+
+
+class _NumberBlocker(_ColumnBlocker):
+    """
+    Key numbers by buckets as wide as number_tolerance. Neighbouring buckets
+    are searched as well to absorb float rounding.
+
+    Numbers whose bucket number isn't finite (infinite numbers and numbers
+    too large for the tolerance) share the _large key, searched by every
+    query. Queries whose buckets can't be computed are compared with all
+    rows.
+    """
+
+    attribute = 'number'
+
+    _large = ('large',)
+
+    def _keys(self, value):
+        if not self.tolerance:
+            return [value]
+        # NaN never matches.
+        if value != value:
+            return []
+
+        try:
+            bucket = value / self.tolerance
+        except OverflowError:
+            return [self._large]
+        return [math.floor(bucket) if math.isfinite(bucket) else self._large]
+
+    def _query_keys(self, value):
+        if not self.tolerance:
+            return {value}
+        if value != value:
+            return set()
+
+        try:
+            buckets = _bucket_range(value, self.tolerance, self.tolerance,
+                                    pad=1)
+        except (OverflowError, ValueError):
+            return None
+        return set(buckets) | {self._large}
+
+
+class _DateBlocker(_ColumnBlocker):
+    """
+    Key lists of dates by their length and a bucket of the first date's
+    ordinal.
+
+    Time of day and UTC offsets can make the difference in days reported by
+    compare_dates differ from the difference of ordinals by up to _margin
+    days, which is added to the search radius.
+    """
+
+    attribute = 'date'
+
+    _margin = 3
+
+    def _radius(self):
+        return self.tolerance + self._margin
+
+    def _keys(self, value):
+        return [(len(value),
+                 math.floor(value[0].toordinal() / self._radius()))]
+
+    def _query_keys(self, value):
+        return {(len(value), bucket) for bucket in _bucket_range(
+            value[0].toordinal(), self._radius(), self._radius())}
+
+
+class _CoordinatesBlocker(_ColumnBlocker):
+    """
+    Key coordinates by cells of a grid on the unit sphere as wide as
+    coordinates_tolerance (in kilometers, like in MatchBlock.__eq__).
+    """
+
+    attribute = 'coordinates'
+
+    _min_cell_size = 0.001
+
+    def _cell_size(self):
+        return max(self.tolerance, self._min_cell_size)
+
+    def _keys(self, value):
+        return [grid_cell(value, self._cell_size())]
+
+    def _query_keys(self, value):
+        cells = grid_cells(value, self.tolerance, self._cell_size())
+        return None if cells is None else set(cells)
+
+
+class _StringBlocker(_ColumnBlocker):
+    """
+    Key strings by their fuzzywuzzy-processed form and abbreviation keys
+    (see AcronymIndex).
+
+    Only applicable when the tolerance is 0, i.e. compare_strings requires
+    a ratio of 100 or an abbreviation. Processed strings shorter than
+    _max_length characters only reach a ratio of 100 when they are equal,
+    longer ones are always returned as candidates.
+    """
+
+    _max_length = 100
+    _long = ('long',)
+
+    def __init__(self, column, tolerance, attribute):
+        super().__init__(column, tolerance)
+        self.attribute = attribute
+
+    def _keys(self, value):
+        if self.tolerance:
+            return []
+
+        processed = full_process(value)
+        keys = [('=', processed) if len(processed) < self._max_length
+                else self._long]
+
+        if not any(char.isdigit() for char in value):
+            text, acronym = abbreviation_keys(value)
+            keys.append(('abbr', text))
+            if acronym is not None:
+                keys.append(('name', acronym))
+
+        return keys
+
+    def _query_keys(self, value):
+        if self.tolerance:
+            return None
+
+        processed = full_process(value)
+        if len(processed) >= self._max_length:
+            return None
+
+        keys = {('=', processed), self._long}
+
+        if not any(char.isdigit() for char in value):
+            text, acronym = abbreviation_keys(value)
+            keys.add(('name', text))
+            if acronym is not None:
+                keys.add(('abbr', acronym))
+
+        return keys
+
+
+class MatchIndex:
+    """
+    Blocking index over a list of rows.
+
+    Rows are parsed into MatchBlock objects once, when the index is built
+    (a PreparedRows corpus is used as it is, the blocks of a ColumnStore
+    are built from its arrays), and keyed by cheap attributes
+    of every column: the null pattern of the row, number buckets sized by
+    number_tolerance, date buckets sized by date_tolerance, cells of a spatial
+    grid sized by coordinates_tolerance and exact str_number, str_custom and
+    string values when their tolerance is 0. A query only runs the full
+    MatchBlock comparison on rows sharing keys with the input row, so
+    results are identical to a linear scan with match_rows.
+
+    Keys depend on the tolerances, those set on MatchBlock or of the
+    MatchConfig passed to the find methods. They are built on the first
+    query with every set of tolerances and kept for the next ones, for the
+    MatchIndex.max_states most recently used sets of tolerances.
+
+    :param rows: nested list, nested tuple, PreparedRows or ColumnStore
+
+    :Example:
+
+    >>> index = MatchIndex([['Flight 1', 100], ['Flight 2', 100]])
+    >>> index.find_all(['Flight 2', 100])
+    [['Flight 2', 100]]
+    """
+
+    max_states = 4
+
+    def __init__(self, rows):
+        if isinstance(rows, ColumnStore):
+            rows = PreparedRows._from_prepared(rows, **rows.options)
+        elif not isinstance(rows, PreparedRows):
+            rows = PreparedRows(rows)
+
+        self._prepared = rows
+        self._rows = rows.rows
+        self._blocks = [x.blocks for x in rows]
+        # Blockers, postings and keys of every row, by MatchConfig.
+        self._states = LRUCache(maxsize=self.max_states)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, item):
+        return self._rows[item]
+
+    def _build(self, config):
+        """Return blockers, postings and keys of every row for config."""
+
+        state = self._states.get(config)
+        if state is not None:
+            return state
+
+        columns = max((len(x) for x in self._blocks), default=0)
+
+        blockers = [_SignatureBlocker()]
+        for column in range(columns):
+            blockers.append(_NumberBlocker(column, config.number_tolerance))
+            blockers.append(_DateBlocker(column, config.date_tolerance))
+            blockers.append(_CoordinatesBlocker(
+                column, config.coordinates_tolerance))
+            # Other methods can give a ratio of 100 to different strings.
+            if config.method == 'uwratio':
+                for attribute in ('string', 'str_number', 'str_custom'):
+                    blockers.append(_StringBlocker(
+                        column, getattr(config, attribute + '_tolerance'),
+                        attribute))
+
+        postings, row_keys = [], []
+        for blocker in blockers:
+            blocker_postings, blocker_row_keys = {}, []
+            for i, blocks in enumerate(self._blocks):
+                keys = blocker.keys(blocks)
+                blocker_row_keys.append(keys)
+                for key in keys:
+                    blocker_postings.setdefault(key, []).append(i)
+            postings.append(blocker_postings)
+            row_keys.append(blocker_row_keys)
+
+        state = (blockers, postings, row_keys)
+        self._states.put(config, state)
+        return state
+
+    def _candidates(self, blocks, config):
+        applicable = []
+        for blocker, postings, row_keys in zip(*self._build(config)):
+            keys = blocker.query_keys(blocks)
+            if keys is None:
+                continue
+            size = sum(len(postings.get(key, ())) for key in keys)
+            applicable.append((size, keys, postings, row_keys))
+
+        applicable.sort(key=lambda x: x[0])
+        _, keys, postings, _ = applicable[0]
+
+        candidates = set()
+        for key in keys:
+            candidates.update(postings.get(key, ()))
+
+        for _, keys, _, row_keys in applicable[1:]:
+            candidates = {i for i in candidates
+                          if any(key in keys for key in row_keys[i])}
+
+        return sorted(candidates)
+
+    def _matches(self, row, config):
+        if config is None:
+            config = MatchBlock.config()
+
+        blocks = self._prepared.prepare(row).blocks
+
+        for i in self._candidates(blocks, config):
+            if _blocks_match(blocks, self._blocks[i], config):
+                yield self._rows[i]
+
+    def find(self, row, config=None):
+        """
+        Return first row of the index that matches the input row.
+
+        :param row: list, tuple, PreparedRow
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :rtype: list
+        """
+
+        return next(self._matches(row, config), None)
+
+    def find_all(self, row, config=None):
+        """
+        Return all rows of the index that match the input row, in the order
+        they were indexed.
+
+        :param row: list, tuple, PreparedRow
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :rtype: list
+        """
+
+        return list(self._matches(row, config))
@@ -0,0 +1,257 @@
+import itertools
+import math
+import multiprocessing
+import os
+
+from ._columnar import ColumnStore
+from ._matchblock import MatchBlock
+from ._matchindex import MatchIndex
+from ._prepared import PreparedRow, PreparedRows, _LazyRow, _rows_match
+
+__all__ = ['match_tables', 'match_stream']
+
+# State of a worker process, set by _init_worker.
+_worker = {}
+
+
+def _workers_count(workers):
+    """Return number of processes to use, None meaning all CPUs."""
+
+    if workers is None:
+        return os.cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError('workers must be higher than 0')
+
+    return workers
+
+
+def _chunks(sequence, size):
+    """Split sequence into lists of size elements."""
+
+    return [sequence[i:i + size] for i in range(0, len(sequence), size)]
+
+
+def _chunk_size(length, workers):
+    return max(1, math.ceil(length / (workers * 4)))
+
+
+def _init_worker(scorer, state):
+    """
+    Set up a worker process: use the scorer of the parent process, load the
+    default dictionary once and store the shared state.
+    """
+
+    MatchBlock.scorer = scorer
+    MatchBlock._load_dictionary()
+
+    _worker.clear()
+    _worker.update(state)
+
+    if 'corpus' in state:
+        corpus = state['corpus']
+        _worker['index'] = corpus \
+            if isinstance(corpus, (MatchIndex, ColumnStore)) \
+            else MatchIndex(corpus)
+
+
+def _pool(workers, **state):
+    return multiprocessing.Pool(workers, initializer=_init_worker,
+                                initargs=(MatchBlock.scorer, state))
+
+
+def _prepare_chunk(chunk):
+    return [PreparedRow.from_row(row, **_worker['options']) for row in chunk]
+
+
+def _find_all_chunk(chunk):
+    index, config = _worker['index'], _worker['config']
+    return [index.find_all(row, config) for row in chunk]
+
+
+def _match_chunk(chunk):
+    query, config = _worker['query'], _worker['config']
+    if not isinstance(query, PreparedRow):
+        query = _LazyRow(query)
+
+    return [element for element in chunk
+            if _rows_match(query, element, config)]
+
+
+def find_all_parallel(row, rows, workers, config=None):
+    """
+    Low-level function for match_find_all: compare the row with chunks of
+    rows in a pool of worker processes.
+
+    Workers use config, or the tolerances set on MatchBlock in the calling
+    process.
+
+    :param row: list, tuple, PreparedRow
+    :param rows: nested list, nested tuple, PreparedRows
+    :param workers: int
+    :param config: MatchConfig or None
+    :rtype: list
+    """
+
+    if config is None:
+        config = MatchBlock.config()
+
+    query = rows.prepare(row) if isinstance(rows, PreparedRows) else row
+    elements = list(rows)
+
+    size = _chunk_size(len(elements), workers)
+
+    with _pool(workers, query=query, config=config) as pool:
+        chunks = pool.map(_match_chunk, _chunks(elements, size))
+
+    matches = [element for chunk in chunks for element in chunk]
+
+    if isinstance(rows, PreparedRows):
+        return [element.row for element in matches]
+
+    return matches
+
+
+def _prepare_corpus(rows, workers, options):
+    """
+    Return rows as a MatchIndex, or as PreparedRows parsed in a pool of
+    processes (each of them indexes the rows) if there is more than one
+    worker. A ColumnStore is searched as it is.
+    """
+
+    if isinstance(rows, (MatchIndex, ColumnStore)):
+        return rows
+
+    if workers == 1:
+        return MatchIndex(rows if isinstance(rows, PreparedRows)
+                          else PreparedRows(rows, **options))
+
+    if isinstance(rows, PreparedRows):
+        return rows
+
+    rows = list(rows)
+    size = _chunk_size(len(rows), workers)
+
+    with _pool(workers, options=options) as pool:
+        chunks = pool.map(_prepare_chunk, _chunks(rows, size))
+
+    return PreparedRows._from_prepared(
+        [element for chunk in chunks for element in chunk], **options)
+
+
+def _batches(iterable, size):
+    """Yield lists of size consecutive elements of the iterable."""
+
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def match_tables(rows1, rows2, workers=1, config=None, **kwargs):
+    """
+    Search rows2 for all successful matches with every row of rows1.
+
+    Return list of lists of matching rows from rows2, in the order of rows1.
+
+    rows2 is parsed once and indexed with MatchIndex. With more than one
+    worker, rows2 is parsed in chunks by a pool of processes, each of them
+    then builds its own MatchIndex and searches it for a chunk of rows1.
+    Workers open a ColumnStore instead, sharing its memory-mapped arrays.
+    Keyword arguments are passed to MatchBlock when parsing the rows.
+
+    :param rows1: nested list, nested tuple
+    :param rows2: nested list, nested tuple, PreparedRows, MatchIndex or
+        ColumnStore
+    :param workers: int, number of processes, None to use all CPUs
+    :param config: MatchConfig, None to use the tolerances set on MatchBlock
+    :rtype: list
+
+    :Example:
+
+    >>> rows1 = [['Flight 1', 100], ['Flight 2', 100]]
+    >>> rows2 = [['Flight 2', 100], ['Flight 1', 100], ['Flight 1', 100]]
+    >>> match_tables(rows1, rows2)
+    [[['Flight 1', 100], ['Flight 1', 100]], [['Flight 2', 100]]]
+    """
+
+    workers = _workers_count(workers)
+    rows1 = list(rows1)
+
+    if workers == 1:
+        index = _prepare_corpus(rows2, workers, kwargs)
+        return [index.find_all(row, config) for row in rows1]
+
+    if config is None:
+        config = MatchBlock.config()
+
+    rows2 = _prepare_corpus(rows2, workers, kwargs)
+    size = _chunk_size(len(rows1), workers)
+
+    with _pool(workers, corpus=rows2, config=config) as pool:
+        chunks = pool.map(_find_all_chunk, _chunks(rows1, size))
+
+    return [matches for chunk in chunks for matches in chunk]
+
+
+def match_stream(rows1, rows2, batch_size=1000, workers=1, config=None,
+                 **kwargs):
+    """
+    Search rows2 for matches with every row of the iterable rows1, yielding
+    (row1, row2) pairs as they are found.
+
+    rows1 is consumed lazily, so that only rows2, indexed with MatchIndex,
+    and a batch of rows1 are held in memory; the rows can be read straight
+    from a file and the pairs written out as they come. Pairs are yielded in
+    the order of rows1, and for each of its rows in the order of rows2. Rows
+    without any match are skipped.
+
+    With one worker rows1 is read one row at a time. With more workers it is
+    read batch_size rows at a time, every batch is split into chunks searched
+    by a pool of processes, each of them holding its own MatchIndex of rows2.
+    Keyword arguments are passed to MatchBlock when parsing rows2.
+
+    :param rows1: iterable of lists or tuples
+    :param rows2: nested list, nested tuple, PreparedRows, MatchIndex or
+        ColumnStore
+    :param batch_size: int, number of rows of rows1 read at a time
+    :param workers: int, number of processes, None to use all CPUs
+    :param config: MatchConfig, None to use the tolerances set on MatchBlock
+    :rtype: generator
+
+    :Example:
+
+    >>> rows1 = iter([['Flight 1', 100], ['Flight 2', 100]])
+    >>> rows2 = [['Flight 2', 100], ['Flight 1', 100], ['Flight 1', 101]]
+    >>> for row1, row2 in match_stream(rows1, rows2):
+    ...     print(row1, row2)
+    ['Flight 1', 100] ['Flight 1', 100]
+    ['Flight 2', 100] ['Flight 2', 100]
+    """
+
+    if batch_size < 1:
+        raise ValueError('batch_size must be higher than 0')
+
+    workers = _workers_count(workers)
+    rows2 = _prepare_corpus(rows2, workers, kwargs)
+
+    if workers == 1:
+        for row in rows1:
+            for match in rows2.find_all(row, config):
+                yield row, match
+        return
+
+    if config is None:
+        config = MatchBlock.config()
+
+    with _pool(workers, corpus=rows2, config=config) as pool:
+        for batch in _batches(rows1, batch_size):
+            size = _chunk_size(len(batch), workers)
+            chunks = pool.map(_find_all_chunk, _chunks(batch, size))
+
+            matches = (x for chunk in chunks for x in chunk)
+            for row, row_matches in zip(batch, matches):
+                for match in row_matches:
+                    yield row, match
@@ -0,0 +1,279 @@
+import random
+
+from ._columnar import ColumnStore
+from ._joins import _column_values, _join_pairs, _prepare
+from ._matchblock import MatchBlock
+from ._prepared import PreparedRow, PreparedRows
+
+__all__ = ['MatchPlan']
+
+# Attributes of MatchBlock, in the order of MatchBlock.attributes, and the
+# cost of computing the key of one value to join on them, in units of
+# MatchBlock.comparison_costs.
+_ATTRIBUTES = ('number', 'date', 'coordinates', 'string', 'str_number',
+               'str_custom')
+_KEY_COSTS = {'number': 1, 'date': 2, 'coordinates': 5, 'string': 20,
+              'str_number': 5, 'str_custom': 5}
+
+# Maximum number of sampled candidate pairs the columns are compared on.
+_MAX_PAIRS = 1000
+
+
+def _sample(rows, size, generator, options):
+    """
+    Return number of rows and list of PreparedRow objects of a random
+    sample of at most size rows, in their order. Only sampled rows are
+    parsed.
+    """
+
+    if not isinstance(rows, (PreparedRows, ColumnStore)):
+        rows = list(rows)
+
+    positions = range(len(rows))
+    if len(rows) > size:
+        positions = sorted(generator.sample(positions, size))
+
+    sample = []
+    for k in positions:
+        row = rows[k]
+        if not isinstance(row, PreparedRow):
+            row = PreparedRow.from_row(row, **options)
+        sample.append(row)
+
+    return len(rows), sample
+
+
+def _column_costs(blocks1, blocks2):
+    """Return cost of comparing every pair of blocks, like matches does."""
+
+    null, costs = MatchBlock._null, MatchBlock.comparison_costs
+    return [sum(cost for attr1, attr2, cost in
+                zip(x._attributes, y._attributes, costs)
+                if attr1 not in null and attr2 not in null)
+            for x, y in zip(blocks1, blocks2)]
+
+
+class MatchPlan:
+    """
+    Plan of a join of two tables: the column and attribute of MatchBlock
+    the rows are joined on (see match_join), and the order the columns of
+    the candidate pairs are then compared in.
+
+    MatchPlan.create samples both tables and estimates, for the attributes
+    of every column, their selectivity (the share of pairs of sampled rows
+    joined on them) and the cost of the join: keying every row and
+    comparing the expected candidate pairs, at the cost of comparing random
+    pairs of rows. The cheapest one is picked, or no join at all when every
+    pair has to be compared anyway. Columns are compared from the lowest
+    cost per rejection observed on the sampled candidate pairs, like
+    MatchBlock.adaptive_order. Results don't depend on the plan: they are
+    identical to match_rows on every pair.
+
+    str(plan) reports the plan and the estimates.
+
+    :param key: tuple of column and attribute, None to compare all pairs
+    :param order: tuple of columns, in the order they are compared
+    :param config: MatchConfig
+    :param options: dict, keyword arguments passed to MatchBlock
+    :param estimates: list of tuples of column, attribute, selectivity and
+        cost of every join, in units of MatchBlock.comparison_costs
+    :param sizes: tuple of numbers of rows of both tables
+    :param cost: estimated cost of the plan, that of its entry of estimates
+        or of comparing all pairs
+
+    :Example:
+
+    >>> rows1 = [['Flight 1', 100], ['Flight 2', 200]]
+    >>> rows2 = [['Flight 2', 203], ['Flight 1', 101], ['Flight 1', 150]]
+    >>> plan = MatchPlan.create(rows1, rows2, MatchConfig(number_tolerance=5))
+    >>> plan.key, plan.order
+    ((1, 'number'), (1, 0))
+    >>> plan.join(rows1, rows2)
+    [(0, 1), (1, 0)]
+    >>> print(plan)
+    join 2 x 3 rows on number of column 1
+    compare columns in order 1, 0
+    estimated cost 26.05
+      column 1 number: selectivity 0.333, cost 26.05
+      column 0 str_number: selectivity 0.5, cost 56.58
+      column 0 string: selectivity 1, cost 163.2
+    """
+
+    def __init__(self, key, order, config, options=None, estimates=(),
+                 sizes=(0, 0), cost=0.0):
+        self.key = key
+        self.order = tuple(order)
+        self.config = config
+        self.options = dict(options or {})
+        self.estimates = list(estimates)
+        self.sizes = sizes
+        self.cost = cost
+
+    @classmethod
+    def create(cls, rows1, rows2, config=None, sample_size=1000, seed=0,
+               **kwargs):
+        """
+        Plan the join of two tables from random samples of their rows.
+
+        Keyword arguments are passed to MatchBlock when parsing the rows,
+        PreparedRows and ColumnStore objects are sampled as they are.
+
+        :param rows1: nested list, nested tuple, PreparedRows or ColumnStore
+        :param rows2: nested list, nested tuple, PreparedRows or ColumnStore
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :param sample_size: int, number of rows sampled from every table
+        :param seed: seed of the random samples
+        :rtype: MatchPlan
+        """
+
+        if sample_size < 1:
+            raise ValueError('sample_size must be higher than 0')
+
+        if config is None:
+            config = MatchBlock.config()
+
+        generator = random.Random(seed)
+        size1, sample1 = _sample(rows1, sample_size, generator, kwargs)
+        size2, sample2 = _sample(rows2, sample_size, generator, kwargs)
+        # Every sampled pair stands for total / scale pairs of rows.
+        scale = max(len(sample1) * len(sample2), 1)
+        total = size1 * size2
+
+        columns = max((len(x) for x in sample1 + sample2), default=0)
+        pairs = []
+        if sample1 and sample2:
+            pairs = [(generator.randrange(len(sample1)),
+                      generator.randrange(len(sample2)))
+                     for _ in range(_MAX_PAIRS)]
+        # Random pairs of rows, compared without join.
+        order, verify = cls._order(sample1, sample2, pairs, columns, config,
+                                   generator)
+
+        key, cost, estimates = None, total * verify, []
+        for column in range(columns):
+            for attribute in _ATTRIBUTES:
+                values1 = _column_values(sample1, column, attribute)
+                values2 = _column_values(sample2, column, attribute)
+                if all(x is None for x in values1) or \
+                        all(x is None for x in values2):
+                    continue
+
+                joined = _join_pairs(sample1, sample2, column, attribute,
+                                     config)
+                selectivity = len(joined) / scale
+                estimate = (size1 + size2) * _KEY_COSTS[attribute] + \
+                    selectivity * total * verify
+                estimates.append((column, attribute, selectivity, estimate))
+
+                if estimate < cost:
+                    key, pairs, cost = (column, attribute), joined, estimate
+
+        # Columns are compared on the candidate pairs of the join. The cost
+        # stays the estimate the key was picked by, comparable to the others.
+        if key is not None:
+            order, _ = cls._order(sample1, sample2, pairs, columns, config,
+                                  generator)
+
+        return cls(key, order, config, kwargs, estimates, (size1, size2),
+                   cost)
+
+    @staticmethod
+    def _order(sample1, sample2, pairs, columns, config, generator):
+        """
+        Return order of the columns, from the lowest cost per rejection on
+        the sampled pairs, and the expected cost of comparing a pair in it.
+        """
+
+        if len(pairs) > _MAX_PAIRS:
+            pairs = generator.sample(pairs, _MAX_PAIRS)
+
+        # Costs and rejections of every column, on pairs of rows of the
+        # same length, the others being rejected before any comparison.
+        costs, rejections, count = [0] * columns, [0] * columns, 0
+        for i, j in pairs:
+            blocks1, blocks2 = sample1[i].blocks, sample2[j].blocks
+            if len(blocks1) != len(blocks2):
+                continue
+
+            count += 1
+            for column, cost in enumerate(_column_costs(blocks1, blocks2)):
+                costs[column] += cost
+                rejections[column] += not blocks1[column].matches(
+                    blocks2[column], config)
+
+        # Expected cost of finding a rejection, with add-one smoothing of
+        # the rejection rate, like MatchBlock.comparison_order.
+        def rank(column):
+            return (costs[column] + 1) / (rejections[column] + 1)
+
+        order = tuple(sorted(range(columns), key=rank))
+
+        # Cost of comparing columns until the first rejection, taking them
+        # as independent.
+        verify, passed = 1.0, 1.0
+        for column in order:
+            if not count:
+                break
+            verify += passed * costs[column] / count
+            passed *= 1 - rejections[column] / count
+
+        return order, verify
+
+    def _verify(self, blocks1, blocks2):
+        """Compare rows of MatchBlock objects like _blocks_match."""
+
+        if len(blocks1) != len(blocks2):
+            return False
+
+        config = self.config
+        order = self.order
+        if len(blocks1) > len(order):
+            order += tuple(range(len(order), len(blocks1)))
+
+        return all(blocks1[column].matches(blocks2[column], config)
+                   for column in order if column < len(blocks1))
+
+    def join(self, rows1, rows2):
+        """
+        Return sorted list of pairs (i, j) of positions of matching rows1[i]
+        and rows2[j], like match_join, following the plan.
+
+        :param rows1: nested list, nested tuple, PreparedRows or ColumnStore
+        :param rows2: nested list, nested tuple, PreparedRows or ColumnStore
+        :rtype: list
+        """
+
+        prepared1 = _prepare(rows1, self.options)
+        prepared2 = _prepare(rows2, self.options)
+
+        if self.key is None:
+            pairs = ((i, j) for i in range(len(prepared1))
+                     for j in range(len(prepared2)))
+        else:
+            pairs = _join_pairs(prepared1, prepared2, *self.key, self.config)
+
+        return [(i, j) for i, j in pairs
+                if self._verify(prepared1[i].blocks, prepared2[j].blocks)]
+
+    def __str__(self):
+        if self.key is None:
+            lines = ['compare all pairs of {} x {} rows'.format(*self.sizes)]
+        else:
+            lines = ['join {} x {} rows on {} of column {}'.format(
+                *self.sizes, self.key[1], self.key[0])]
+
+        lines.append('compare columns in order {}'.format(
+            ', '.join(str(x) for x in self.order)))
+        lines.append('estimated cost {:.4g}'.format(self.cost))
+
+        for column, attribute, selectivity, cost in sorted(
+                self.estimates, key=lambda x: x[3]):
+            lines.append('  column {} {}: selectivity {:.3g}, cost '
+                         '{:.4g}'.format(column, attribute, selectivity, cost))
+
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return '<{} object at {}: key={!r}, order={!r}>'.format(
+            type(self).__name__, hex(id(self)), self.key, self.order)
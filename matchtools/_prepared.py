@@ -0,0 +1,315 @@
+import itertools
+
+from . import _storage
+from ._matchblock import MatchBlock
+
+__all__ = ['PreparedRow', 'PreparedRows']
+
+
+def _blocks_match(blocks1, blocks2, config=None):
+    """Compare two tuples of MatchBlock objects the way match_rows does."""
+
+    if len(blocks1) != len(blocks2):
+        return False
+
+    return all(x.matches(y, config) for x, y in zip(blocks1, blocks2))
+
+
+def _row_blocks(row):
+    """
+    Return MatchBlock objects of the row: those of a PreparedRow or
+    _LazyRow, or a generator parsing the values of a plain row one by one.
+    """
+
+    if isinstance(row, PreparedRow):
+        return row.blocks
+    if isinstance(row, _LazyRow):
+        return row
+
+    return (MatchBlock(x) for x in row)
+
+
+def _rows_match(row1, row2, config=None):
+    """
+    Compare rows the way match_rows does. Lengths are checked first, and
+    values of plain rows are only parsed until a pair doesn't match.
+    """
+
+    if len(row1) != len(row2):
+        return False
+
+    return all(x.matches(y, config)
+               for x, y in zip(_row_blocks(row1), _row_blocks(row2)))
+
+
+def _as_prepared(row):
+    """Return row as a PreparedRow, parsing it if necessary."""
+
+    if isinstance(row, PreparedRow):
+        return row
+
+    return PreparedRow.from_row(row)
+
+
+class PreparedRow:
+    """
+    A row stored together with the MatchBlock objects parsed from its values.
+
+    Accepted by match_rows in place of a plain row.
+
+    :param row: list, tuple
+    :param blocks: tuple of MatchBlock objects
+
+    :Example:
+
+    >>> prepared = PreparedRow.from_row(['Flight 1', 5])
+    >>> prepared.blocks[0].str_number, prepared.blocks[1].number
+    ('1', 5)
+    """
+
+    __slots__ = ('row', 'blocks')
+
+    def __init__(self, row, blocks):
+        self.row = row
+        self.blocks = blocks
+
+    @classmethod
+    def from_row(cls, row, **kwargs):
+        """
+        Parse values of the row into MatchBlock objects.
+
+        Keyword arguments are passed to MatchBlock.
+
+        :param row: list, tuple
+        :rtype: PreparedRow
+        """
+
+        return cls(row, tuple(MatchBlock(x, **kwargs) for x in row))
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __repr__(self):
+        return '<{} object at {}: {!r}>'.format(
+            type(self).__name__, hex(id(self)), self.row)
+
+
+class _LazyRow:
+    """
+    Plain row whose values are parsed into MatchBlock objects the first time
+    they are compared, and kept for the next comparisons.
+    """
+
+    __slots__ = ('row', '_blocks')
+
+    def __init__(self, row):
+        self.row = row
+        self._blocks = [None] * len(row)
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def __iter__(self):
+        for i, block in enumerate(self._blocks):
+            if block is None:
+                block = self._blocks[i] = MatchBlock(self.row[i])
+            yield block
+
+
+class _SavedRows:
+    """
+    PreparedRow objects of the rows of a saved corpus, whose MatchBlock
+    objects are built from the stored attribute columns the first time the
+    row is used, and kept. Columns are dropped once every row is built.
+    """
+
+    def __init__(self, rows, lengths, columns):
+        self.rows = rows
+        self._columns = columns
+        self._starts = [0] + list(itertools.accumulate(lengths))
+        self._prepared = [None] * len(rows)
+        self._missing = len(rows)
+
+    def _build(self, k, attributes):
+        count = self._starts[k + 1] - self._starts[k]
+        element = self._prepared[k] = PreparedRow(
+            self.rows[k], _storage._blocks(attributes, count))
+
+        self._missing -= 1
+        if not self._missing:
+            self._columns = None
+        return element
+
+    def __len__(self):
+        return len(self._prepared)
+
+    def __iter__(self):
+        if not self._missing:
+            yield from self._prepared
+            return
+
+        # Blocks of all rows are built in one pass over the columns.
+        attributes = zip(*self._columns)
+        for k, element in enumerate(self._prepared):
+            if element is None:
+                element = self._build(k, attributes)
+            else:
+                skipped = self._starts[k + 1] - self._starts[k]
+                next(itertools.islice(attributes, skipped, skipped), None)
+            yield element
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[k] for k in range(*item.indices(len(self)))]
+
+        element = self._prepared[item]
+        if element is None:
+            if item < 0:
+                item += len(self)
+            start, stop = self._starts[item], self._starts[item + 1]
+            element = self._build(
+                item, zip(*(x[start:stop] for x in self._columns)))
+        return element
+
+
+class PreparedRows:
+    """
+    Prepared corpus of rows: every row is parsed into MatchBlock objects
+    exactly once, when the corpus is created.
+
+    Pass it to match_find, match_find_all or MatchIndex instead of a list of
+    rows to avoid parsing the same rows for every search. Matches are
+    returned as the original rows.
+
+    Keyword arguments are passed to MatchBlock when parsing the rows and the
+    rows searched for.
+
+    :param rows: nested list, nested tuple
+
+    :Example:
+
+    >>> rows = PreparedRows([['Flight 1', 100], ['Flight 2', 100]])
+    >>> match_find_all(['Flight 2', 100], rows)
+    [['Flight 2', 100]]
+    """
+
+    def __init__(self, rows, **kwargs):
+        self.options = kwargs
+        self._prepared = [PreparedRow.from_row(row, **kwargs) for row in rows]
+
+    @classmethod
+    def _from_prepared(cls, prepared, **kwargs):
+        """Create corpus from already parsed PreparedRow objects."""
+
+        corpus = cls([], **kwargs)
+        corpus._prepared = list(prepared)
+        return corpus
+
+    def save(self, file):
+        """
+        Save the rows and their parsed MatchBlock objects to a file, to be
+        loaded by PreparedRows.load without parsing the rows again.
+
+        The file is versioned and records the options the rows were parsed
+        with, the fingerprint of the dictionary and the date formats, so
+        that stale files are rejected.
+
+        :param file: str, path, or binary file object
+        """
+
+        _storage.save_prepared(self, file)
+
+    @classmethod
+    def load(cls, file, **kwargs):
+        """
+        Load a corpus saved by PreparedRows.save.
+
+        Keyword arguments are the options of the corpus, checked against
+        those the file was parsed with; by default, those are used. Raise
+        ValueError if the file was parsed with other flags, dictionary or
+        date formats than the current ones. Files are pickled: load only
+        files you trust.
+
+        Loading only unpickles the rows and the attribute columns of their
+        blocks, MatchBlock objects of a row are built the first time it is
+        used. Building those of the whole corpus, on the first search,
+        takes a few seconds per million blocks, several times less than
+        parsing the rows again.
+
+        :param file: str, path, or binary file object
+        :rtype: PreparedRows
+
+        :Example:
+
+        >>> PreparedRows(rows, try_date=False).save('rows.mtp')
+        >>> corpus = PreparedRows.load('rows.mtp')
+        >>> corpus.options
+        {'try_date': False, 'try_coordinates': True, ...}
+        """
+
+        rows, lengths, columns, options = _storage.load_prepared(file, kwargs)
+
+        corpus = cls([], **options)
+        corpus._prepared = _SavedRows(rows, lengths, columns)
+        return corpus
+
+    def __len__(self):
+        return len(self._prepared)
+
+    def __iter__(self):
+        return iter(self._prepared)
+
+    def __getitem__(self, item):
+        return self._prepared[item]
+
+    @property
+    def rows(self):
+        if isinstance(self._prepared, _SavedRows):
+            return list(self._prepared.rows)
+        return [x.row for x in self._prepared]
+
+    def prepare(self, row):
+        """
+        Parse the row with the options of the corpus.
+
+        Return the row unchanged if it is already a PreparedRow.
+
+        :param row: list, tuple, PreparedRow
+        :rtype: PreparedRow
+        """
+
+        if isinstance(row, PreparedRow):
+            return row
+
+        return PreparedRow.from_row(row, **self.options)
+
+    def find(self, row, config=None):
+        """
+        Return first row of the corpus that matches the input row.
+
+        :param row: list, tuple, PreparedRow
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :rtype: list
+        """
+
+        blocks = self.prepare(row).blocks
+
+        for element in self._prepared:
+            if _blocks_match(blocks, element.blocks, config):
+                return element.row
+
+    def find_all(self, row, config=None):
+        """
+        Return all rows of the corpus that match the input row.
+
+        :param row: list, tuple, PreparedRow
+        :param config: MatchConfig, None to use the tolerances set on
+            MatchBlock
+        :rtype: list
+        """
+
+        blocks = self.prepare(row).blocks
+
+        return [element.row for element in self._prepared
+                if _blocks_match(blocks, element.blocks, config)]
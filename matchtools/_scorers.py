@@ -0,0 +1,332 @@
+from fuzzywuzzy import fuzz
+from fuzzywuzzy.utils import full_process
+
+try:
+    import Levenshtein
+except ImportError:
+    Levenshtein = None
+
+__all__ = ['Scorer', 'FuzzScorer', 'LevenshteinScorer', 'get_scorer']
+
+
+def _masks(string):
+    """Return dict of characters and bit masks of their positions."""
+
+    masks = {}
+    bit = 1
+    for char in string:
+        masks[char] = masks.get(char, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def _lcs(masks, length, string):
+    """
+    Return length of the longest common subsequence of the string and the
+    one of the masks, with a bit-parallel algorithm (Hyyro, 2004).
+    """
+
+    full = (1 << length) - 1
+    v = full
+    for char in string:
+        u = v & masks.get(char, 0)
+        v = ((v + u) | (v - u)) & full
+
+    return length - bin(v).count('1')
+
+
+class Scorer:
+    """
+    Similarity of strings, from 0 to 100, used by compare_strings and
+    MatchBlock.score.
+
+    Methods follow fuzzywuzzy's functions of the same names (uwratio being
+    UWRatio), but ratio is always the exact one: 2 * M / T, where M is the
+    length of the longest common subsequence and T the total length of the
+    strings (the ratio of python-Levenshtein; difflib, used by fuzzywuzzy
+    without it, may find shorter subsequences). partial_ratio is the best
+    ratio of the shorter string and its substrings of the longer one,
+    starting at any position. This way the exact backends give the same
+    scores, never lower than those of fuzzywuzzy, which may differ. They
+    are opt-in, see get_scorer; MatchBlock.scorer is a FuzzScorer by
+    default.
+
+    Scorer is the pure-Python exact backend, subclasses only override
+    _lcs_length and _window_lcs.
+
+    :Example:
+
+    >>> Scorer().ratio('Flight 1', 'Fligth 1')
+    88
+    >>> MatchBlock.scorer = get_scorer('auto')
+    """
+
+    name = 'python'
+
+    def _lcs_length(self, string1, string2):
+        """Return length of the longest common subsequence."""
+
+        if len(string1) < len(string2):
+            string1, string2 = string2, string1
+
+        return _lcs(_masks(string2), len(string2), string1)
+
+    def _window_lcs(self, shorter):
+        """
+        Return function of a string returning length of its longest common
+        subsequence with the shorter string.
+        """
+
+        masks, length = _masks(shorter), len(shorter)
+        return lambda window: _lcs(masks, length, window)
+
+    def _best_window(self, shorter, longer):
+        """
+        Return the best ratio of the shorter string and the substrings of
+        the longer one of the same length or ending the longer one.
+        """
+
+        length = len(shorter)
+        lcs_length = self._window_lcs(shorter)
+
+        best = 0.
+        for start in range(len(longer)):
+            window = longer[start:start + length]
+            best = max(best,
+                       2 * lcs_length(window) / (length + len(window)))
+            if best == 1:
+                break
+
+        return best
+
+    @staticmethod
+    def _intr(value):
+        return int(round(value))
+
+    def ratio(self, string1, string2):
+        """
+        Return similarity of the strings.
+
+        :param string1: str
+        :param string2: str
+        :rtype: int
+        """
+
+        if string1 is None or string2 is None:
+            return 0
+        if string1 == string2:
+            return 100
+        if not string1 or not string2:
+            return 0
+
+        matches = 2 * self._lcs_length(string1, string2)
+        return self._intr(100 * matches / (len(string1) + len(string2)))
+
+    def partial_ratio(self, string1, string2):
+        """
+        Return similarity of the shorter string and the most similar
+        substring of the longer one.
+
+        :param string1: str
+        :param string2: str
+        :rtype: int
+        """
+
+        if string1 is None or string2 is None:
+            return 0
+        if string1 == string2:
+            return 100
+        if not string1 or not string2:
+            return 0
+
+        if len(string1) <= len(string2):
+            shorter, longer = string1, string2
+        else:
+            shorter, longer = string2, string1
+
+        return self._intr(100 * self._best_window(shorter, longer))
+
+    @staticmethod
+    def _sort_tokens(string, force_ascii, process):
+        if process:
+            string = full_process(string, force_ascii=force_ascii)
+        return ' '.join(sorted(string.split())).strip()
+
+    def _token_sort(self, string1, string2, partial, force_ascii, process):
+        if string1 is None or string2 is None:
+            return 0
+
+        sorted1 = self._sort_tokens(string1, force_ascii, process)
+        sorted2 = self._sort_tokens(string2, force_ascii, process)
+
+        func = self.partial_ratio if partial else self.ratio
+        return func(sorted1, sorted2)
+
+    def _token_set(self, string1, string2, partial, force_ascii, process):
+        if string1 is None or string2 is None:
+            return 0
+        if not process and string1 == string2:
+            return 100
+
+        if process:
+            string1 = full_process(string1, force_ascii=force_ascii)
+            string2 = full_process(string2, force_ascii=force_ascii)
+
+        if not string1 or not string2:
+            return 0
+
+        tokens1, tokens2 = set(string1.split()), set(string2.split())
+
+        intersection = ' '.join(sorted(tokens1 & tokens2))
+        combined1 = (intersection + ' ' +
+                     ' '.join(sorted(tokens1 - tokens2))).strip()
+        combined2 = (intersection + ' ' +
+                     ' '.join(sorted(tokens2 - tokens1))).strip()
+        intersection = intersection.strip()
+
+        func = self.partial_ratio if partial else self.ratio
+        return max(func(intersection, combined1),
+                   func(intersection, combined2),
+                   func(combined1, combined2))
+
+    def token_sort_ratio(self, string1, string2):
+        """
+        Return similarity of the strings with their words sorted.
+
+        :param string1: str
+        :param string2: str
+        :rtype: int
+        """
+
+        return self._token_sort(string1, string2, False, True, True)
+
+    def token_set_ratio(self, string1, string2):
+        """
+        Return similarity of the common words and the remaining words of
+        the strings.
+
+        :param string1: str
+        :param string2: str
+        :rtype: int
+        """
+
+        return self._token_set(string1, string2, False, True, True)
+
+    def uwratio(self, string1, string2):
+        """
+        Return the best of ratio, token and partial similarities of the
+        strings, weighted like fuzzywuzzy's UWRatio.
+
+        :param string1: str
+        :param string2: str
+        :rtype: int
+        """
+
+        string1 = full_process(string1, force_ascii=False)
+        string2 = full_process(string2, force_ascii=False)
+
+        if not string1 or not string2:
+            return 0
+
+        base = self.ratio(string1, string2)
+        len_ratio = (max(len(string1), len(string2)) /
+                     min(len(string1), len(string2)))
+
+        if len_ratio < 1.5:
+            return self._intr(max(
+                base,
+                self._token_sort(string1, string2, False, False, False) * .95,
+                self._token_set(string1, string2, False, False, False) * .95))
+
+        scale = .6 if len_ratio > 8 else .9
+
+        return self._intr(max(
+            base,
+            self.partial_ratio(string1, string2) * scale,
+            self._token_sort(string1, string2, True, False, False)
+            * .95 * scale,
+            self._token_set(string1, string2, True, False, False)
+            * .95 * scale))
+
+    def __eq__(self, other):
+        return type(self) is type(other)
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def __repr__(self):
+        return '<{} object: {}>'.format(type(self).__name__, self.name)
+
+
+class FuzzScorer(Scorer):
+    """
+    Scorer calling fuzzywuzzy's functions, the default MatchBlock.scorer:
+    scores are exactly those of fuzzywuzzy (UWRatio for uwratio).
+    """
+
+    name = 'fuzzywuzzy'
+
+    def ratio(self, string1, string2):
+        return fuzz.ratio(string1, string2)
+
+    def partial_ratio(self, string1, string2):
+        return fuzz.partial_ratio(string1, string2)
+
+    def token_sort_ratio(self, string1, string2):
+        return fuzz.token_sort_ratio(string1, string2)
+
+    def token_set_ratio(self, string1, string2):
+        return fuzz.token_set_ratio(string1, string2)
+
+    def uwratio(self, string1, string2):
+        return fuzz.UWRatio(string1, string2)
+
+
+class LevenshteinScorer(Scorer):
+    """
+    Scorer computing ratios with the python-Levenshtein package (or its
+    successor, Levenshtein), which has to be installed. Gives the same
+    scores as Scorer, faster.
+    """
+
+    name = 'levenshtein'
+
+    def __init__(self):
+        if Levenshtein is None:
+            raise ImportError('python-Levenshtein is required for the '
+                              'levenshtein scorer, install it with: '
+                              'pip install python-Levenshtein')
+
+    def _lcs_length(self, string1, string2):
+        # Levenshtein.ratio is (T - D) / T, where D is the number of
+        # insertions and deletions, i.e. T - 2 * M. Rounding recovers M
+        # exactly, whatever the floating point error of the library.
+        total = len(string1) + len(string2)
+        return int(round(Levenshtein.ratio(string1, string2) * total)) // 2
+
+    def _window_lcs(self, shorter):
+        return lambda window: self._lcs_length(shorter, window)
+
+
+_scorers = {'fuzzywuzzy': FuzzScorer, 'python': Scorer,
+            'levenshtein': LevenshteinScorer}
+
+
+def get_scorer(name='fuzzywuzzy'):
+    """
+    Return string similarity backend by its name: 'fuzzywuzzy' (the
+    default), one of the exact backends 'python' and 'levenshtein', or
+    'auto' for the fastest exact one installed.
+
+    :param name: str
+    :rtype: Scorer
+    """
+
+    if name == 'auto':
+        name = 'python' if Levenshtein is None else 'levenshtein'
+
+    if name not in _scorers:
+        msg = 'wrong scorer, use available: {}'
+        raise ValueError(msg.format(', '.join(sorted(_scorers) + ['auto'])))
+
+    return _scorers[name]()
@@ -0,0 +1,348 @@
+import math
+from collections import Counter
+
+from fuzzywuzzy.utils import full_process
+
+from ._acronyms import AcronymIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Number of pairs of strings bounded at a time with numpy.
+_BLOCK = 1 << 22
+
+# Allowance for rounding errors of bounds computed in single precision.
+_EPSILON = 1e-4
+
+
+def _sort_tokens(string, force_ascii):
+    return ' '.join(sorted(full_process(string, force_ascii=force_ascii)
+                           .split()))
+
+
+def _set_tokens(string, force_ascii):
+    return ' '.join(sorted(set(full_process(string, force_ascii=force_ascii)
+                               .split())))
+
+
+def _bigrams(string):
+    """Return Counter of pairs of adjacent characters within words."""
+
+    return Counter(word[k:k + 2] for word in string.split()
+                   for k in range(len(word) - 1))
+
+
+def _profile(string, method):
+    """
+    Return the string the method compares (or one containing all the
+    characters and bigrams of the strings it compares), its length, the
+    length of its shortest version compared, Counter of its characters,
+    Counter of its bigrams and, for uwratio, set of its words.
+    """
+
+    shortest, words = None, frozenset()
+    if method == 'token_sort_ratio':
+        string = _sort_tokens(string, True)
+    elif method == 'token_set_ratio':
+        string = _set_tokens(string, True)
+    elif method == 'uwratio':
+        string = full_process(string, force_ascii=False)
+        words = frozenset(string.split())
+        shortest = len(' '.join(words))
+
+    if shortest is None:
+        shortest = len(string)
+
+    return (string, len(string), shortest, Counter(string), _bigrams(string),
+            words)
+
+
+def _bounds(method, overlap, shared, side1, side2, lib, common=False):
+    """
+    Return upper bound of the score of the method for strings sharing
+    overlap characters and shared bigrams (with repetitions), side1 and
+    side2 being their lengths, lengths of the shortest versions compared
+    and numbers of bigrams, and common whether they share a word, given
+    as numbers or numpy arrays.
+
+    A common subsequence can't be longer than the overlap, so ratio is at
+    most 2 * overlap / (length1 + length2). partial_ratio and ratios of the
+    words of token_set_ratio compare the shortest string with a string at
+    least as long, which gives 2 * overlap / (overlap + shortest).
+
+    Every insertion or deletion in a string destroys at most 2 of its
+    bigrams (q-gram lemma), so strings with n bigrams, of which shared are
+    found in the other one, are at least (n - shared) / 2 edits apart.
+
+    uwratio takes the best of the ratios, weighted like in Scorer.uwratio.
+    """
+
+    minimum, maximum, where, floor = lib
+    length1, short1, grams1 = side1
+    length2, short2, grams2 = side2
+
+    def score(ratio):
+        # Scores are ratios rounded to integers, halves rounded up here.
+        return floor(100 * ratio + .5 + _EPSILON)
+
+    total = length1 + length2
+    full = minimum(2 * overlap / total,
+                   1 - maximum(maximum(grams1, grams2) - shared, 0) / 2 / total)
+    if method in ('ratio', 'token_sort_ratio'):
+        return score(full)
+
+    shortest = minimum(short1, short2)
+    capped = minimum(overlap, shortest)
+    partial = 2 * capped / (capped + shortest)
+    if method == 'token_set_ratio':
+        return score(partial)
+
+    # The best substring is at most as long as the shorter string.
+    window = 4 * minimum(length1, length2)
+    partial = minimum(partial, 1 - maximum(minimum(grams1, grams2) - shared,
+                                           0) / window)
+    if method == 'partial_ratio':
+        return score(partial)
+
+    low, high = minimum(length1, length2), maximum(length1, length2)
+    similar = high < 1.5 * low
+    scale = where(similar, .95, where(high > 8 * low, .6, .9))
+
+    # Token ratios of strings of similar lengths are only bounded by their
+    # characters. Strings of different lengths sharing a word may get the
+    # partial token set ratio of 100, whatever their characters; without
+    # a common word, it is bounded like partial_ratio.
+    tokens = 2 * capped / (capped + shortest)
+    partial = where(similar, tokens, partial)
+    words = where(similar, 0, where(common, 95 * scale, 0))
+
+    return maximum(maximum(score(full), scale * score(partial)), words)
+
+
+def _python_where(condition, value1, value2):
+    return value1 if condition else value2
+
+
+_python_lib = (min, max, _python_where, math.floor)
+
+
+def _unique(strings):
+    """Return list of unique strings and lists of their positions."""
+
+    positions = {}
+    for i, string in enumerate(strings):
+        positions.setdefault(string, []).append(i)
+
+    return list(positions), list(positions.values())
+
+
+def _python_candidates(profiles1, profiles2, method, minimum):
+    def side(profile):
+        return profile[1], profile[2], sum(profile[4].values())
+
+    sides2 = [side(x) for x in profiles2]
+
+    for i, profile1 in enumerate(profiles1):
+        side1 = side(profile1)
+        for j, profile2 in enumerate(profiles2):
+            overlap = sum((profile1[3] & profile2[3]).values())
+            shared = sum((profile1[4] & profile2[4]).values())
+            common = not profile1[5].isdisjoint(profile2[5])
+            if _bounds(method, overlap, shared, side1, sides2[j],
+                       _python_lib, common) >= minimum:
+                yield i, j
+
+
+def _features(counter):
+    """
+    Return set of elements of the Counter numbered by their occurrence,
+    e.g. {('a', 1), ('a', 2), ('b', 1)} for the characters of 'aba'. The
+    size of the intersection of two such sets is the size of the
+    intersection of the Counters.
+    """
+
+    return {(x, k) for x, count in counter.items()
+            for k in range(1, count + 1)}
+
+
+def _overlap_matrices(counters1, counters2):
+    """
+    Return two float matrices whose product gives sizes of intersections
+    of counters1[i] and counters2[j].
+    """
+
+    features1 = [_features(x) for x in counters1]
+    features2 = [_features(x) for x in counters2]
+
+    # Features of only one side don't add to any intersection.
+    shared = set().union(*features1) & set().union(*features2)
+    columns = {feature: k for k, feature in enumerate(shared)}
+
+    def matrix(features):
+        result = np.zeros((len(features), len(columns)), dtype=np.float32)
+        for i, row in enumerate(features):
+            result[i, [columns[x] for x in row if x in columns]] = 1
+        return result
+
+    return matrix(features1), matrix(features2).T
+
+
+def _numpy_candidates(profiles1, profiles2, method, minimum):
+    chars1, chars2 = _overlap_matrices([x[3] for x in profiles1],
+                                       [x[3] for x in profiles2])
+
+    # Few pairs are left to count shared bigrams of, which are few too.
+    grams1 = [_features(x[4]) for x in profiles1]
+    grams2 = [_features(x[4]) for x in profiles2]
+
+    def side(profiles):
+        return tuple(np.array(values, dtype=np.float32) for values in (
+            [x[1] for x in profiles], [x[2] for x in profiles],
+            [sum(x[4].values()) for x in profiles]))
+
+    side1, side2 = side(profiles1), side(profiles2)
+    short1, short2 = side1[1][:, None], side2[1]
+
+    # Every bound is at most 2 * overlap / (overlap + shortest), which
+    # first selects pairs that are bounded precisely. For uwratio, strings
+    # of different lengths may also pass by sharing a word, found with an
+    # inverted index of the words of profiles2.
+    ratio = max(0., (minimum - .5 - _EPSILON) / 100)
+    factor = ratio / (2 - ratio) - _EPSILON
+    words = method == 'uwratio' and minimum <= 95 * .9
+    length1, length2 = side1[0][:, None], side2[0]
+
+    postings = {}
+    if words:
+        for j, profile in enumerate(profiles2):
+            for word in profile[5]:
+                postings.setdefault(word, []).append(j)
+
+    lib = (np.minimum, np.maximum, np.where, np.floor)
+    rows = max(1, _BLOCK // max(1, len(profiles2)))
+
+    for start in range(0, len(profiles1), rows):
+        stop = start + rows
+        overlap = chars1[start:stop] @ chars2
+        selected = overlap >= factor * np.minimum(short1[start:stop], short2)
+
+        common = np.zeros(selected.shape, dtype=bool)
+        for k, profile in enumerate(profiles1[start:stop]):
+            for word in profile[5]:
+                positions = postings.get(word)
+                if positions:
+                    common[k, positions] = True
+        if words:
+            low = np.minimum(length1[start:stop], length2)
+            high = np.maximum(length1[start:stop], length2)
+            selected |= common & (high >= 1.5 * low)
+
+        selected_rows, selected_columns = np.nonzero(selected)
+        overlap = overlap[selected_rows, selected_columns]
+        common = common[selected_rows, selected_columns]
+        selected_rows += start
+
+        shared = np.fromiter(
+            (len(grams1[i] & grams2[j]) for i, j in
+             zip(selected_rows.tolist(), selected_columns.tolist())),
+            dtype=np.float32, count=len(selected_rows))
+
+        bounds = _bounds(method, overlap, shared,
+                         tuple(x[selected_rows] for x in side1),
+                         tuple(x[selected_columns] for x in side2), lib,
+                         common)
+        passed = bounds >= minimum
+
+        yield from zip(selected_rows[passed].tolist(),
+                       selected_columns[passed].tolist())
+
+
+def _candidates(profiles1, profiles2, method, minimum):
+    """
+    Yield pairs of positions of the profiles whose score may reach the
+    minimum.
+    """
+
+    if minimum <= 0:
+        yield from ((i, j) for i in range(len(profiles1))
+                    for j in range(len(profiles2)))
+        return
+
+    # Strings with nothing to compare are left to the exact comparison.
+    empty1 = [i for i, x in enumerate(profiles1) if not x[1]]
+    empty2 = [j for j, x in enumerate(profiles2) if not x[1]]
+
+    yield from ((i, j) for i in empty1 for j in range(len(profiles2)))
+    yield from ((i, j) for j in empty2 for i in range(len(profiles1))
+                if profiles1[i][1])
+
+    rows1 = [i for i, x in enumerate(profiles1) if x[1]]
+    rows2 = [j for j, x in enumerate(profiles2) if x[1]]
+    if not rows1 or not rows2:
+        return
+
+    profiles1 = [profiles1[i] for i in rows1]
+    profiles2 = [profiles2[j] for j in rows2]
+
+    func = _python_candidates if np is None else _numpy_candidates
+    for i, j in func(profiles1, profiles2, method, minimum):
+        yield rows1[i], rows2[j]
+
+
+def _abbreviations(strings1, strings2, digits1, digits2):
+    """
+    Yield pairs of positions of strings without digits, one of which is an
+    abbreviation of the other.
+    """
+
+    index = AcronymIndex(x for x, digits in zip(strings2, digits2)
+                         if not digits)
+    positions = [j for j, digits in enumerate(digits2) if not digits]
+
+    for i, string in enumerate(strings1):
+        if not digits1[i]:
+            for j in index.find(string):
+                yield i, positions[j]
+
+
+def similar_pairs(strings1, strings2, method, tolerances, scorer):
+    """
+    Return sorted list of pairs of positions (i, j) of strings1[i] and
+    strings2[j] matching like in MatchBlock.compare_strings.
+
+    :param strings1: sequence of str
+    :param strings2: sequence of str
+    :param method: str, name of the method of the scorer
+    :param tolerances: tuple of tolerances of strings and strings with
+                       numbers
+    :param scorer: Scorer
+    :rtype: list
+    """
+
+    unique1, positions1 = _unique(strings1)
+    unique2, positions2 = _unique(strings2)
+
+    digits1 = [any(char.isdigit() for char in x) for x in unique1]
+    digits2 = [any(char.isdigit() for char in x) for x in unique2]
+
+    score = getattr(scorer, method)
+
+    matched = set(_abbreviations(unique1, unique2, digits1, digits2))
+
+    # Scores are integers: uwratio rounds the best of its weighted scores,
+    # which has to be at least the lowest passing score minus a half.
+    minimum = math.ceil(100 - max(tolerances)) - .5 - _EPSILON
+    profiles1 = [_profile(x, method) for x in unique1]
+    profiles2 = [_profile(x, method) for x in unique2]
+
+    for i, j in _candidates(profiles1, profiles2, method, minimum):
+        if (i, j) in matched:
+            continue
+        tolerance = tolerances[digits1[i] or digits2[j]]
+        if score(unique1[i], unique2[j]) >= 100 - tolerance:
+            matched.add((i, j))
+
+    return sorted((x, y) for i, j in matched
+                  for x in positions1[i] for y in positions2[j])
@@ -0,0 +1,189 @@
+import math
+
+from . import _geo
+from ._matchblock import MatchBlock
+
+__all__ = ['SpatialIndex']
+
+# Slightly less than the smallest radius of curvature of the WGS-84
+# ellipsoid (meridional, at the equator) in kilometers. The normals of two
+# points a distance d apart on the ellipsoid, or on the sphere used by the
+# great circle formula, differ by at most d / _MIN_RADIUS radians, so grid
+# searches based on it never miss a point.
+_MIN_RADIUS = 6335.
+
+# Relative margin added to search radii to absorb float rounding.
+_EPSILON = 1e-9
+
+
+def _unit_vector(coords):
+    """Return the normal of the WGS-84 ellipsoid at the coordinates."""
+
+    lat, lng = math.radians(coords[0]), math.radians(coords[1])
+    return (math.cos(lat) * math.cos(lng), math.cos(lat) * math.sin(lng),
+            math.sin(lat))
+
+
+def _chord(distance):
+    """
+    Return the largest distance in kilometers between the normals of two
+    points the distance (in kilometers) apart. Return None if it covers the
+    whole sphere.
+    """
+
+    angle = distance / _MIN_RADIUS
+    if angle >= math.pi:
+        return None
+
+    return 2 * math.sin(angle / 2) * (1 + _EPSILON) + _EPSILON
+
+
+def grid_cell(coords, cell_size):
+    """
+    Return the cell of a grid with cells cell_size kilometers wide,
+    containing the coordinates.
+
+    :param coords: pair of coordinates - a tuple of two numbers
+    :param cell_size: number
+    :rtype: tuple
+    """
+
+    size = _chord(cell_size) or 2.
+    return tuple(math.floor(x / size) for x in _unit_vector(coords))
+
+
+def _grid_ranges(coords, radius, cell_size):
+    """
+    Return ranges of cell numbers along every axis of a grid with cells
+    cell_size kilometers wide that can contain points within the radius (in
+    kilometers) from the coordinates. Return None if the radius covers the
+    whole earth.
+    """
+
+    size, chord = _chord(cell_size) or 2., _chord(radius)
+    if chord is None:
+        return None
+
+    return [range(math.floor((x - chord) / size),
+                  math.floor((x + chord) / size) + 1)
+            for x in _unit_vector(coords)]
+
+
+def grid_cells(coords, radius, cell_size):
+    """
+    Return cells of a grid with cells cell_size kilometers wide that can
+    contain points within the radius (in kilometers) from the coordinates.
+
+    Return None if the radius covers the whole earth.
+
+    :param coords: pair of coordinates - a tuple of two numbers
+    :param radius: number
+    :param cell_size: number
+    :rtype: list
+    """
+
+    ranges = _grid_ranges(coords, radius, cell_size)
+    if ranges is None:
+        return None
+
+    return [(x, y, z) for x in ranges[0] for y in ranges[1] for z in ranges[2]]
+
+
+class SpatialIndex:
+    """
+    Grid index over pairs of coordinates.
+
+    The coordinates are mapped onto the unit sphere and stored in cubic
+    cells about cell_size wide, so looking up the points within a radius
+    only visits the few cells around the searched point.
+
+    None values (e.g. coordinates of MatchBlock objects without any) are
+    skipped, but still count towards positions returned by the queries.
+
+    :param coordinates: sequence of pairs of coordinates
+    :param cell_size: number, best set to the radius used in queries
+    :param unit: str, one of: 'kilometers', 'km', 'meters',
+                              'm', 'miles', 'mi', 'feet',
+                              'ft', 'nautical', 'nm'
+
+    :Example:
+
+    >>> index = SpatialIndex([(55.75222, 37.61556), (59.93863, 30.31413)],
+    ...                      cell_size=650)
+    >>> index.query((55.75222, 37.61556), 650)
+    [0, 1]
+    """
+
+    def __init__(self, coordinates, cell_size=1, unit='km'):
+        if cell_size <= 0:
+            raise ValueError('cell_size must be higher than 0')
+
+        self._coordinates = list(coordinates)
+        self._cell_size = cell_size / _geo.unit_factor(unit)
+        self._cells = {}
+
+        for i, coords in enumerate(self._coordinates):
+            if coords is not None:
+                self._cells.setdefault(
+                    grid_cell(coords, self._cell_size), []).append(i)
+
+    @classmethod
+    def from_blocks(cls, blocks, cell_size=1, unit='km'):
+        """
+        Build index over coordinates of MatchBlock objects.
+
+        :param blocks: sequence of MatchBlock objects
+        :param cell_size: number
+        :param unit: str
+        :rtype: SpatialIndex
+        """
+
+        return cls((x.coordinates for x in blocks), cell_size=cell_size,
+                   unit=unit)
+
+    def __len__(self):
+        return len(self._coordinates)
+
+    def candidates(self, coords, radius, unit='km'):
+        """
+        Return sorted positions of points which can be within the radius
+        from the coordinates. Points within the radius are always included,
+        some further ones usually too.
+
+        :param coords: pair of coordinates - a tuple of two numbers
+        :param radius: number
+        :param unit: str
+        :rtype: list
+        """
+
+        radius = radius / _geo.unit_factor(unit)
+        ranges = _grid_ranges(coords, radius, self._cell_size)
+
+        if ranges is None:
+            return [i for i, x in enumerate(self._coordinates)
+                    if x is not None]
+
+        if len(ranges[0]) * len(ranges[1]) * len(ranges[2]) > len(self._cells):
+            cells = [x for x in self._cells
+                     if all(y in z for y, z in zip(x, ranges))]
+        else:
+            cells = [(x, y, z) for x in ranges[0] for y in ranges[1]
+                     for z in ranges[2]]
+
+        return sorted(i for cell in cells for i in self._cells.get(cell, ()))
+
+    def query(self, coords, radius, unit='km'):
+        """
+        Return sorted positions of points within the radius from the
+        coordinates, measured like in MatchBlock.compare_coordinates.
+
+        :param coords: pair of coordinates - a tuple of two numbers
+        :param radius: number
+        :param unit: str
+        :rtype: list
+        """
+
+        return [i for i in self.candidates(coords, radius, unit=unit)
+                if MatchBlock.compare_coordinates(
+                    coords, self._coordinates[i], tolerance=radius,
+                    unit=unit)]
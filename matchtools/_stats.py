@@ -0,0 +1,78 @@
+import threading
+
+__all__ = ['MatchStats']
+
+
+class MatchStats:
+    """
+    Counters of calls, total time, cache hits and rejections, by name.
+
+    MatchBlock.stats records every extraction stage run by MatchBlock
+    objects (extract_coordinates, extract_dates, roman_to_integers,
+    extract_str_number, extract_str_custom) and every comparison run by ==
+    (compare_numbers, compare_dates, compare_coordinates and compare_strings
+    for every kind of string, e.g. 'compare_strings[str_number]').
+    For extract_dates, hits count dates found without datefinder, by the
+    fast path or in the cache. For comparisons, rejections count pairs
+    found not to match.
+
+    Recording is disabled by default and then costs a single attribute
+    check per stage or comparison.
+
+    :param enabled: bool
+
+    :Example:
+
+    >>> MatchBlock.stats.enabled = True
+    >>> MatchBlock('Flight 1') == MatchBlock('Flight 2')
+    False
+    >>> counters = MatchBlock.stats.snapshot()['compare_strings[str_number]']
+    >>> counters['calls'], counters['rejections']
+    (1, 1)
+    """
+
+    _fields = ('calls', 'time', 'hits', 'rejections')
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, name, seconds, hit=False, rejected=False):
+        """
+        Count a call, its time in seconds and whether it was a cache hit or
+        a rejection.
+        """
+
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = [0, 0.0, 0, 0]
+
+            counter[0] += 1
+            counter[1] += seconds
+            counter[2] += hit
+            counter[3] += rejected
+
+    def snapshot(self):
+        """
+        Return copy of the counters: dict of names and dicts of calls, time
+        (in seconds), hits and rejections.
+
+        :rtype: dict
+        """
+
+        with self._lock:
+            return {name: dict(zip(self._fields, counter))
+                    for name, counter in self._counters.items()}
+
+    def reset(self):
+        """Set all counters to zero."""
+
+        with self._lock:
+            self._counters.clear()
+
+    def __repr__(self):
+        return '<{} object at {}: {}>'.format(
+            type(self).__name__, hex(id(self)),
+            'enabled' if self.enabled else 'disabled')
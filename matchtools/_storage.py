@@ -0,0 +1,208 @@
+import json
+import pickle
+import struct
+
+from ._matchblock import MatchBlock
+
+# First bytes of every file of a saved corpus.
+MAGIC = b'MTPREP'
+
+# Version of the layout of the files, increased whenever it changes.
+FORMAT_VERSION = 1
+
+# Options of MatchBlock deciding what is extracted, all True by default.
+PARSE_FLAGS = ('try_date', 'try_coordinates', 'try_str_number',
+               'try_str_custom', 'convert_roman')
+
+_HEADER = struct.Struct('<HI')
+
+# Keys of parse_signature a file must agree on to be loaded, and their names.
+_CHECKED = (('flags', 'parse flags'),
+            ('dictionary_fingerprint', 'dictionary'),
+            ('date_formats', 'date formats'))
+
+
+def parse_signature(options):
+    """
+    Return dict describing how MatchBlock parses values with the options:
+    the parse flags, the dictionary (its path, if given as one, and the
+    fingerprint of its contents) and the date formats recognized first.
+
+    :param options: dict, keyword arguments of MatchBlock
+    :rtype: dict
+    """
+
+    dictionary = options.get('dictionary')
+
+    return {
+        'flags': {x: bool(options.get(x, True)) for x in PARSE_FLAGS},
+        'dictionary': dictionary if isinstance(dictionary, str) else None,
+        'dictionary_fingerprint':
+            MatchBlock._load_dictionary(dictionary).fingerprint,
+        'date_formats': list(MatchBlock.date_formats),
+    }
+
+
+def check_signature(header, options):
+    """
+    Return the options to parse values with, those of the header (storing
+    parse_signature) if options are empty.
+
+    Raise ValueError if the header was written with other parse flags,
+    dictionary or date formats than options and MatchBlock would use.
+
+    :param header: dict
+    :param options: dict, keyword arguments of MatchBlock
+    :rtype: dict
+    """
+
+    if not options:
+        options = dict(header['flags'])
+        if header['dictionary'] is not None:
+            options['dictionary'] = header['dictionary']
+
+    # Dictionaries are compared by contents, whatever their paths.
+    signature = parse_signature(options)
+    for key, name in _CHECKED:
+        if header[key] != signature[key]:
+            msg = 'stale file, parsed with other {}: parse the rows again'
+            raise ValueError(msg.format(name))
+
+    return options
+
+
+def _columns(prepared):
+    """
+    Return lengths of the rows and the six attributes of all their blocks,
+    attribute by attribute, equal strings, dates and coordinates being
+    stored only once.
+    """
+
+    lengths = []
+    columns = tuple([] for _ in range(6))
+    interned = tuple({} for _ in range(6))
+
+    for element in prepared:
+        lengths.append(len(element.blocks))
+        for block in element.blocks:
+            attributes = block._attributes
+
+            # Numbers aren't interned, as 1 == 1.0.
+            columns[0].append(attributes[0])
+            for k in range(1, 6):
+                value = attributes[k]
+                columns[k].append(interned[k].setdefault(value, value))
+
+    return lengths, columns
+
+
+def _blocks(attributes, count):
+    """
+    Return tuple of count MatchBlock objects with the next stored attributes
+    of the iterator, tuples of the attribute columns of the blocks.
+    """
+
+    new = MatchBlock.__new__
+
+    blocks = []
+    for _ in range(count):
+        block = new(MatchBlock)
+        (block._number, block._date, block._coordinates, block._string,
+         block._str_number, block._str_custom) = next(attributes)
+        block._pending = None
+        blocks.append(block)
+
+    return tuple(blocks)
+
+
+def _open(file, mode):
+    """Return file object and whether it has to be closed."""
+
+    if hasattr(file, 'read' if mode == 'rb' else 'write'):
+        return file, False
+    return open(file, mode), True
+
+
+def save_prepared(corpus, file):
+    """
+    Write the rows and parsed blocks of the PreparedRows corpus to a file.
+
+    The file starts with MAGIC, FORMAT_VERSION and the length of a JSON
+    header storing parse_signature of the options of the corpus and the
+    number of rows, followed by the pickled rows and attribute columns.
+
+    :param corpus: PreparedRows
+    :param file: str, path, or binary file object
+    """
+
+    lengths, columns = _columns(corpus)
+
+    header = dict(parse_signature(corpus.options), rows=len(lengths))
+    header = json.dumps(header, sort_keys=True).encode('utf-8')
+
+    body = ([x.row for x in corpus], lengths, columns)
+
+    f, close = _open(file, 'wb')
+    try:
+        f.write(MAGIC + _HEADER.pack(FORMAT_VERSION, len(header)) + header)
+        pickle.dump(body, f, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        if close:
+            f.close()
+
+
+def _read_header(f):
+    start = f.read(len(MAGIC) + _HEADER.size)
+    if len(start) < len(MAGIC) + _HEADER.size or \
+            not start.startswith(MAGIC):
+        raise ValueError('not a file of a saved PreparedRows corpus')
+
+    version, size = _HEADER.unpack(start[len(MAGIC):])
+    if version != FORMAT_VERSION:
+        msg = 'unsupported format version {} of the file, expected {}'
+        raise ValueError(msg.format(version, FORMAT_VERSION))
+
+    try:
+        return json.loads(f.read(size).decode('utf-8'))
+    except ValueError:
+        raise ValueError('corrupted header of the file') from None
+
+
+def load_prepared(file, options):
+    """
+    Return the rows, the numbers of blocks of every row, the attribute
+    columns of the blocks (see _blocks) and the options of a corpus saved
+    by save_prepared.
+
+    Options passed are compared with the ones the file was parsed with,
+    which are used when options are empty. Raise ValueError if the file
+    was parsed with different flags, dictionary or date formats, i.e. it
+    is stale.
+
+    :param file: str, path, or binary file object
+    :param options: dict, keyword arguments of MatchBlock
+    :rtype: tuple
+    """
+
+    f, close = _open(file, 'rb')
+    try:
+        header = _read_header(f)
+
+        options = check_signature(header, options)
+
+        # Unpickling corrupted data can raise about any exception.
+        try:
+            rows, lengths, columns = pickle.load(f)
+            cells = sum(lengths)
+            valid = len(rows) == len(lengths) == header['rows'] and \
+                len(columns) == 6 and all(len(x) == cells for x in columns)
+        except Exception:
+            valid = False
+    finally:
+        if close:
+            f.close()
+
+    if not valid:
+        raise ValueError('truncated or corrupted file')
+
+    return rows, lengths, columns, options
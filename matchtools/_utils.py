@@ -1,11 +1,17 @@
+import heapq
 import re
 import warnings
 from functools import partial
 
+from ._columnar import ColumnStore
 from ._matchblock import MatchBlock
+from ._matchindex import MatchIndex
+from ._parallel import find_all_parallel, _workers_count
+from ._prepared import (PreparedRow, PreparedRows, _LazyRow, _as_prepared,
+                        _rows_match)
 
 __all__ = ['return_element', 'match_rows', 'match_find', 'match_find_all',
-           'move_element_to_front', 'move_element_to_back']
+           'match_top_k', 'move_element_to_front', 'move_element_to_back']
 
 
 def return_element(word, element):
@@ -89,15 +95,20 @@ def move_element(word, element, where):
     return ' '.join(moved)
 
 
-def match_rows(row1, row2):
+def match_rows(row1, row2, config=None):
     """
     Compare rows by transforming each pair of values into MatchBlock objects
     and perform equality check on them.
 
     The rows are considered to match if all checks result in True.
 
-    :param row1: list, tuple
-    :param row2: list, tuple
+    A PreparedRow can be used in place of either row, its MatchBlock objects
+    are compared without parsing the row again. Values of plain rows are
+    parsed one pair at a time, until a pair doesn't match.
+
+    :param row1: list, tuple, PreparedRow
+    :param row2: list, tuple, PreparedRow
+    :param config: MatchConfig, None to use the tolerances set on MatchBlock
     :rtype: bool
 
     :Example:
@@ -113,18 +124,22 @@ def match_rows(row1, row2):
     False
     """
 
-    if len(row1) != len(row2):
-        return False
-
-    return all(MatchBlock(x) == MatchBlock(y) for x, y in zip(row1, row2))
+    return _rows_match(row1, row2, config)
 
 
-def match_find(row, rows):
+def match_find(row, rows, config=None):
     """
     Search list of rows and return first successful match with the input row.
 
-    :param row: list, tuple
-    :param rows: nested list, nested tuple
+    Every value of the input row is parsed at most once, when it is first
+    compared. Rows of a PreparedRows corpus are not
+    parsed at all and if rows is a MatchIndex or a ColumnStore, only its
+    candidate rows are compared.
+
+    :param row: list, tuple, PreparedRow
+    :param rows: nested list, nested tuple, PreparedRows, MatchIndex or
+        ColumnStore
+    :param config: MatchConfig, None to use the tolerances set on MatchBlock
     :rtype: list
 
     :Example:
@@ -135,17 +150,35 @@ def match_find(row, rows):
     ['Flight 3', 100]
     """
 
+    if isinstance(rows, (MatchIndex, PreparedRows, ColumnStore)):
+        return rows.find(row, config)
+
+    if not isinstance(row, PreparedRow):
+        row = _LazyRow(row)
+
     for element in rows:
-        if match_rows(row, element):
+        if _rows_match(row, element, config):
             return element
 
 
-def match_find_all(row, rows):
+def match_find_all(row, rows, workers=1, config=None):
     """
     Search list of rows and return all successful matches with the input row.
 
-    :param row: list, tuple
-    :param rows: nested list, nested tuple
+    Every value of the input row is parsed at most once, when it is first
+    compared. Rows of a PreparedRows corpus are not
+    parsed at all and if rows is a MatchIndex or a ColumnStore, only its
+    candidate rows are compared.
+
+    With more than one worker, rows (unless a MatchIndex or a ColumnStore)
+    are split into chunks compared in a pool of processes. The matches are
+    returned in the order of rows.
+
+    :param row: list, tuple, PreparedRow
+    :param rows: nested list, nested tuple, PreparedRows, MatchIndex or
+        ColumnStore
+    :param workers: int, number of processes, None to use all CPUs
+    :param config: MatchConfig, None to use the tolerances set on MatchBlock
     :rtype: list
 
     :Example:
@@ -156,7 +189,119 @@ def match_find_all(row, rows):
     [['Flight 2', 100], ['Flight 2', 100]]
     """
 
-    return [element for element in rows if match_rows(row, element)]
+    if not isinstance(rows, (MatchIndex, ColumnStore)) and \
+            _workers_count(workers) > 1:
+        return find_all_parallel(row, rows, _workers_count(workers), config)
+
+    if isinstance(rows, (MatchIndex, PreparedRows, ColumnStore)):
+        return rows.find_all(row, config)
+
+    if not isinstance(row, PreparedRow):
+        row = _LazyRow(row)
+
+    return [element for element in rows if _rows_match(row, element, config)]
+
+
+def _score_rows(blocks1, blocks2, minimum=None):
+    """
+    Return similarity of rows of MatchBlock objects: the mean similarity of
+    attributes found in either row (see MatchBlock.score).
+
+    Attributes are scored from the cheapest one. Return None as soon as the
+    similarity can't be higher than minimum, or if the rows are of different
+    lengths.
+    """
+
+    if len(blocks1) != len(blocks2):
+        return None
+
+    null = MatchBlock._null
+    pending, count = [], 0
+
+    for block1, block2 in zip(blocks1, blocks2):
+        for i, (attr1, attr2) in enumerate(
+                zip(block1._attributes, block2._attributes)):
+            null1, null2 = attr1 in null, attr2 in null
+            if null1 and null2:
+                continue
+            count += 1
+            if not (null1 or null2):
+                pending.append((i, attr1, attr2))
+
+    if not count:
+        return None if minimum is not None and minimum >= 100 else 100.0
+
+    costs = MatchBlock.comparison_costs
+    pending.sort(key=lambda x: costs[x[0]])
+
+    total, remaining = 0, len(pending)
+    for i, attr1, attr2 in pending:
+        if minimum is not None and (total + 100 * remaining) / count <= minimum:
+            return None
+        total += MatchBlock._score_attribute(i, attr1, attr2)
+        remaining -= 1
+
+    score = total / count
+    if minimum is not None and score <= minimum:
+        return None
+
+    return score
+
+
+def match_top_k(row, rows, k=1):
+    """
+    Search list of rows and return k rows most similar to the input row,
+    with their similarity.
+
+    Return list of (score, row) tuples, from the most similar row, rows of
+    equal scores in their order. The score of two rows, from 0 to 100, is
+    the mean similarity of attributes of their MatchBlock objects (see
+    MatchBlock.score), tolerances are not used. Rows of different lengths
+    are skipped.
+
+    Scoring of a row stops as soon as it can no longer enter the k best
+    rows, cheap attributes (numbers, dates) being scored before strings and
+    coordinates.
+
+    :param row: list, tuple, PreparedRow
+    :param rows: nested list, nested tuple, PreparedRows, MatchIndex or
+        ColumnStore
+    :param k: int
+    :rtype: list
+
+    :Example:
+
+    >>> row = ['Flight 2', 100]
+    >>> rows = [['Flight 1', 100], ['Flight 2', 103], ['Flight 3', 200]]
+    >>> match_top_k(row, rows, k=2)
+    [(75.0, ['Flight 2', 103]), (66.66666666666667, ['Flight 1', 100])]
+    """
+
+    if k < 1:
+        raise ValueError('k must be higher than 0')
+
+    if isinstance(rows, MatchIndex):
+        rows = rows._prepared
+
+    prepared = isinstance(rows, (PreparedRows, ColumnStore))
+    blocks = (rows.prepare(row) if prepared else _as_prepared(row)).blocks
+
+    # Min-heap of the best rows found so far, earlier rows winning ties.
+    best = []
+    for position, element in enumerate(rows):
+        minimum = best[0][0] if len(best) == k else None
+        score = _score_rows(blocks, _as_prepared(element).blocks, minimum)
+        if score is None:
+            continue
+
+        item = (score, -position, element.row if prepared else element)
+        if len(best) < k:
+            heapq.heappush(best, item)
+        else:
+            heapq.heapreplace(best, item)
+
+    best.sort(reverse=True)
+    return [(score, element) for score, _, element in best]
 
 
 move_element_to_front = partial(move_element, where='front')
@@ -13,6 +13,7 @@ setup(
     package_data={'': ['*.json']},
     include_package_data=True,
     install_requires=['datefinder', 'fuzzywuzzy', 'geopy', 'roman'],
+    extras_require={'numpy': ['numpy']},
     zip_safe=False,
     classifiers=[
         'Development Status :: 5 - Production/Stable',
@@ -0,0 +1,55 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import AcronymIndex, MatchBlock
+from matchtools._acronyms import abbreviation_keys, keys_match
+
+
+class TestAcronyms(unittest.TestCase):
+    strings = ['Federal Bureau of Investigation', 'FBI', ' fbi ', 'Bureau',
+               'The Beatles', 'tb', 'Flight Bureau Inc', '', 'the a']
+
+    def test_abbreviation_keys_pass_1(self):
+        self.assertEqual(abbreviation_keys(' Federal Bureau of Investigation'),
+                         ('federal bureau of investigation', 'fbi'))
+        self.assertEqual(abbreviation_keys('FBI '), ('fbi', None))
+        self.assertEqual(abbreviation_keys('the a'), ('the a', ''))
+
+    def test_keys_match_pass_1(self):
+        for string1 in self.strings:
+            for string2 in self.strings:
+                self.assertEqual(
+                    keys_match(abbreviation_keys(string1),
+                               abbreviation_keys(string2)),
+                    MatchBlock.is_abbreviation(string1, string2))
+
+    def test_acronym_index_pass_1(self):
+        index = AcronymIndex(self.strings)
+        self.assertEqual(len(index), len(self.strings))
+
+        self.assertEqual(index.find('fbi'), [0, 6])
+        self.assertEqual(index.find('Federal Bureau of Investigation'),
+                         [1, 2])
+        self.assertEqual(index.find('The Beatles'), [])
+        self.assertEqual(index.find('b'), [4])
+        self.assertEqual(index.find(''), [8])
+        self.assertEqual(index.find('Bureau'), [])
+
+    def test_acronym_index_pass_2(self):
+        index = AcronymIndex()
+        self.assertEqual(index.add('FBI'), 0)
+        self.assertEqual(index.add('Federal Bureau of Investigation'), 1)
+
+        for string in self.strings:
+            expected = [i for i, x in enumerate(['FBI', 'Federal Bureau of '
+                                                 'Investigation'])
+                        if MatchBlock.is_abbreviation(string, x)]
+            self.assertEqual(index.find(string), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
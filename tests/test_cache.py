@@ -0,0 +1,71 @@
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools._cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_lru_cache_pass_1(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), {'hits': 3, 'misses': 1,
+                                        'evictions': 1, 'size': 2,
+                                        'maxsize': 2, 'enabled': True})
+
+    def test_lru_cache_pass_2(self):
+        cache = LRUCache(maxsize=None)
+        for i in range(100):
+            cache.put(i, i)
+        self.assertEqual(len(cache), 100)
+
+        cache.maxsize = 10
+        self.assertEqual(len(cache), 10)
+        self.assertIn(99, cache)
+        self.assertNotIn(0, cache)
+
+    def test_lru_cache_pass_3(self):
+        cache = LRUCache(enabled=False)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a', 'default'), 'default')
+        self.assertEqual(len(cache), 0)
+
+        cache = LRUCache(maxsize=0)
+        cache.put('a', 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_cache_pass_4(self):
+        cache = LRUCache()
+        cache.put('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_lru_cache_pass_5(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+
+        copy = pickle.loads(pickle.dumps(cache))
+        copy.put('b', 2)
+        copy.put('c', 3)
+        self.assertEqual((copy.get('a'), copy.get('c')), (None, 3))
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_lru_cache_fail_1(self):
+        self.assertRaises(ValueError, LRUCache, maxsize=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
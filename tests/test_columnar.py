@@ -0,0 +1,126 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import (ColumnStore, MatchBlock, MatchConfig, MatchIndex,
+                        PreparedRows, match_find, match_find_all,
+                        match_tables, match_top_k)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestColumnStore(unittest.TestCase):
+    rows = [['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'],
+            ['Flight 12', 102.5, '41.491, -71.312', '11-Dec-2015'],
+            ['Flight 1', 100, '41.49, -71.312', '1 May 2015, 2 May 2015'],
+            ['N Road XII', 2 ** 70, '', 'FBI'],
+            ['Flight 1', '2015-05-01T10:00:00+02:00'],
+            ['Flight 1', 100]]
+
+    queries = [['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'],
+               ['Flight 12', 101, '41.49, -71.312', '10-Dec-2015'],
+               ['Flight 1', 101, '41.49, -71.31', '2 May 2015, 3 May 2015'],
+               ['north road 12', 2 ** 70, '',
+                'Federal Bureau of Investigation'],
+               ['Flight 1', '2015-05-01T09:00:00+01:00'],
+               ['Flight 2', 100]]
+
+    configs = [MatchConfig(),
+               MatchConfig(number_tolerance=3, date_tolerance=1,
+                           coordinates_tolerance=1, str_number_tolerance=40)]
+
+    def setUp(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.date_tolerance = 0
+        MatchBlock.coordinates_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'store')
+        self.prepared = PreparedRows(self.rows)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_column_store_pass_1(self):
+        store = ColumnStore.create(self.rows, self.path)
+        self.assertEqual(len(store), len(self.rows))
+        self.assertEqual(store.rows, self.rows)
+
+        for element1, element2 in zip(self.prepared, store):
+            self.assertEqual(element1.row, element2.row)
+            self.assertEqual([x._attributes for x in element1.blocks],
+                             [x._attributes for x in element2.blocks])
+
+        self.assertEqual(store[-1].row, self.rows[-1])
+        self.assertRaises(IndexError, store.__getitem__, len(self.rows))
+
+    def test_column_store_pass_2(self):
+        ColumnStore.create(self.prepared, self.path)
+        store = ColumnStore(self.path)
+
+        for config in self.configs:
+            for row in self.queries + self.rows:
+                self.assertEqual(store.find_all(row, config),
+                                 self.prepared.find_all(row, config))
+                self.assertEqual(store.find(row, config),
+                                 self.prepared.find(row, config))
+
+    def test_column_store_pass_3(self):
+        store = ColumnStore.create(self.rows, self.path)
+        row = self.queries[0]
+
+        with mock.patch.object(store, '_blocks',
+                               wraps=store._blocks) as blocks:
+            self.assertEqual(match_find_all(row, store, workers=2),
+                             [self.rows[0]])
+            self.assertEqual(blocks.call_count, 1)
+
+        self.assertEqual(match_find(row, store), self.rows[0])
+        self.assertEqual(MatchIndex(store).find_all(row), [self.rows[0]])
+        self.assertEqual(match_top_k(row, store, k=2),
+                         match_top_k(row, self.prepared, k=2))
+
+    def test_column_store_pass_4(self):
+        store = ColumnStore.create(self.rows, self.path, try_date=False)
+
+        unpickled = pickle.loads(pickle.dumps(store))
+        self.assertEqual(unpickled.path, self.path)
+        self.assertEqual(unpickled.options, store.options)
+        self.assertEqual(unpickled.rows, self.rows)
+        self.assertEqual(unpickled[0].blocks[3].date, [])
+
+        config = self.configs[1]
+        self.assertEqual(
+            match_tables(self.queries, store, workers=2, config=config),
+            match_tables(self.queries, self.rows, config=config,
+                         try_date=False))
+
+    def test_column_store_fail_1(self):
+        ColumnStore.create(self.rows, self.path, convert_roman=False)
+
+        self.assertIs(ColumnStore(self.path).options['convert_roman'], False)
+        self.assertRaisesRegex(ValueError, 'parse flags', ColumnStore,
+                               self.path, convert_roman=True)
+
+        with mock.patch.object(MatchBlock, 'date_formats', ('iso',)):
+            self.assertRaisesRegex(ValueError, 'date formats', ColumnStore,
+                                   self.path)
+        self.assertRaises(FileNotFoundError, ColumnStore,
+                          os.path.join(self.directory.name, 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import (MatchBlock, MatchConfig, MatchIndex, PreparedRows,
+                        match_find, match_find_all, match_rows, match_tables)
+
+
+class TestMatchConfig(unittest.TestCase):
+    rows = [['Flight 1', 100, '10-Dec-2015'],
+            ['Flight 1', 104, '10-Dec-2015'],
+            ['Flight 1', 100, '12-Dec-2015'],
+            ['Flight 2', 100, '10-Dec-2015']]
+
+    def setUp(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.date_tolerance = 0
+        MatchBlock.coordinates_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+    def test_match_config_pass_1(self):
+        config = MatchConfig(number_tolerance=5, string_tolerance=10)
+        self.assertEqual(config.tolerances, (5, 0, 0, 10, 0, 0))
+        self.assertEqual(config.method, 'uwratio')
+
+        replaced = config.replace(number_tolerance=0, method='ratio')
+        self.assertEqual(replaced.tolerances, (0, 0, 0, 10, 0, 0))
+        self.assertEqual(replaced.method, 'ratio')
+        self.assertEqual(config.number_tolerance, 5)
+
+        self.assertEqual(config, MatchConfig(5, 0, 0, 10))
+        self.assertEqual(hash(config), hash(MatchConfig(5, 0, 0, 10)))
+
+    def test_match_config_pass_2(self):
+        MatchBlock.number_tolerance = 5
+        MatchBlock.string_tolerance = 20
+        self.assertEqual(MatchBlock.config(),
+                         MatchConfig(number_tolerance=5, string_tolerance=20))
+
+    def test_match_config_fail_1(self):
+        self.assertRaises(ValueError, MatchConfig, number_tolerance=-1)
+        self.assertRaises(ValueError, MatchConfig, string_tolerance=101)
+        self.assertRaises(ValueError, MatchConfig, method='wratio')
+        self.assertRaises(ValueError, MatchConfig().replace,
+                          str_custom_tolerance=200)
+
+    def test_matches_pass_1(self):
+        config = MatchConfig(number_tolerance=5)
+        self.assertIs(MatchBlock(100).matches(MatchBlock(104), config), True)
+        self.assertIs(MatchBlock(100).matches(MatchBlock(104)), False)
+        self.assertIs(MatchBlock(100) == MatchBlock(104), False)
+        self.assertEqual(MatchBlock.number_tolerance, 0)
+
+    def test_matches_pass_2(self):
+        block_1 = MatchBlock('Kolmogorov Flight')
+        block_2 = MatchBlock('Flight Kolmogorov')
+        self.assertIs(block_1.matches(block_2), False)
+        config = MatchConfig(method='token_sort_ratio')
+        self.assertIs(block_1.matches(block_2, config), True)
+
+    def test_matches_pass_3(self):
+        config = MatchConfig(date_tolerance=2)
+        block_1 = MatchBlock('10-Dec-2015 Flight 1', lazy=True)
+        block_2 = MatchBlock('12-Dec-2015 Flight 1', lazy=True)
+        self.assertIs(block_1.matches(block_2, config), True)
+        self.assertIs(block_1.matches(block_2), False)
+
+    def test_matches_fail_1(self):
+        self.assertRaises(TypeError, MatchBlock(100).matches, 100)
+
+    def test_match_functions_pass_1(self):
+        config = MatchConfig(number_tolerance=5, date_tolerance=2)
+        row = self.rows[0]
+
+        self.assertIs(match_rows(row, self.rows[1], config), True)
+        self.assertIs(match_rows(row, self.rows[1]), False)
+        self.assertEqual(match_find(self.rows[2], self.rows, config),
+                         self.rows[0])
+        self.assertEqual(match_find_all(row, self.rows, config=config),
+                         self.rows[:3])
+        self.assertEqual(match_find_all(row, self.rows), self.rows[:1])
+
+    def test_match_functions_pass_2(self):
+        config = MatchConfig(number_tolerance=5, date_tolerance=2)
+        row = self.rows[0]
+        query = ['Flight 1', 103, '11-Dec-2015']
+
+        for corpus in (PreparedRows(self.rows), MatchIndex(self.rows)):
+            self.assertEqual(corpus.find_all(row, config), self.rows[:3])
+            self.assertEqual(corpus.find_all(row), self.rows[:1])
+            self.assertEqual(corpus.find(query, config), self.rows[0])
+            self.assertIsNone(corpus.find(query))
+
+    def test_match_index_pass_1(self):
+        rows = [['Kolmogorov Flight', 100], ['Flight Kolmogorov', 100],
+                ['Flight Madrid', 100]]
+        index = MatchIndex(rows)
+        config = MatchConfig(method='token_sort_ratio')
+
+        self.assertEqual(index.find_all(rows[0]), rows[:1])
+        self.assertEqual(index.find_all(rows[0], config), rows[:2])
+        self.assertEqual(index.find_all(rows[0]), rows[:1])
+
+    def test_threads_pass_1(self):
+        configs = [MatchConfig(number_tolerance=x) for x in (0, 5)] * 20
+        expected = {0: self.rows[:1], 5: self.rows[:2]}
+        index = MatchIndex(self.rows)
+        failures = []
+
+        def search(config):
+            for corpus in (self.rows, index):
+                result = match_find_all(self.rows[0], corpus, config=config)
+                if result != expected[config.number_tolerance]:
+                    failures.append(config)
+
+        threads = [threading.Thread(target=search, args=(x,)) for x in configs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+
+    def test_workers_pass_1(self):
+        config = MatchConfig(number_tolerance=5, date_tolerance=2)
+        expected = [match_find_all(row, self.rows, config=config)
+                    for row in self.rows]
+
+        self.assertEqual(match_tables(self.rows, self.rows, workers=2,
+                                      config=config), expected)
+        self.assertEqual(match_find_all(self.rows[0], self.rows, workers=2,
+                                        config=config), expected[0])
+        self.assertEqual(match_tables(self.rows, self.rows, workers=2),
+                         [[row] for row in self.rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import Dictionary, MatchBlock, PreparedRows
+
+
+class TestDictionary(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, 'dictionary.json')
+        self.write({'north': ['n', 'nord'], 'street': ['st', 'str']})
+
+    def tearDown(self):
+        self.directory.cleanup()
+        Dictionary.clear_cache()
+
+    def write(self, dictionary, mtime=None):
+        with open(self.file, 'w') as f:
+            json.dump(dictionary, f)
+        if mtime is not None:
+            os.utime(self.file, (mtime, mtime))
+
+    def test_dictionary_pass_1(self):
+        dictionary = Dictionary({'a': ['x', 'y'], 'b': ['y', 'z']})
+        self.assertIn('a', dictionary)
+        self.assertNotIn('x', dictionary)
+        self.assertEqual(len(dictionary), 2)
+        self.assertEqual(dictionary.reverse, {'x': 'a', 'y': 'a', 'z': 'b'})
+        self.assertEqual(dictionary.substitute('Z'), 'b')
+        self.assertEqual(dictionary.substitute('W'), 'W')
+
+    def test_dictionary_load_pass_1(self):
+        dictionary = Dictionary.load(self.file)
+        self.assertIs(Dictionary.load(self.file), dictionary)
+
+        with mock.patch('builtins.open') as mocked:
+            self.assertEqual(MatchBlock.dict_sub('N St', self.file),
+                             'north street')
+            mocked.assert_not_called()
+
+    def test_dictionary_load_pass_2(self):
+        dictionary = Dictionary.load(self.file)
+        self.write({'south': ['s']}, mtime=os.stat(self.file).st_mtime + 10)
+
+        reloaded = Dictionary.load(self.file)
+        self.assertIsNot(reloaded, dictionary)
+        self.assertEqual(set(reloaded), {'south'})
+
+    def test_dictionary_default_pass_1(self):
+        self.assertIs(Dictionary.default(), MatchBlock._load_dictionary())
+        self.assertEqual(Dictionary.default().reverse['nord'], 'north')
+
+    def test_dictionary_stat_pass_1(self):
+        # Files aren't checked for every MatchBlock, nor the package's one.
+        Dictionary.default()
+        with mock.patch('os.stat', wraps=os.stat) as stat:
+            for _ in range(100):
+                MatchBlock('Nord Road 1')
+            self.assertEqual(stat.call_count, 0)
+
+            for _ in range(100):
+                MatchBlock('N Road 1', dictionary=self.file)
+            self.assertEqual(stat.call_count, 1)
+
+    def test_dictionary_matchblock_pass_1(self):
+        dictionary = Dictionary({'upper': ['up', 'hi']})
+
+        self.assertEqual(MatchBlock.dict_sub('Hi Road', dictionary),
+                         'upper Road')
+        self.assertEqual(MatchBlock.extract_str_custom('Hi Road', dictionary),
+                         ('Road', 'upper'))
+
+        matchblock = MatchBlock('Up Road N', dictionary=dictionary)
+        self.assertEqual(matchblock.str_custom, 'upper')
+        self.assertEqual(matchblock.string, 'Road N')
+
+        matchblock = MatchBlock('Up Road N', dictionary=self.file)
+        self.assertEqual(matchblock.str_custom, 'north')
+
+    def test_dictionary_prepared_rows_pass_1(self):
+        dictionary = Dictionary({'upper': ['up', 'hi']})
+        rows = PreparedRows([['Up Road'], ['Road']], dictionary=dictionary)
+        self.assertEqual(rows.find_all(['Hi Road']), [['Up Road']])
+
+    def test_dictionary_fingerprint_pass_1(self):
+        dictionary = Dictionary({'a': ['x', 'y'], 'b': ['z']})
+        self.assertEqual(dictionary.fingerprint,
+                         Dictionary({'b': ('z',), 'a': ['y', 'x']}).fingerprint)
+        self.assertNotEqual(dictionary.fingerprint,
+                            Dictionary({'a': ['x'], 'b': ['z']}).fingerprint)
+
+    def test_dictionary_load_fail_1(self):
+        self.assertRaises(FileNotFoundError, Dictionary.load,
+                          os.path.join(self.directory.name, 'missing.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
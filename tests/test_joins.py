@@ -0,0 +1,275 @@
+import datetime
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import (MatchBlock, MatchConfig, PreparedRows, band_join,
+                        date_join, match_join, match_rows)
+from matchtools import _joins
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def brute_force(values1, values2, tolerance):
+    return [(i, j) for i, x in enumerate(values1)
+            for j, y in enumerate(values2)
+            if x is not None and y is not None and abs(x - y) <= tolerance]
+
+
+class TestBandJoin(unittest.TestCase):
+    def test_band_join_pass_1(self):
+        self.assertEqual(band_join([1, 5, 10], [9, 2, None], tolerance=1),
+                         [(0, 1), (2, 0)])
+        self.assertEqual(band_join([1, None, float('nan')], [1, None]),
+                         [(0, 0)])
+        self.assertEqual(band_join([], [1, 2], tolerance=5), [])
+
+    def test_band_join_pass_2(self):
+        # Windows are widened for rounding errors, pairs checked exactly.
+        values1, values2 = [0.3, 0.1 + 0.2], [0.2, 0.3]
+        self.assertEqual(band_join(values1, values2, tolerance=0.1),
+                         brute_force(values1, values2, 0.1))
+        self.assertEqual(band_join(values1, values2), [(0, 1)])
+
+        values1, values2 = [2 ** 60, 10 ** 400], [2 ** 60 + 1, 10 ** 400 + 1]
+        self.assertEqual(band_join(values1, values2), [])
+        self.assertEqual(band_join(values1, values2, tolerance=1),
+                         [(0, 0), (1, 1)])
+
+    def test_band_join_pass_3(self):
+        values1 = [float('inf'), -float('inf'), 5, None]
+        values2 = [float('inf'), 0, float('nan')]
+        self.assertEqual(band_join(values1, values2, tolerance=10), [(2, 1)])
+        self.assertEqual(band_join(values1, values2, tolerance=float('inf')),
+                         brute_force(values1, values2, float('inf')))
+
+    def test_band_join_pass_4(self):
+        generator = random.Random(0)
+        for tolerance in (0, 0.5, 3):
+            values1 = [generator.choice([generator.randint(0, 50),
+                                         generator.uniform(0, 50), None])
+                       for _ in range(100)]
+            values2 = [generator.randint(0, 50) for _ in range(100)]
+            expected = brute_force(values1, values2, tolerance)
+
+            self.assertEqual(band_join(values1, values2, tolerance), expected)
+            with mock.patch.object(_joins, 'np', None):
+                self.assertEqual(band_join(values1, values2, tolerance),
+                                 expected)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_band_join_pass_5(self):
+        generator = np.random.RandomState(0)
+        array1 = generator.uniform(0, 50, 100)
+        array2 = generator.randint(0, 50, 100)
+
+        for tolerance in (0, 0.5, 3):
+            self.assertEqual(band_join(array1, array2, tolerance),
+                             brute_force(list(array1), list(array2),
+                                         tolerance))
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_band_join_pass_6(self):
+        # Differences of integers don't wrap around or overflow.
+        self.assertEqual(band_join(np.array([1], np.uint8),
+                                   np.array([3], np.uint8), 5), [(0, 0)])
+        self.assertEqual(band_join(np.array([3, 250], np.uint8),
+                                   np.array([1, 5], np.uint8), 2),
+                         [(0, 0), (0, 1)])
+        self.assertEqual(band_join(np.array([-100, 100], np.int8),
+                                   np.array([100, 50], np.int8), 200),
+                         [(0, 0), (0, 1), (1, 0), (1, 1)])
+        self.assertEqual(band_join(np.array([-128, 120], np.int8),
+                                   np.array([127, 125], np.int8), 5),
+                         [(1, 1)])
+        self.assertEqual(band_join(np.array([True, False]),
+                                   np.array([False]), 0), [(1, 0)])
+
+        values1 = np.array([-2 ** 63, 2 ** 63 - 1], np.int64)
+        values2 = np.array([2 ** 63 - 1, 2 ** 63 - 2], np.int64)
+        self.assertEqual(band_join(values1, values2, 1), [(1, 0), (1, 1)])
+        self.assertEqual(band_join(values1, values2, 2 ** 62),
+                         [(1, 0), (1, 1)])
+        values1 = np.array([2 ** 64 - 1, 5], np.uint64)
+        values2 = np.array([2 ** 64 - 2, 3], np.uint64)
+        self.assertEqual(band_join(values1, values2, 2), [(0, 0), (1, 1)])
+
+    def test_band_join_fail_1(self):
+        self.assertRaises(ValueError, band_join, [1], [1], -1)
+
+
+def brute_force_dates(values1, values2, tolerance):
+    def comparable(x, y):
+        if x is None or y is None:
+            return False
+        if isinstance(x, list) != isinstance(y, list):
+            return False
+        return not isinstance(x, list) or len(x) == len(y)
+
+    return [(i, j) for i, x in enumerate(values1)
+            for j, y in enumerate(values2)
+            if comparable(x, y) and
+            MatchBlock.compare_dates(x, y, tolerance=tolerance)]
+
+
+class TestDateJoin(unittest.TestCase):
+    def dates(self, generator, tzinfo=None):
+        def date():
+            return datetime.datetime(2015, 3, 1, tzinfo=tzinfo) + \
+                datetime.timedelta(seconds=generator.randint(0, 10 * 86400))
+
+        values = []
+        for _ in range(100):
+            kind = generator.randint(0, 3)
+            if kind == 0:
+                values.append(None)
+            elif kind == 1:
+                values.append(date())
+            else:
+                values.append([date() for _ in range(kind - 1)])
+        return values
+
+    def test_date_join_pass_1(self):
+        dates1 = [datetime.datetime(2015, 5, 1), None]
+        dates2 = [[datetime.datetime(2015, 5, 3)],
+                  datetime.datetime(2015, 4, 30, 12)]
+        self.assertEqual(date_join(dates1, dates2, tolerance=1), [(0, 1)])
+        self.assertEqual(date_join(dates2, dates1), [])
+        self.assertEqual(date_join([[], None], [[]]), [(0, 0)])
+
+    def test_date_join_pass_2(self):
+        # Days are rounded down, like timedelta.days.
+        date = datetime.datetime(2015, 5, 1)
+        dates = [date - datetime.timedelta(hours=12),
+                 date + datetime.timedelta(hours=12),
+                 date + datetime.timedelta(days=1)]
+        self.assertEqual(date_join([date], dates), [(0, 0)])
+        self.assertEqual(date_join([date], dates, tolerance=0.5),
+                         brute_force_dates([date], dates, 0.5))
+        self.assertEqual(date_join([date], dates, tolerance=float('inf')),
+                         [(0, 0), (0, 1), (0, 2)])
+
+        # Naive and aware dates are never joined.
+        aware = date.replace(tzinfo=datetime.timezone.utc)
+        self.assertEqual(date_join([date, aware], [aware], tolerance=1),
+                         [(1, 0)])
+
+    def test_date_join_pass_3(self):
+        generator = random.Random(0)
+        zones = [None, datetime.timezone(datetime.timedelta(hours=5))]
+        for tzinfo in zones:
+            values1 = self.dates(generator, tzinfo)
+            values2 = self.dates(generator, tzinfo)
+
+            for tolerance in (0, 1, 2.5):
+                expected = brute_force_dates(values1, values2, tolerance)
+                self.assertEqual(date_join(values1, values2, tolerance),
+                                 expected)
+                with mock.patch.object(_joins, 'np', None):
+                    self.assertEqual(date_join(values1, values2, tolerance),
+                                     expected)
+
+    def test_date_join_fail_1(self):
+        self.assertRaises(ValueError, date_join, [], [], -1)
+        self.assertRaises(TypeError, date_join, ['1 May 2015'], [])
+
+
+class TestMatchJoin(unittest.TestCase):
+    rows1 = [['Flight 1', 100, '10-Dec-2015'],
+             ['Flight 2', 100.5, '10-Dec-2015'],
+             ['Flight 2', '', '11-Dec-2015'],
+             ['Flight 3', 200]]
+    rows2 = [['Flight 2', 103, '10-Dec-2015'],
+             ['Flight 1', 101, '11-Dec-2015'],
+             ['Flight 2', 'x', '11-Dec-2015'],
+             ['Flight 3', 200],
+             ['Flight 3', 200, '10-Dec-2015']]
+
+    def setUp(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.date_tolerance = 0
+        MatchBlock.coordinates_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+    def expected(self, config):
+        return [(i, j) for i, row1 in enumerate(self.rows1)
+                for j, row2 in enumerate(self.rows2)
+                if match_rows(row1, row2, config)]
+
+    def test_match_join_pass_1(self):
+        config = MatchConfig(number_tolerance=3, date_tolerance=1)
+        self.assertEqual(match_join(self.rows1, self.rows2, 1, config=config),
+                         [(0, 1), (1, 0), (3, 3)])
+
+        for column in (0, 1, 2, 5):
+            self.assertEqual(match_join(self.rows1, self.rows2, column,
+                                        config=config),
+                             self.expected(config))
+
+    def test_match_join_pass_2(self):
+        MatchBlock.number_tolerance = 1
+        prepared1 = PreparedRows(self.rows1)
+        prepared2 = PreparedRows(self.rows2)
+
+        with mock.patch.object(_joins, '_blocks_match',
+                               wraps=_joins._blocks_match) as blocks_match:
+            self.assertEqual(match_join(prepared1, prepared2, 1),
+                             self.expected(None))
+            # Pairs of numbers within the tolerance and of rows without
+            # numbers.
+            self.assertEqual(blocks_match.call_count, 5)
+
+    def test_match_join_pass_3(self):
+        config = MatchConfig(number_tolerance=3, date_tolerance=1)
+        self.assertEqual(match_join(self.rows1, self.rows2, 2,
+                                    attribute='date', config=config),
+                         self.expected(config))
+
+        rows1 = [['Flight 1', '1 May 2015, 3 May 2015'],
+                 ['Flight 1', '2 May 2015']]
+        rows2 = [['Flight 1', '2 May 2015, 2 May 2015'],
+                 ['Flight 1', '2 May 2015, 5 May 2015'],
+                 ['Flight 1', '3 May 2015']]
+        self.rows1, self.rows2 = rows1, rows2
+        self.assertEqual(match_join(rows1, rows2, 1, attribute='date',
+                                    config=config),
+                         self.expected(config))
+
+    def test_match_join_pass_4(self):
+        rows1 = [['Flight 1', 'FBI', '41.49, -71.312'],
+                 ['Flight 2', 'Federal Bureau of Investigation', ''],
+                 ['N Road XII', 'x', '41.49, -71.312']]
+        rows2 = [['Flight 01', 'Federal Bureau of Investigation',
+                  '41.49, -71.31'],
+                 ['Flight 2', 'FBI', ''],
+                 ['north road 12', 'x', '41.491, -71.312']]
+        self.rows1, self.rows2 = rows1, rows2
+
+        for config in (MatchConfig(coordinates_tolerance=1), MatchConfig(
+                coordinates_tolerance=1, method='partial_ratio')):
+            expected = self.expected(config)
+            for column in range(3):
+                for attribute in ('coordinates', 'string', 'str_number',
+                                  'str_custom'):
+                    self.assertEqual(match_join(rows1, rows2, column,
+                                                attribute=attribute,
+                                                config=config),
+                                     expected)
+
+    def test_match_join_fail_1(self):
+        self.assertRaises(ValueError, match_join, self.rows1, self.rows2, 1,
+                          attribute='name')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,25 @@
 import datetime
+import json
 import os
+import pickle
+import random
 import sys
+import tempfile
 import unittest
+import warnings
+from unittest import mock
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 
-from matchtools import MatchBlock
+from geopy.distance import great_circle, vincenty
+
+from matchtools import MatchBlock, _geo, _similarity
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TestMatchBlock(unittest.TestCase):
@@ -71,6 +84,28 @@ class TestMatchBlock(unittest.TestCase):
         self.assertEqual(
             "there's a feeling I get when I look to the west", result)
 
+    def test_dict_sub_pass_13(self):
+        dictionary = {'a': ['x', 'y'], 'b': ['y', 'z'], 'c': []}
+        with tempfile.TemporaryDirectory() as directory:
+            dictionary_file = os.path.join(directory, 'dictionary.json')
+            with open(dictionary_file, 'w') as f:
+                json.dump(dictionary, f)
+
+            result = MatchBlock.dict_sub('X-y z w', dictionary_file)
+            self.assertEqual('a-a b w', result)
+
+            result = MatchBlock.extract_str_custom('X-y z w', dictionary_file)
+            self.assertEqual(('w', 'a a b'), result)
+
+    def test_dict_sub_reverse_pass_1(self):
+        dictionary = MatchBlock._load_dictionary()
+        reverse = dictionary.reverse
+        self.assertIs(MatchBlock._load_dictionary().reverse, reverse)
+        self.assertEqual(reverse['nord'], 'north')
+        self.assertEqual(
+            set(reverse),
+            {x for values in dictionary.mapping.values() for x in values})
+
     def test_strip_zeros_pass_1(self):
         string = 'London 001'
         result = MatchBlock.strip_zeros(string)
@@ -151,6 +186,57 @@ class TestMatchBlock(unittest.TestCase):
         result = MatchBlock.is_abbreviation(string1, string2)
         self.assertIs(result, True)
 
+    def test_extract_dates_cache_pass_1(self):
+        MatchBlock.dates_cache.clear()
+        text = 'Istanbul 25 May 2005 '
+        result1 = MatchBlock.extract_dates(text)
+        result2 = MatchBlock.extract_dates(text)
+        self.assertEqual(result1, result2)
+        self.assertEqual((MatchBlock.dates_cache.hits,
+                          MatchBlock.dates_cache.misses), (1, 1))
+
+        result2[1].clear()
+        self.assertEqual(MatchBlock.extract_dates(text), result1)
+
+    def test_extract_dates_cache_pass_2(self):
+        MatchBlock.dates_cache.clear()
+        MatchBlock.dates_cache.enabled = False
+        try:
+            MatchBlock.extract_dates('Istanbul 25 May 2005 ')
+            self.assertEqual(len(MatchBlock.dates_cache), 0)
+        finally:
+            MatchBlock.dates_cache.enabled = True
+
+    def test_extract_dates_fast_path_pass_1(self):
+        strings = ('2015-05-01', '2015/5/1', '01/05/2015', '13/05/2015',
+                   '1 May 2015', '10-DEC-2015', 'September 1, 2015',
+                   ' 1 sept 2015 ')
+        for string in strings:
+            with mock.patch.object(MatchBlock, '_find_dates') as find_dates:
+                result = MatchBlock.extract_dates(string)
+            find_dates.assert_not_called()
+
+            remains, dates = MatchBlock._find_dates(string)
+            self.assertEqual(result, (remains, list(dates)))
+
+    def test_extract_dates_fast_path_pass_2(self):
+        formats = MatchBlock.date_formats
+        MatchBlock.date_formats = ()
+        try:
+            with mock.patch.object(MatchBlock, '_find_dates',
+                                   return_value=('', ())) as find_dates:
+                MatchBlock.dates_cache.clear()
+                MatchBlock.extract_dates('2015-05-01')
+            find_dates.assert_called_once_with('2015-05-01')
+        finally:
+            MatchBlock.date_formats = formats
+            MatchBlock.dates_cache.clear()
+
+    def test_extract_dates_fast_path_fail_1(self):
+        for string in ('2015-02-30', '1 Mai 2015', '32/13/2015'):
+            result = MatchBlock.extract_dates(string)
+            self.assertEqual(result, (string, []))
+
     def test_extract_coordinates_pass_1(self):
         original_string = '53.41058,-2.97794'
         string = ''
@@ -332,6 +418,13 @@ class TestMatchBlock(unittest.TestCase):
         tested = MatchBlock.compare_dates(d1, d2, tolerance=tol)
         self.assertIs(tested, True)
 
+    def test_compare_dates_pass_6(self):
+        d1 = (datetime.datetime(2015, 2, 12), datetime.datetime(2015, 3, 1))
+        d2 = [datetime.datetime(2015, 2, 13), datetime.datetime(2015, 3, 1)]
+        tol = 1
+        tested = MatchBlock.compare_dates(d1, d2, tolerance=tol)
+        self.assertIs(tested, True)
+
     def test_compare_dates_fail_1(self):
         d1, d2 = '12-Feb-2015', '15-Feb-2015'
         tol = 2
@@ -425,6 +518,82 @@ class TestMatchBlock(unittest.TestCase):
         self.assertRaises(ValueError, MatchBlock.compare_strings,
                           string1, string2, tolerance=tolerance, method='abc')
 
+    def test_compare_strings_matrix_pass_1(self):
+        strings1 = ['The Beatles', 'Queen', 'Beatles']
+        strings2 = ['Beatles', 'Queens', 'Beatles', 'Abba']
+        result = MatchBlock.compare_strings_matrix(strings1, strings2,
+                                                   tolerance=10)
+        self.assertEqual(result, [(0, 0), (0, 2), (1, 1), (2, 0), (2, 2)])
+
+    def test_compare_strings_matrix_pass_2(self):
+        strings1 = ['Federal Bureau of Investigation', 'FBI 1', 'Flight 1']
+        strings2 = ['FBI', 'Flight 01', 'Flight 2']
+        with mock.patch.object(MatchBlock, 'string_tolerance', 0), \
+                mock.patch.object(MatchBlock, 'str_number_tolerance', 20):
+            result = MatchBlock.compare_strings_matrix(strings1, strings2)
+        self.assertEqual(result, [(0, 0), (1, 0), (2, 1), (2, 2)])
+
+    def test_compare_strings_matrix_pass_3(self):
+        r = random.Random(0)
+        words = ('Flight', 'flight', 'FBI', 'Federal', 'Bureau', 'of',
+                 'Investigation', 'North', 'IV', '0001', '12', 'Zürich', '-')
+
+        def string():
+            if r.random() < 0.6:
+                return ' '.join(r.choice(words)
+                                for _ in range(r.randrange(5)))
+            return ''.join(r.choice('abcD1 -') for _ in range(r.randrange(12)))
+
+        strings1 = [string() for _ in range(40)]
+        strings2 = [string() for _ in range(40)] + strings1[:5]
+
+        methods = ('uwratio', 'partial_ratio', 'token_sort_ratio',
+                   'token_set_ratio', 'ratio')
+        for method in methods:
+            for tolerance in (0, 10, 12.5, 15, 20, 40):
+                expected = [
+                    (i, j) for i, x in enumerate(strings1)
+                    for j, y in enumerate(strings2)
+                    if MatchBlock.compare_strings(x, y, tolerance=tolerance,
+                                                  method=method)]
+
+                result = MatchBlock.compare_strings_matrix(
+                    strings1, strings2, tolerance=tolerance, method=method)
+                self.assertEqual(result, expected)
+
+                with mock.patch.object(_similarity, 'np', None):
+                    result = MatchBlock.compare_strings_matrix(
+                        strings1, strings2, tolerance=tolerance,
+                        method=method)
+                self.assertEqual(result, expected)
+
+    def test_compare_strings_matrix_pass_4(self):
+        result = MatchBlock.compare_strings_matrix([], ['Wall'], tolerance=0)
+        self.assertEqual(result, [])
+
+        result = MatchBlock.compare_strings_matrix(['', 'Wall'], ['', '-'],
+                                                   tolerance=0,
+                                                   method='ratio')
+        self.assertEqual(result, [(0, 0)])
+
+    def test_compare_strings_matrix_pass_5(self):
+        # Only strings of different lengths sharing a word pass uwratio by
+        # their words.
+        strings1 = ['Flight']
+        strings2 = ['Amsterdam Kolmogorov', 'Flight Kolmogorov']
+        with mock.patch.object(MatchBlock.scorer, 'uwratio',
+                               wraps=MatchBlock.scorer.uwratio) as score:
+            result = MatchBlock.compare_strings_matrix(strings1, strings2,
+                                                       tolerance=15)
+            self.assertEqual(score.call_count, 1)
+        self.assertEqual(result, [(0, 1)])
+
+    def test_compare_strings_matrix_fail_1(self):
+        self.assertRaises(ValueError, MatchBlock.compare_strings_matrix,
+                          ['Wall'], ['Wall'], tolerance=101)
+        self.assertRaises(ValueError, MatchBlock.compare_strings_matrix,
+                          ['Wall'], ['Wall'], tolerance=0, method='abc')
+
     def test_compare_coordinates_pass_1(self):
         lat1 = 41.49008
         lng1 = -71.312796
@@ -508,6 +677,65 @@ class TestMatchBlock(unittest.TestCase):
                           (lat1, lng1), (lat2, lng2),
                           tolerance=tolerance)
 
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_compare_coordinates_many_pass_1(self):
+        coords1 = [(41.49008, -71.312796), (52.520008, 13.404954),
+                   (52.520008, 13.404954), (0.0, 0.0)]
+        coords2 = [(41.499498, -81.695391), (53.551086, 9.993682),
+                   (42.520000, 23.400000), (0.0, 0.0)]
+        for unit, tolerance in (('km', 870), ('mi', 200), ('m', 10 ** 6),
+                                ('ft', 3 * 10 ** 6), ('nm', 400)):
+            result = MatchBlock.compare_coordinates_many(
+                coords1, coords2, tolerance=tolerance, unit=unit)
+            expected = [MatchBlock.compare_coordinates(
+                x, y, tolerance=tolerance, unit=unit)
+                for x, y in zip(coords1, coords2)]
+            self.assertEqual(result.tolist(), expected)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_compare_coordinates_many_pass_2(self):
+        coords1 = (52.520008, 13.404954)
+        coords2 = [(53.551086, 9.993682), (42.520000, 23.400000)]
+        result = MatchBlock.compare_coordinates_many(coords1, coords2,
+                                                     tolerance=600)
+        self.assertEqual(result.tolist(), [True, False])
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_compare_coordinates_many_pass_3(self):
+        coords1 = [(41.49008, -71.312796), (10.0, 20.0), (-33.9, 151.2)]
+        coords2 = [(41.499498, -81.695391), (-10.0, -160.0), (51.5, -0.1)]
+        lat1, lng1 = _geo.as_coordinates(coords1)
+        lat2, lng2 = _geo.as_coordinates(coords2)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            result = _geo.vincenty_distance(lat1, lng1, lat2, lng2)
+            for distance, x, y in zip(result, coords1, coords2):
+                try:
+                    expected = vincenty(x, y).km
+                except ValueError:
+                    expected = great_circle(x, y).km
+                self.assertAlmostEqual(distance, expected, delta=1e-6)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_compare_coordinates_cross_pass_1(self):
+        coords1 = [(52.520008, 13.404954), (41.49008, -71.312796)]
+        coords2 = [(53.551086, 9.993682), (42.520000, 23.400000),
+                   (41.499498, -81.695391)]
+        result = MatchBlock.compare_coordinates_cross(coords1, coords2,
+                                                      tolerance=900)
+        self.assertEqual(result.tolist(), [[True, False, False],
+                                           [False, False, True]])
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_compare_coordinates_many_fail_1(self):
+        self.assertRaises(ValueError, MatchBlock.compare_coordinates_many,
+                          [(1, 2)], [(1, 2)], tolerance=1, unit='')
+        self.assertRaises(ValueError, MatchBlock.compare_coordinates_many,
+                          [(1, 2)], [(1, 2)], tolerance=-1)
+        self.assertRaises(ValueError, MatchBlock.compare_coordinates_many,
+                          [(91, 2)], [(1, 2)], tolerance=1)
+
     def test_extract_dates(self):
         text = '25 May 1977 Rome Istanbul 25 May 2005 '
         result = MatchBlock.extract_dates(text)
@@ -597,6 +825,132 @@ class TestMatchBlock(unittest.TestCase):
 
         self.assertRaises(TypeError, matchblock_1.__eq__, matchblock_2)
 
+    def test_matchblock_comparison_order_pass_1(self):
+        self.assertEqual(MatchBlock.comparison_order(), (0, 1, 4, 5, 3, 2))
+
+        matchblock_1 = MatchBlock('London 1 41.49, -71.312')
+        matchblock_2 = MatchBlock('London 2 41.49, -71.312')
+
+        with mock.patch.object(MatchBlock, 'compare_coordinates') as m:
+            self.assertIs(matchblock_1 == matchblock_2, False)
+            m.assert_not_called()
+
+    def test_matchblock_comparison_order_pass_2(self):
+        with mock.patch.object(MatchBlock, 'comparison_costs',
+                               (1, 1, 1, 1, 1, 0)):
+            self.assertEqual(MatchBlock.comparison_order(),
+                             (5, 0, 1, 2, 3, 4))
+        self.assertEqual(MatchBlock.comparison_order(), (0, 1, 4, 5, 3, 2))
+
+    def test_matchblock_comparison_order_pass_3(self):
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+        matchblock_1 = MatchBlock('London 1 North')
+        matchblock_2 = MatchBlock('Paris 1 North')
+        matchblock_3 = MatchBlock('London 1 South')
+
+        try:
+            with mock.patch.object(MatchBlock, 'adaptive_order', True), \
+                    mock.patch.object(MatchBlock, '_adaptive_interval', 10):
+                for _ in range(10):
+                    self.assertIs(matchblock_1 == matchblock_2, False)
+                    self.assertIs(matchblock_1 == matchblock_3, False)
+
+                # str_custom rejects every time, str_number never does.
+                self.assertEqual(MatchBlock.comparison_order(),
+                                 (0, 1, 5, 3, 4, 2))
+                self.assertIs(matchblock_1 == MatchBlock('London 01 N'), True)
+        finally:
+            MatchBlock.reset_comparison_order()
+
+        self.assertEqual(MatchBlock.comparison_order(), (0, 1, 4, 5, 3, 2))
+
+    def test_matchblock_score_pass_1(self):
+        score = MatchBlock('London 1').score(MatchBlock('Paris 01'))
+
+        self.assertEqual(score.total, 50.0)
+        self.assertEqual((score.string, score.str_number), (0, 100))
+        self.assertEqual((score.number, score.date, score.coordinates,
+                          score.str_custom), (None, None, None, None))
+
+    def test_matchblock_score_pass_2(self):
+        score = MatchBlock(
+            '41.49, -71.312 10-Dec-2015').score(MatchBlock('13-Dec-2015'))
+
+        self.assertEqual(score.date, 25.0)
+        self.assertEqual(score.coordinates, 0)
+        self.assertEqual(score.total, 12.5)
+
+    def test_matchblock_score_pass_3(self):
+        score = MatchBlock(100).score(MatchBlock(103))
+        self.assertEqual(score, (25.0, 25.0, None, None, None, None, None))
+
+        score = MatchBlock('FBI').score(
+            MatchBlock('Federal Bureau of Investigation'))
+        self.assertEqual(score.string, 100)
+
+    def test_matchblock_score_fail_1(self):
+        self.assertRaises(TypeError, MatchBlock('Madrid').score, 'Madrid')
+
+    def test_matchblock_lazy_pass_1(self):
+        entry = 'Flight IV N 41.49, -71.312 10-Dec-2015'
+        eager = MatchBlock(entry)
+
+        with mock.patch.object(MatchBlock, '_extract_dates',
+                               wraps=MatchBlock._extract_dates) as m:
+            lazy = MatchBlock(entry, lazy=True)
+            m.assert_not_called()
+            self.assertEqual(lazy.coordinates, eager.coordinates)
+            m.assert_not_called()
+            self.assertEqual(lazy.date, eager.date)
+            self.assertEqual(lazy.attributes, eager.attributes)
+            self.assertEqual(m.call_count, 1)
+
+    def test_matchblock_lazy_pass_2(self):
+        MatchBlock.coordinates_tolerance = 1
+        matchblock_1 = MatchBlock('Flight 1 41.49, -71.312 10-Dec-2015')
+
+        with mock.patch('datefinder.find_dates') as m:
+            for entry in ('Flight 1 42.49, -71.312 10 December 2015',
+                          'Flight 1 10 December 2015', 100):
+                matchblock_2 = MatchBlock(entry, lazy=True)
+                self.assertIs(matchblock_1 == matchblock_2, False)
+            m.assert_not_called()
+
+        matchblock_2 = MatchBlock('Flight 1 41.49, -71.312 10-Dec-2015',
+                                  lazy=True)
+        self.assertIs(matchblock_2 == matchblock_1, True)
+
+    def test_matchblock_lazy_pass_3(self):
+        matchblock = MatchBlock('Flight 1 10-Dec-2015', lazy=True,
+                                try_date=False)
+        self.assertEqual(pickle.loads(pickle.dumps(matchblock)).attributes,
+                         MatchBlock('Flight 1 10-Dec-2015',
+                                    try_date=False).attributes)
+
+    def test_matchblock_slots_pass_1(self):
+        matchblock = MatchBlock('31-Dec-2015 New Year')
+
+        self.assertFalse(hasattr(matchblock, '__dict__'))
+        self.assertRaises(AttributeError, setattr, matchblock, 'other', 1)
+
+        date = matchblock.date
+        self.assertEqual(date, [datetime.datetime(2015, 12, 31, 0, 0)])
+        self.assertIsInstance(matchblock.attributes[1], list)
+        date.append(None)
+        self.assertEqual(len(matchblock.date), 1)
+
+    def test_matchblock_slots_pass_2(self):
+        matchblock_1 = MatchBlock('Flight 1')
+        matchblock_2 = MatchBlock('Flight 2')
+
+        self.assertEqual(matchblock_1.date, [])
+        self.assertIs(matchblock_1._date, matchblock_2._date)
+        self.assertEqual(len(matchblock_1), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(matchblock_1)).attributes,
+                         matchblock_1.attributes)
+
     def test_matchblock_try_date_on_pass_1(self):
         matchblock = MatchBlock('31-Dec-2015 New Year', try_date=True)
         date = [datetime.datetime(2015, 12, 31, 0, 0)]
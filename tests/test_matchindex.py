@@ -0,0 +1,113 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import (MatchBlock, MatchConfig, MatchIndex, match_find,
+                        match_find_all)
+
+
+class TestMatchIndex(unittest.TestCase):
+    rows = [['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'],
+            ['Flight 12', 100, '41.49, -71.312', '10-Dec-2015'],
+            ['Flight 1', 105, '41.49, -71.312', '12-Dec-2015'],
+            ['Flight 1', 100, '41.49, -71.312', '20-Dec-2015'],
+            ['Flight 1', 100, '41.49, -71.312'],
+            ['National Health Service', 100],
+            ['NHS', 100]]
+
+    def setUp(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.date_tolerance = 0
+        MatchBlock.coordinates_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+    def assert_same_as_scan(self, row):
+        index = MatchIndex(self.rows)
+        self.assertEqual(match_find_all(row, index),
+                         match_find_all(row, self.rows))
+
+    def test_match_index_pass_1(self):
+        row = ['Flight 1', 100, '41.49, -71.312', '10-Dec-2015']
+        index = MatchIndex(self.rows)
+        self.assertEqual(match_find_all(row, index), [self.rows[0]])
+
+    def test_match_index_pass_2(self):
+        MatchBlock.number_tolerance = 5
+        MatchBlock.date_tolerance = 2
+        row = ['Flight 1', 100, '41.49, -71.312', '10-Dec-2015']
+        index = MatchIndex(self.rows)
+        self.assertEqual(match_find_all(row, index),
+                         [self.rows[0], self.rows[2]])
+
+    def test_match_index_pass_3(self):
+        MatchBlock.str_number_tolerance = 20
+        self.assert_same_as_scan(
+            ['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'])
+
+    def test_match_index_pass_4(self):
+        self.assert_same_as_scan(['NHS', 100])
+        self.assert_same_as_scan(['National Health Service', 100])
+
+    def test_match_index_pass_5(self):
+        index = MatchIndex(self.rows)
+        row = ['Flight 1', 100, '41.49, -71.312', '20-Dec-2015']
+        self.assertEqual(match_find(row, index), self.rows[3])
+
+        MatchBlock.date_tolerance = 10
+        self.assertEqual(match_find(row, index), self.rows[0])
+
+    def test_match_index_pass_6(self):
+        MatchBlock.number_tolerance = 0.5
+        self.assert_same_as_scan(['Flight 1', 100.4, '41.49, -71.312'])
+
+    def test_match_index_pass_7(self):
+        # Numbers whose buckets overflow are still found.
+        rows = [['a', 1e300], ['a', float('inf')], ['a', 1], ['a', -1e300]]
+        index = MatchIndex(rows)
+        for tolerance in (1e-10, 1, float('inf')):
+            config = MatchConfig(number_tolerance=tolerance)
+            for row in rows + [['a', float('nan')], ['a', 2 * 1e300]]:
+                self.assertEqual(match_find_all(row, index, config=config),
+                                 match_find_all(row, rows, config=config))
+
+        config = MatchConfig(number_tolerance=1e-10)
+        self.assertEqual(index.find_all(['a', 1e300], config), [rows[0]])
+        self.assertEqual(MatchIndex([['a', 10 ** 400]]).find_all(
+            ['a', 10 ** 400], config), [['a', 10 ** 400]])
+
+    def test_match_index_pass_8(self):
+        # Keys are kept for the most recently used tolerances only.
+        index = MatchIndex(self.rows)
+        row = ['Flight 1', 100, '41.49, -71.312', '10-Dec-2015']
+        for tolerance in range(10):
+            config = MatchConfig(number_tolerance=tolerance)
+            self.assertEqual(index.find_all(row, config),
+                             match_find_all(row, self.rows, config=config))
+        self.assertEqual(len(index._states), MatchIndex.max_states)
+        self.assertIn(MatchConfig(number_tolerance=9), index._states)
+
+    def test_match_index_fail_1(self):
+        row = ['Flight 2', 100, '41.49, -71.312', '10-Dec-2015']
+        index = MatchIndex(self.rows)
+        self.assertEqual(match_find_all(row, index), [])
+        self.assertIsNone(match_find(row, index))
+
+    def test_match_index_fail_2(self):
+        row = ['Flight 1', float('nan'), '41.49, -71.312']
+        index = MatchIndex(self.rows)
+        self.assertEqual(match_find_all(row, index), [])
+
+    def test_match_index_candidates_1(self):
+        row = ['Flight 12', 100, '41.49, -71.312', '10-Dec-2015']
+        index = MatchIndex(self.rows)
+        blocks = tuple(MatchBlock(x) for x in row)
+        self.assertEqual(index._candidates(blocks, MatchBlock.config()), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import (MatchBlock, MatchIndex, PreparedRows, match_find_all,
+                        match_stream, match_tables)
+
+
+class TestParallel(unittest.TestCase):
+    rows1 = [['Flight 1', 100, '10-Dec-2015'],
+             ['Flight 2', 100, '10-Dec-2015'],
+             ['Flight 3', 100, '10-Dec-2015']]
+    rows2 = [['Flight 2', 100, '12-Dec-2015'],
+             ['Flight 1', 105, '10-Dec-2015'],
+             ['Flight 1', 100, '11-Dec-2015'],
+             ['Flight 2', 200, '10-Dec-2015'],
+             ['Flight 12', 100, '10-Dec-2015']]
+
+    def setUp(self):
+        MatchBlock.number_tolerance = 5
+        MatchBlock.date_tolerance = 1
+        MatchBlock.coordinates_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+    def test_match_tables_pass_1(self):
+        expected = [[self.rows2[1], self.rows2[2]], [], []]
+        self.assertEqual(match_tables(self.rows1, self.rows2), expected)
+        self.assertEqual(match_tables(self.rows1, self.rows2, workers=2),
+                         expected)
+
+    def test_match_tables_pass_2(self):
+        expected = [match_find_all(row, self.rows2) for row in self.rows1]
+        for rows2 in (PreparedRows(self.rows2), MatchIndex(self.rows2)):
+            self.assertEqual(match_tables(self.rows1, rows2, workers=2),
+                             expected)
+
+    def test_match_tables_pass_3(self):
+        MatchBlock.str_number_tolerance = 50
+        expected = [match_find_all(row, self.rows2) for row in self.rows1]
+        self.assertEqual(match_tables(self.rows1, self.rows2, workers=3),
+                         expected)
+
+    def test_match_find_all_workers_pass_1(self):
+        row = self.rows1[0]
+        expected = match_find_all(row, self.rows2)
+        self.assertEqual(match_find_all(row, self.rows2, workers=2), expected)
+        self.assertEqual(
+            match_find_all(row, PreparedRows(self.rows2), workers=2),
+            expected)
+        self.assertEqual(
+            match_find_all(['y', None], [['x', None]] * 2, workers=2), [])
+
+    def test_match_stream_pass_1(self):
+        expected = [(row, match) for row in self.rows1
+                    for match in match_find_all(row, self.rows2)]
+
+        for workers in (1, 2):
+            result = match_stream(iter(self.rows1), self.rows2, batch_size=2,
+                                  workers=workers)
+            self.assertEqual(list(result), expected)
+
+    def test_match_stream_pass_2(self):
+        def rows():
+            consumed.append(None)
+            yield self.rows1[0]
+            consumed.append(None)
+            yield self.rows1[1]
+
+        consumed = []
+        result = match_stream(rows(), MatchIndex(self.rows2))
+
+        self.assertEqual(next(result), (self.rows1[0], self.rows2[1]))
+        self.assertEqual(len(consumed), 1)
+
+    def test_match_stream_fail_1(self):
+        result = match_stream(self.rows1, self.rows2, batch_size=0)
+        self.assertRaises(ValueError, next, result)
+
+    def test_match_tables_fail_1(self):
+        self.assertRaises(ValueError, match_tables, self.rows1, self.rows2,
+                          workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
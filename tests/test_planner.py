@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import MatchBlock, MatchConfig, MatchPlan, PreparedRows
+from matchtools import match_rows
+from matchtools import _planner
+
+
+class TestMatchPlan(unittest.TestCase):
+    config = MatchConfig(number_tolerance=10, date_tolerance=1)
+
+    def setUp(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.date_tolerance = 0
+        MatchBlock.coordinates_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+        generator = random.Random(0)
+
+        def row():
+            return [generator.choice(['France', 'Spain']),
+                    'Flight {}'.format(generator.randint(1, 3000)),
+                    generator.randint(1, 50),
+                    '{} May 2015'.format(generator.randint(1, 28))]
+
+        self.rows1 = [row() for _ in range(100)]
+        self.rows2 = self.rows1[::2] + [row() for _ in range(50)]
+
+    def expected(self, rows1, rows2, config):
+        prepared2 = PreparedRows(rows2)
+        return [(i, j) for i, row1 in enumerate(PreparedRows(rows1))
+                for j, row2 in enumerate(prepared2)
+                if match_rows(row1, row2, config)]
+
+    def test_match_plan_pass_1(self):
+        plan = MatchPlan.create(self.rows1, self.rows2, self.config)
+        # Flight numbers are the most selective.
+        self.assertEqual(plan.key, (1, 'str_number'))
+        self.assertEqual(sorted(plan.order), [0, 1, 2, 3])
+        self.assertEqual(plan.sizes, (100, 100))
+        self.assertIn('join 100 x 100 rows on str_number of column 1',
+                      str(plan))
+        # The plan costs what its key was estimated to.
+        self.assertEqual(plan.cost, min(x[3] for x in plan.estimates))
+        self.assertIn('estimated cost {:.4g}\n'.format(plan.cost), str(plan))
+
+        self.assertEqual(plan.join(self.rows1, self.rows2),
+                         self.expected(self.rows1, self.rows2, self.config))
+
+    def test_match_plan_pass_2(self):
+        # Only sampled rows are parsed.
+        with mock.patch.object(_planner.PreparedRow, 'from_row',
+                               wraps=_planner.PreparedRow.from_row) as parse:
+            plan = MatchPlan.create(self.rows1, self.rows2, self.config,
+                                    sample_size=30)
+            self.assertEqual(parse.call_count, 60)
+
+        prepared1 = PreparedRows(self.rows1)
+        prepared2 = PreparedRows(self.rows2)
+        self.assertEqual(plan.join(prepared1, prepared2),
+                         self.expected(self.rows1, self.rows2, self.config))
+
+    def test_match_plan_pass_3(self):
+        # Without selective attributes all pairs are compared.
+        rows1 = [['x', 'x'], ['X', 'x'], ['x', 'x']]
+        rows2 = [['x', 'x'], ['x', 'x'], ['x', 'x ']]
+        plan = MatchPlan.create(rows1, rows2)
+        self.assertIsNone(plan.key)
+        self.assertTrue(str(plan).startswith('compare all pairs of 3 x 3'))
+        self.assertEqual(plan.join(rows1, rows2),
+                         self.expected(rows1, rows2, None))
+
+        plan = MatchPlan.create([], rows2)
+        self.assertIsNone(plan.key)
+        self.assertEqual(plan.join([], rows2), [])
+
+    def test_match_plan_fail_1(self):
+        self.assertRaises(ValueError, MatchPlan.create, self.rows1,
+                          self.rows2, sample_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+import io
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import (Dictionary, MatchBlock, MatchIndex, PreparedRow,
+                        PreparedRows, match_rows, match_find, match_find_all)
+from matchtools import _storage
+
+
+class TestPreparedRows(unittest.TestCase):
+    rows = [['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'],
+            ['Flight 12', 100, '41.49, -71.312', '10-Dec-2015'],
+            ['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'],
+            ['Flight 1', 100]]
+
+    def setUp(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.date_tolerance = 0
+        MatchBlock.coordinates_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+    def test_prepared_row_pass_1(self):
+        prepared = PreparedRow.from_row(['Flight 1', 5])
+        self.assertEqual(prepared.blocks[0].str_number, '1')
+        self.assertEqual(prepared.blocks[1].number, 5)
+        self.assertEqual(prepared.row, ['Flight 1', 5])
+        self.assertEqual(len(prepared), 2)
+
+    def test_match_rows_prepared_pass_1(self):
+        row1 = PreparedRow.from_row(['Flight 1', 5, '1 May 2015'])
+        row2 = ['Flight 01', 5, '2015-05-01']
+        self.assertIs(match_rows(row1, row2), True)
+        self.assertIs(match_rows(row2, row1), True)
+
+    def test_match_rows_prepared_fail_1(self):
+        row1 = PreparedRow.from_row(['Flight 1', 5])
+        row2 = PreparedRow.from_row(['Flight 1', 5, '1 May 2015'])
+        self.assertIs(match_rows(row1, row2), False)
+
+    def test_match_find_all_prepared_pass_1(self):
+        row = ['Flight 1', 100, '41.49, -71.312', '10-Dec-2015']
+        prepared = PreparedRows(self.rows)
+        self.assertEqual(match_find_all(row, prepared),
+                         match_find_all(row, self.rows))
+        self.assertEqual(match_find(row, prepared), self.rows[0])
+
+    def test_match_find_all_prepared_pass_2(self):
+        MatchBlock.str_number_tolerance = 20
+        row = PreparedRow.from_row(
+            ['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'])
+        prepared = PreparedRows(self.rows)
+        self.assertEqual(match_find_all(row, prepared), self.rows[:3])
+
+    def test_prepared_rows_options_pass_1(self):
+        prepared = PreparedRows([['1 May 2015']], try_date=False)
+        self.assertEqual(prepared[0].blocks[0].date, [])
+        self.assertEqual(match_find_all(['1 May 2015'], prepared),
+                         [['1 May 2015']])
+
+    def test_prepared_rows_parse_once_pass_1(self):
+        prepared = PreparedRows(self.rows)
+        index = MatchIndex(prepared)
+
+        with mock.patch.object(MatchBlock, 'extract_dates',
+                               wraps=MatchBlock.extract_dates) as extract:
+            for row in self.rows:
+                PreparedRow.from_row(row)
+            parse_count = extract.call_count
+
+            for row in self.rows:
+                match_find_all(row, prepared)
+                match_find_all(row, index)
+
+        self.assertEqual(extract.call_count, 3 * parse_count)
+
+
+class TestPreparedRowsStorage(unittest.TestCase):
+    rows = [['Flight 1', 100, '41.49, -71.312', '10-Dec-2015'],
+            ['Flight XII', 100.5, 'N London', '1 May 2015, 2 May 2015'],
+            ['Flight 1', '', 'Flight 1']]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, 'rows.mtp')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameCorpus(self, corpus1, corpus2):
+        self.assertEqual(corpus1.rows, corpus2.rows)
+        for element1, element2 in zip(corpus1, corpus2):
+            self.assertEqual([x._attributes for x in element1.blocks],
+                             [x._attributes for x in element2.blocks])
+
+    def test_save_load_pass_1(self):
+        prepared = PreparedRows(self.rows)
+        prepared.save(self.file)
+
+        with mock.patch.object(MatchBlock, '_extract') as extract:
+            loaded = PreparedRows.load(self.file)
+            self.assertSameCorpus(loaded, prepared)
+            extract.assert_not_called()
+
+        self.assertEqual(loaded.find_all(self.rows[0]), [self.rows[0]])
+        self.assertEqual(match_find_all(self.rows[1], MatchIndex(loaded)),
+                         [self.rows[1]])
+
+    def test_save_load_pass_2(self):
+        prepared = PreparedRows(self.rows, try_date=False, lazy=True)
+        buffer = io.BytesIO()
+        prepared.save(buffer)
+
+        buffer.seek(0)
+        loaded = PreparedRows.load(buffer)
+        self.assertSameCorpus(loaded, PreparedRows(self.rows, try_date=False))
+        self.assertIs(loaded.options['try_date'], False)
+        self.assertEqual(loaded.prepare(['1 May 2015']).blocks[0].date, [])
+
+        buffer.seek(0)
+        loaded = PreparedRows.load(buffer, try_date=False, lazy=True)
+        self.assertEqual(loaded.options, {'try_date': False, 'lazy': True})
+
+    def test_save_load_pass_3(self):
+        dictionary = Dictionary({'north': ['n']})
+        PreparedRows(self.rows, dictionary=dictionary).save(self.file)
+
+        loaded = PreparedRows.load(
+            self.file, dictionary=Dictionary({'north': ['n']}))
+        self.assertEqual(loaded[1].blocks[2].str_custom, 'north')
+
+    def test_save_load_fail_1(self):
+        PreparedRows(self.rows).save(self.file)
+
+        self.assertRaisesRegex(ValueError, 'parse flags', PreparedRows.load,
+                               self.file, convert_roman=False)
+        self.assertRaisesRegex(ValueError, 'dictionary', PreparedRows.load,
+                               self.file,
+                               dictionary=Dictionary({'north': ['n']}))
+
+        with mock.patch.object(MatchBlock, 'date_formats', ('iso',)):
+            self.assertRaisesRegex(ValueError, 'date formats',
+                                   PreparedRows.load, self.file)
+
+    def test_save_load_fail_2(self):
+        buffer = io.BytesIO()
+        PreparedRows(self.rows).save(buffer)
+        data = buffer.getvalue()
+
+        self.assertRaisesRegex(ValueError, 'not a file', PreparedRows.load,
+                               io.BytesIO(b'rows'))
+
+        version = _storage._HEADER.pack(_storage.FORMAT_VERSION + 1, 0)
+        self.assertRaisesRegex(ValueError, 'version', PreparedRows.load,
+                               io.BytesIO(_storage.MAGIC + version))
+
+        self.assertRaisesRegex(ValueError, 'corrupted', PreparedRows.load,
+                               io.BytesIO(data[:-10]))
+
+        # Bodies raising other exceptions when unpickled, or not holding
+        # the rows and their columns.
+        start = len(_storage.MAGIC) + _storage._HEADER.size
+        _, size = _storage._HEADER.unpack(data[len(_storage.MAGIC):start])
+        header = data[:start + size]
+        for body in (b'cmatchtools\nNoSuchName\n.', pickle.dumps(5),
+                     pickle.dumps((self.rows, [4, 3, 3], ([],) * 6))):
+            self.assertRaisesRegex(ValueError, 'corrupted', PreparedRows.load,
+                                   io.BytesIO(header + body))
+
+    def test_save_load_lazy_pass_1(self):
+        buffer = io.BytesIO()
+        PreparedRows(self.rows).save(buffer)
+        buffer.seek(0)
+
+        # Blocks are built when rows are first used.
+        with mock.patch.object(_storage, '_blocks',
+                               wraps=_storage._blocks) as blocks:
+            loaded = PreparedRows.load(buffer)
+            self.assertEqual(blocks.call_count, 0)
+            self.assertEqual(loaded[1].blocks[0].str_number, '12')
+            self.assertEqual(blocks.call_count, 1)
+            self.assertIs(loaded[-2], loaded[1])
+            self.assertEqual(loaded.rows, self.rows)
+            self.assertEqual(blocks.call_count, 1)
+
+            self.assertSameCorpus(loaded, PreparedRows(self.rows))
+            self.assertEqual(blocks.call_count, 3)
+        self.assertIsNone(loaded._prepared._columns)
+        self.assertEqual([x.row for x in loaded[:2]], self.rows[:2])
+
+    def test_save_load_lazy_pass_2(self):
+        # Rows of different lengths are found by their offsets, whatever
+        # the order they are first used in.
+        buffer = io.BytesIO()
+        PreparedRows(self.rows).save(buffer)
+        buffer.seek(0)
+
+        loaded = PreparedRows.load(buffer)
+        self.assertEqual(loaded._prepared._starts, [0, 4, 8, 11])
+        prepared = PreparedRows(self.rows)
+        for i in (2, 0, 1):
+            self.assertEqual([x._attributes for x in loaded[i].blocks],
+                             [x._attributes for x in prepared[i].blocks])
+        self.assertSameCorpus(loaded, prepared)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from fuzzywuzzy import fuzz
+
+from matchtools import (FuzzScorer, LevenshteinScorer, MatchBlock, Scorer,
+                        get_scorer)
+from matchtools._scorers import Levenshtein
+
+METHODS = (('ratio', fuzz.ratio), ('partial_ratio', fuzz.partial_ratio),
+           ('token_sort_ratio', fuzz.token_sort_ratio),
+           ('token_set_ratio', fuzz.token_set_ratio),
+           ('uwratio', fuzz.UWRatio))
+
+
+def lcs_length(string1, string2):
+    previous = [0] * (len(string2) + 1)
+    for char1 in string1:
+        current = [0]
+        for j, char2 in enumerate(string2):
+            current.append(previous[j] + 1 if char1 == char2
+                           else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def random_strings(count, seed=0):
+    r = random.Random(seed)
+    words = ('Flight', 'flight', 'Kolmogorov', 'N', 'North', 'IV', '0001',
+             '12', 'the', 'Field', 'ąę', '  ', '-')
+    strings = []
+    for _ in range(count):
+        if r.random() < 0.5:
+            strings.append(' '.join(r.choice(words)
+                                    for _ in range(r.randrange(4))))
+        else:
+            strings.append(''.join(r.choice('abc D1 ')
+                                   for _ in range(r.randrange(12))))
+    return strings
+
+
+class TestScorer(unittest.TestCase):
+    strings = random_strings(400)
+    pairs = list(zip(strings, strings[1:] + strings[:1]))
+
+    def test_scorer_pass_1(self):
+        scorer = Scorer()
+        self.assertEqual(scorer.ratio('Flight 1', 'Fligth 1'), 88)
+        self.assertEqual(scorer.ratio('', ''), 100)
+        self.assertEqual(scorer.ratio('Flight', ''), 0)
+        self.assertEqual(scorer.ratio(None, 'Flight'), 0)
+        self.assertEqual(scorer.partial_ratio('Beatles', 'The Beatles'), 100)
+        self.assertEqual(
+            scorer.token_sort_ratio('Flight Kolmogorov', 'Kolmogorov flight'),
+            100)
+        self.assertEqual(scorer.token_set_ratio('Flight', 'Flight Flight 1'),
+                         100)
+        self.assertEqual(scorer.uwratio('Flight!', 'flight'), 100)
+        self.assertEqual(scorer.uwratio('', 'flight'), 0)
+
+    def test_scorer_pass_2(self):
+        scorer = Scorer()
+        for string1, string2 in self.pairs:
+            self.assertEqual(scorer._lcs_length(string1, string2),
+                             lcs_length(string1, string2))
+
+            if string1 and string2:
+                total = len(string1) + len(string2)
+                expected = round(
+                    200 * lcs_length(string1, string2) / total)
+                self.assertEqual(scorer.ratio(string1, string2), expected)
+
+    def test_scorer_pass_3(self):
+        scorer = Scorer()
+        for string1, string2 in self.pairs:
+            if not string1 or len(string1) > len(string2):
+                continue
+            length = len(string1)
+            windows = [string2[i:i + length] for i in range(len(string2))]
+            expected = max(2 * lcs_length(string1, x) / (length + len(x))
+                           for x in windows)
+            self.assertEqual(scorer._best_window(string1, string2), expected)
+
+    def test_scorer_pass_4(self):
+        # Exact ratios are never lower than those of difflib.
+        scorer = Scorer()
+        for name, func in METHODS:
+            for string1, string2 in self.pairs:
+                self.assertGreaterEqual(getattr(scorer, name)(string1, string2),
+                                        func(string1, string2))
+
+    @unittest.skipIf(Levenshtein is None, 'Levenshtein is not installed')
+    def test_levenshtein_scorer_pass_1(self):
+        python, levenshtein = Scorer(), LevenshteinScorer()
+        for name, _ in METHODS:
+            for string1, string2 in self.pairs:
+                self.assertEqual(
+                    getattr(levenshtein, name)(string1, string2),
+                    getattr(python, name)(string1, string2))
+
+    def test_fuzz_scorer_pass_1(self):
+        # The default scores are those of fuzzywuzzy.
+        self.assertEqual(MatchBlock.scorer, FuzzScorer())
+        for name, func in METHODS:
+            for string1, string2 in self.pairs + [('Station VII', 'Sector I')]:
+                self.assertEqual(
+                    getattr(MatchBlock.scorer, name)(string1, string2),
+                    func(string1, string2))
+
+    def test_get_scorer_pass_1(self):
+        self.assertEqual(get_scorer(), FuzzScorer())
+        self.assertEqual(get_scorer('python'), Scorer())
+        expected = Scorer if Levenshtein is None else LevenshteinScorer
+        self.assertIs(type(get_scorer('auto')), expected)
+
+    def test_get_scorer_fail_1(self):
+        self.assertRaises(ValueError, get_scorer, 'difflib')
+
+        with mock.patch('matchtools._scorers.Levenshtein', None):
+            self.assertRaises(ImportError, get_scorer, 'levenshtein')
+
+    def test_compare_strings_scorer_pass_1(self):
+        class Constant(Scorer):
+            def ratio(self, string1, string2):
+                return 90
+
+        with mock.patch.object(MatchBlock, 'scorer', Constant()):
+            self.assertIs(MatchBlock.compare_strings(
+                'Flight 1', 'Flight 2', tolerance=10, method='ratio'), True)
+            self.assertIs(MatchBlock.compare_strings(
+                'Flight 1', 'Flight 2', tolerance=9, method='ratio'), False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import MatchBlock, MatchIndex, SpatialIndex, match_find_all
+
+
+class TestSpatialIndex(unittest.TestCase):
+    coordinates = [(55.75222, 37.61556), (59.93863, 30.31413), None,
+                   (41.49008, -71.312796), (41.499498, -81.695391),
+                   (0.0, 179.999), (0.0, -179.999), (89.99, 0.0),
+                   (89.99, 180.0)]
+
+    def test_spatial_index_query_pass_1(self):
+        index = SpatialIndex(self.coordinates, cell_size=650)
+        self.assertEqual(index.query((55.75222, 37.61556), 650), [0, 1])
+
+    def test_spatial_index_query_pass_2(self):
+        index = SpatialIndex(self.coordinates, cell_size=1)
+        self.assertEqual(index.query((0.0, 180.0), 1), [5, 6])
+        self.assertEqual(index.query((90.0, 90.0), 5), [7, 8])
+
+    def test_spatial_index_query_pass_3(self):
+        index = SpatialIndex(self.coordinates, cell_size=400, unit='mi')
+        self.assertEqual(index.query((55.75222, 37.61556), 400, unit='mi'),
+                         [0, 1])
+        self.assertEqual(index.query((55.75222, 37.61556), 100, unit='mi'),
+                         [0])
+
+    def test_spatial_index_query_pass_4(self):
+        index = SpatialIndex(self.coordinates)
+        self.assertEqual(index.query((0.0, 0.0), 25000),
+                         [0, 1, 3, 4, 5, 6, 7, 8])
+
+    def test_spatial_index_query_pass_5(self):
+        random.seed(0)
+        coordinates = [(random.uniform(-90, 90), random.uniform(-180, 180))
+                       for _ in range(500)]
+        index = SpatialIndex(coordinates, cell_size=500)
+
+        for coords in coordinates[:20]:
+            expected = [i for i, x in enumerate(coordinates)
+                        if MatchBlock.compare_coordinates(coords, x,
+                                                          tolerance=1000)]
+            self.assertEqual(index.query(coords, 1000), expected)
+
+    def test_spatial_index_from_blocks_pass_1(self):
+        blocks = [MatchBlock('A 55.75222, 37.61556'), MatchBlock('B'),
+                  MatchBlock('C 59.93863, 30.31413')]
+        index = SpatialIndex.from_blocks(blocks, cell_size=650)
+        self.assertEqual(index.query((55.75222, 37.61556), 650), [0, 2])
+
+    def test_spatial_index_fail_1(self):
+        self.assertRaises(ValueError, SpatialIndex, self.coordinates,
+                          cell_size=0)
+        self.assertRaises(ValueError, SpatialIndex, self.coordinates,
+                          unit='furlong')
+
+    def test_match_index_coordinates_pass_1(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.date_tolerance = 0
+        MatchBlock.coordinates_tolerance = 650
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+
+        rows = [['Flight 1', '55.75222, 37.61556'],
+                ['Flight 1', '59.93863, 30.31413'],
+                ['Flight 1', '41.49008, -71.312796']]
+        index = MatchIndex(rows)
+        row = ['Flight 1', '55.75222, 37.61556']
+        self.assertEqual(match_find_all(row, index), rows[:2])
+        self.assertEqual(match_find_all(row, index),
+                         match_find_all(row, rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
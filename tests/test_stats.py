@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from matchtools import MatchBlock, MatchStats
+
+
+class TestMatchStats(unittest.TestCase):
+    def setUp(self):
+        MatchBlock.number_tolerance = 0
+        MatchBlock.string_tolerance = 0
+        MatchBlock.str_number_tolerance = 0
+        MatchBlock.str_custom_tolerance = 0
+        MatchBlock.dates_cache.clear()
+
+    def test_match_stats_pass_1(self):
+        stats = MatchStats(enabled=True)
+        stats.record('a', 0.5)
+        stats.record('a', 0.25, hit=True, rejected=True)
+        stats.record('b', 1)
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot, {
+            'a': {'calls': 2, 'time': 0.75, 'hits': 1, 'rejections': 1},
+            'b': {'calls': 1, 'time': 1, 'hits': 0, 'rejections': 0}})
+
+        stats.record('b', 1)
+        self.assertEqual(snapshot['b']['calls'], 1)
+
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {})
+
+    def test_match_stats_matchblock_pass_1(self):
+        stats = MatchStats(enabled=True)
+
+        with mock.patch.object(MatchBlock, 'stats', stats):
+            matchblock_1 = MatchBlock('10-Dec-2015 N Flight IV')
+            matchblock_2 = MatchBlock('10-Dec-2015 N Flight 5')
+            self.assertIs(matchblock_1 == matchblock_2, False)
+            MatchBlock('10-Dec-2015 N Flight 5')
+
+        snapshot = stats.snapshot()
+        for name in ('extract_coordinates', 'extract_dates',
+                     'roman_to_integers', 'extract_str_number',
+                     'extract_str_custom'):
+            self.assertEqual(snapshot[name]['calls'], 3)
+            self.assertGreater(snapshot[name]['time'], 0)
+
+        self.assertEqual(snapshot['extract_dates']['hits'], 1)
+        self.assertEqual(snapshot['compare_dates'],
+                         {'calls': 1, 'time': snapshot['compare_dates']['time'],
+                          'hits': 0, 'rejections': 0})
+        self.assertEqual(snapshot['compare_strings[str_number]']['rejections'],
+                         1)
+        self.assertNotIn('compare_strings[string]', snapshot)
+
+    def test_match_stats_matchblock_pass_2(self):
+        stats = MatchStats()
+
+        with mock.patch.object(MatchBlock, 'stats', stats):
+            self.assertIs(MatchBlock('Flight 1') == MatchBlock('Flight 1'),
+                          True)
+
+        self.assertEqual(stats.snapshot(), {})
+
+    def test_match_stats_matchblock_pass_3(self):
+        stats = MatchStats(enabled=True)
+
+        with mock.patch.object(MatchBlock, 'stats', stats):
+            matchblock_1 = MatchBlock(100)
+            matchblock_2 = MatchBlock('10-Dec-2015 Flight 1', lazy=True)
+            self.assertIs(matchblock_1 == matchblock_2, False)
+            self.assertIs(matchblock_2 == MatchBlock('Flight 1', lazy=True),
+                          False)
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['extract_dates']['calls'], 2)
+        self.assertNotIn('roman_to_integers', snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
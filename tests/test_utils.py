@@ -2,13 +2,14 @@ import os
 import sys
 import unittest
 import warnings
+from unittest import mock
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 
-from matchtools import (MatchBlock, return_element, match_rows, match_find,
-                        match_find_all, move_element_to_front,
-                        move_element_to_back)
+from matchtools import (MatchBlock, MatchIndex, PreparedRows, return_element,
+                        match_rows, match_find, match_find_all, match_top_k,
+                        move_element_to_front, move_element_to_back)
 
 
 class TestUtils(unittest.TestCase):
@@ -199,6 +200,57 @@ class TestUtils(unittest.TestCase):
 
         self.assertEqual(match_find_all(row, rows), [])
 
+    def test_match_find_all_pass_4(self):
+        # Lengths are checked, and values compared, before parsing the rest.
+        rows = [['x', None]]
+        self.assertEqual(match_find_all(['y', None], rows), [])
+        self.assertEqual(match_find_all(['y'], rows), [])
+        self.assertIsNone(match_find(['y', None], rows))
+        self.assertIs(match_rows(['y', None], ['x', None]), False)
+
+        with mock.patch('matchtools._prepared.MatchBlock',
+                        wraps=MatchBlock) as parse:
+            rows = [['Flight 1', 100], ['Flight 2', 100], ['Flight 3']]
+            self.assertEqual(match_find_all(['Flight 2', 100], rows),
+                             [['Flight 2', 100]])
+            # The query is parsed once: 'Flight 2' and 100, and 1 + 2 + 0
+            # values of the rows.
+            self.assertEqual(parse.call_count, 5)
+
+    def test_match_top_k_pass_1(self):
+        row = ['Flight 2', 100]
+        rows = [['Flight 1', 100], ['Flight 2', 103], ['Flight 3', 200],
+                ['Flight 2']]
+
+        expected = [(75.0, ['Flight 2', 103]), (200 / 3, ['Flight 1', 100])]
+        for rows in (rows, PreparedRows(rows), MatchIndex(rows)):
+            self.assertEqual(match_top_k(row, rows, k=2), expected)
+
+    def test_match_top_k_pass_2(self):
+        row = ['Flight 1']
+        rows = [['Flight 01'], ['Flight 1'], ['Flight 2'], ['Flight 1']]
+
+        self.assertEqual(match_top_k(row, rows, k=3),
+                         [(100.0, ['Flight 01']), (100.0, ['Flight 1']),
+                          (100.0, ['Flight 1'])])
+        self.assertEqual(match_top_k(row, rows), [(100.0, ['Flight 01'])])
+
+    def test_match_top_k_pass_3(self):
+        row = [100, '41.49, -71.312']
+        rows = [[100, '41.49, -71.312'], [500, '41.49, -71.313'],
+                [700, '41.50, -71.312']]
+
+        with mock.patch.object(MatchBlock, '_coordinates_distance',
+                               wraps=MatchBlock._coordinates_distance) as m:
+            result = match_top_k(row, rows)
+
+        self.assertEqual(result, [(100.0, rows[0])])
+        self.assertEqual(m.call_count, 1)
+
+    def test_match_top_k_fail_1(self):
+        self.assertRaises(ValueError, match_top_k, ['Flight 1'],
+                          [['Flight 1']], k=0)
+
 
 if __name__ == '__main__':
     unittest.main()